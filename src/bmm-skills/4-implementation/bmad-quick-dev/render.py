@@ -18,38 +18,96 @@ Optional layers may be missing, but one that exists and cannot be parsed
 or read → HALT.
 
 Customization: three-layer merge of {skill}/customize.toml +
-_bmad/custom/bmad-quick-dev.toml + .user.toml (same structural rules as
-resolve_customization.py). The resolved [workflow] values fill {workflow.*}
-placeholders, so this skill needs no runtime resolve_customization.py call.
+_bmad/custom/bmad-quick-dev.toml + .user.toml. The resolved [workflow] values
+fill {workflow.*} placeholders, so this skill needs no runtime
+resolve_customization.py call. Both merges use the shared
+{project-root}/_bmad/scripts/structural_merge.py, so their rules can never
+drift from resolve_config.py / resolve_customization.py.
 Other single-curly placeholders ({project-root}, {spec_file}, {skill-root},
 ...) pass through untouched for the LLM to resolve during workflow execution.
 
-Every invocation rebuilds from scratch — no hash, no cache.
+Incremental: _bmad/render/bmad-quick-dev/.render-manifest.json records a
+sha256 of the merged config vars, the resolved [workflow] block, this
+renderer's own source, and each source/output file. A re-run re-renders only
+outputs whose inputs changed (or whose file was edited or deleted since), and
+never rewrites a file whose bytes would be identical, so watchers see no
+churn. Outputs for removed sources are deleted. Delete the manifest to force
+a full re-render.
+
+Multi-skill: `render.py --all` precompiles this skill plus every sibling skill
+that opts in by shipping its own render.py, and any skill directories named
+on the command line. Skills run in parallel across a process pool (--jobs,
+default one worker per CPU). A skill whose render.py is byte-identical to this
+one — or that ships none and was named explicitly — renders in-process against
+one shared load of the central config, so its own render.py run afterwards
+finds its manifest current and rewrites nothing. Any other render.py is run
+as its own subprocess, and its HALT is relayed. Reports one line per skill;
+exits 1 if any skill HALTed or could not be read.
+
+  uv run {skill-root}/render.py
+  uv run {skill-root}/render.py --all [--jobs N] [SKILL_DIR ...]
+
 Python 3.11+ stdlib only. UTF-8 I/O.
 """
 
+import argparse
+import functools
+import hashlib
+import json
 import os
 import posixpath
 import re
+import subprocess
 import sys
 import tomllib
+from concurrent.futures import ProcessPoolExecutor
 
 
-def find_project_root():
-    """Walk up from cwd until a _bmad/ directory is found. On failure, print a
-    HALT instruction to stdout and exit non-zero."""
-    current = os.path.abspath(os.getcwd())
+class Halt(Exception):
+    """A condition the LLM caller must HALT on. main() prints the message as
+    the HALT directive on stdout and exits non-zero; raising rather than
+    exiting lets render_all() report a failing skill and carry on."""
+
+
+PROJECT_ROOT_ENV = "BMAD_PROJECT_ROOT"
+
+# Every directory a walk visited → the root it resolved to (or None), so a
+# repeat lookup from the same tree never re-stats the ancestors.
+_ROOT_MEMO = {}
+
+
+def _walk_to_root(start):
+    """Nearest ancestor of start (inclusive) holding a _bmad/ directory, or None.
+    A BMAD_PROJECT_ROOT that names a directory with _bmad/ skips the walk."""
+    hint = os.environ.get(PROJECT_ROOT_ENV)
+    if hint and os.path.isdir(os.path.join(hint, "_bmad")):
+        return os.path.abspath(hint)
+    current = os.path.abspath(start)
+    visited = []
     while True:
-        candidate = os.path.join(current, "_bmad")
-        if os.path.isdir(candidate):
-            return current
+        if current in _ROOT_MEMO:
+            root = _ROOT_MEMO[current]
+            break
+        visited.append(current)
+        if os.path.isdir(os.path.join(current, "_bmad")):
+            root = current
+            break
         parent = os.path.dirname(current)
         if parent == current:
-            print(
-                f"HALT and report to the user: no _bmad/ directory found walking up from {os.getcwd()}"
-            )
-            sys.exit(1)
+            root = None
+            break
         current = parent
+    for directory in visited:
+        _ROOT_MEMO[directory] = root
+    return root
+
+
+def find_project_root():
+    """Walk up from cwd until a _bmad/ directory is found. HALTs if none is."""
+    root = _walk_to_root(os.getcwd())
+    if root is None:
+        raise Halt(f"no _bmad/ directory found walking up from {os.getcwd()}")
+    return root
 
 
 def load_toml(path, required=False):
@@ -61,127 +119,77 @@ def load_toml(path, required=False):
     their customizations with no failure signal."""
     if not os.path.isfile(path):
         if required:
-            print(
-                f"HALT and report to the user: required config file not found: {path} — "
+            raise Halt(
+                f"required config file not found: {path} — "
                 "ensure this is a post-#2285 BMAD install"
             )
-            sys.exit(1)
         return {}
     try:
         with open(path, "rb") as fh:
             parsed = tomllib.load(fh)
     except tomllib.TOMLDecodeError as error:
-        print(f"HALT and report to the user: failed to parse {path}: {error}")
-        sys.exit(1)
+        raise Halt(f"failed to parse {path}: {error}") from None
     except OSError as error:
-        print(f"HALT and report to the user: failed to read {path}: {error}")
-        sys.exit(1)
+        raise Halt(f"failed to read {path}: {error}") from None
     if not isinstance(parsed, dict):
         return {}
     return parsed
 
 
-def _deep_merge(base, override):
-    """Dict-aware deep merge. Lists and scalars: override wins (we don't need
-    the full keyed-merge semantics of resolve_config.py — quick-dev only reads
-    flat scalars out of [core] and [modules.bmm])."""
-    if isinstance(base, dict) and isinstance(override, dict):
-        result = dict(base)
-        for key, value in override.items():
-            result[key] = _deep_merge(result[key], value) if key in result else value
-        return result
-    return override
-
-
-def _detect_keyed_merge_field(items):
-    """Return 'code' or 'id' if every table item carries that same field.
-    Mixed or partial arrays return None and fall through to append."""
-    if not items or not all(isinstance(item, dict) for item in items):
-        return None
-    for candidate in ("code", "id"):
-        if all(item.get(candidate) is not None for item in items):
-            return candidate
-    return None
+_MERGE_MODULE = None
 
 
-def _merge_by_key(base, override, key_name):
-    result = []
-    index_by_key = {}
-    for item in base:
-        if not isinstance(item, dict):
-            continue
-        if item.get(key_name) is not None:
-            index_by_key[item[key_name]] = len(result)
-        result.append(dict(item))
-    for item in override:
-        if not isinstance(item, dict):
-            result.append(item)
-            continue
-        key = item.get(key_name)
-        if key is not None and key in index_by_key:
-            result[index_by_key[key]] = dict(item)
-        else:
-            if key is not None:
-                index_by_key[key] = len(result)
-            result.append(dict(item))
-    return result
-
-
-def _merge_arrays(base, override):
-    """Shape-aware array merge: keyed merge if every item has code/id, else append."""
-    base_arr = base if isinstance(base, list) else []
-    override_arr = override if isinstance(override, list) else []
-    keyed_field = _detect_keyed_merge_field(base_arr + override_arr)
-    if keyed_field:
-        return _merge_by_key(base_arr, override_arr, keyed_field)
-    return base_arr + override_arr
-
-
-def _structural_merge(base, override):
-    """Faithful port of resolve_customization.py's deep_merge: tables deep-merge,
-    arrays-of-tables keyed by code/id replace-then-append (other arrays append),
-    scalars override. Used only for the [workflow] customization layers — the
-    central-config path keeps its own simpler _deep_merge. Duplicated rather than
-    imported to keep this skill self-contained."""
-    if isinstance(base, dict) and isinstance(override, dict):
-        result = dict(base)
-        for key, over_val in override.items():
-            result[key] = (
-                _structural_merge(result[key], over_val) if key in result else over_val
-            )
-        return result
-    if isinstance(base, list) and isinstance(override, list):
-        return _merge_arrays(base, override)
-    return override
+def load_structural_merge(root):
+    """Import the shared merge library from {root}/_bmad/scripts — the same
+    structural_merge.py that resolve_config.py and resolve_customization.py
+    use, so all three merge identically. HALTs if the install predates it."""
+    global _MERGE_MODULE
+    if _MERGE_MODULE is None:
+        scripts_dir = posixpath.join(root, "_bmad", "scripts")
+        if scripts_dir not in sys.path:
+            sys.path.insert(0, scripts_dir)
+        try:
+            import structural_merge
+        except ImportError:
+            raise Halt(
+                "shared merge library not found at "
+                f"{scripts_dir}/structural_merge.py — re-run the BMAD installer"
+            ) from None
+        _MERGE_MODULE = structural_merge
+    return _MERGE_MODULE
 
 
 def resolve_workflow(root, skill_dir, skill_name):
     """Resolve the [workflow] customization block via the three-layer merge
-    (skill defaults -> team -> user), highest priority last. Same structural
-    rules as resolve_customization.py. All three layers are optional: a missing
-    file is skipped, but an unparseable one HALTs (via load_toml)."""
+    (skill defaults -> team -> user), highest priority last, through the
+    shared structural_merge.py that resolve_customization.py also uses. All
+    three layers are optional: a missing file is skipped, but an unparseable
+    one HALTs (via load_toml)."""
     defaults = load_toml(posixpath.join(skill_dir, "customize.toml"))
     custom_dir = posixpath.join(root, "_bmad", "custom")
     team = load_toml(posixpath.join(custom_dir, f"{skill_name}.toml"))
     user = load_toml(posixpath.join(custom_dir, f"{skill_name}.user.toml"))
-    merged = _structural_merge(defaults, team)
-    merged = _structural_merge(merged, user)
+    deep_merge = load_structural_merge(root).deep_merge
+    merged = deep_merge(defaults, team)
+    merged = deep_merge(merged, user)
     workflow = merged.get("workflow")
     return workflow if isinstance(workflow, dict) else {}
 
 
 def load_central_config(root):
     """Four-layer merge of _bmad/config.toml and its peers (highest priority
-    last). HALTs if the base _bmad/config.toml is missing or unparseable."""
+    last), with the same structural rules as resolve_config.py. HALTs if the
+    base _bmad/config.toml is missing or unparseable."""
     bmad_dir = posixpath.join(root, "_bmad")
     base_team = load_toml(posixpath.join(bmad_dir, "config.toml"), required=True)
     base_user = load_toml(posixpath.join(bmad_dir, "config.user.toml"))
     custom_team = load_toml(posixpath.join(bmad_dir, "custom", "config.toml"))
     custom_user = load_toml(posixpath.join(bmad_dir, "custom", "config.user.toml"))
 
-    merged = _deep_merge(base_team, base_user)
-    merged = _deep_merge(merged, custom_team)
-    merged = _deep_merge(merged, custom_user)
+    deep_merge = load_structural_merge(root).deep_merge
+    merged = deep_merge(base_team, base_user)
+    merged = deep_merge(merged, custom_team)
+    merged = deep_merge(merged, custom_user)
     return merged
 
 
@@ -203,11 +211,61 @@ def flatten_central_config(merged):
     return flat
 
 
-def render_template(content, vars_):
-    """Resolve {{.var}} substitutions. Unresolved references emit an empty string,
-    but main() HALTs on any missing reference before rendering starts, so this
-    fallback never fires in practice."""
-    return re.sub(r"\{\{\.(\w+)\}\}", lambda m: vars_.get(m.group(1), ""), content)
+_LITERAL, _VAR, _WORKFLOW = range(3)
+
+# Both placeholder kinds in one alternation, so a template is scanned once.
+_PLACEHOLDER = re.compile(r"\{\{\.(\w+)\}\}|\{workflow\.(\w+)\}")
+
+
+@functools.lru_cache(maxsize=None)
+def compile_template(content):
+    """Parse a template once into a tuple of (kind, text) segments: literal
+    text, a {{.var}} name, or a {workflow.key} key. Missing-var detection and
+    rendering both walk these segments, so a source is never rescanned, and
+    the parse is memoized by content for every later render in the process.
+    Substituted values are never re-parsed: a config value that happens to
+    contain "{workflow.x}" is emitted verbatim."""
+    segments = []
+    pos = 0
+    for match in _PLACEHOLDER.finditer(content):
+        if match.start() > pos:
+            segments.append((_LITERAL, content[pos:match.start()]))
+        if match.group(1) is not None:
+            segments.append((_VAR, match.group(1)))
+        else:
+            segments.append((_WORKFLOW, match.group(2)))
+        pos = match.end()
+    if pos < len(content):
+        segments.append((_LITERAL, content[pos:]))
+    return tuple(segments)
+
+
+def template_vars(content):
+    """The {{.var}} names a template references, in order of appearance."""
+    return [text for kind, text in compile_template(content) if kind == _VAR]
+
+
+def render_compiled(segments, vars_, workflow, workflow_values=None):
+    """Join compiled segments into the rendered text. `workflow_values` caches
+    each formatted [workflow] value, so a caller rendering many files against
+    one workflow formats every key once. Unresolved {{.var}} references and
+    unknown {workflow.*} keys emit an empty string (missingkey=zero), but
+    render_skill() HALTs on any missing var before rendering starts."""
+    if workflow_values is None:
+        workflow_values = {}
+    parts = []
+    for kind, text in segments:
+        if kind == _LITERAL:
+            parts.append(text)
+        elif kind == _VAR:
+            parts.append(vars_.get(text, ""))
+        else:
+            value = workflow_values.get(text)
+            if value is None:
+                value = _render_workflow_value(text, workflow.get(text))
+                workflow_values[text] = value
+            parts.append(value)
+    return "".join(parts)
 
 
 def collect_missing_vars(sources, vars_):
@@ -217,7 +275,7 @@ def collect_missing_vars(sources, vars_):
     blank language lines) with no failure signal."""
     missing = {}
     for fname, content in sources:
-        for name in re.findall(r"\{\{\.(\w+)\}\}", content):
+        for name in template_vars(content):
             if name not in vars_:
                 files = missing.setdefault(name, [])
                 if fname not in files:
@@ -295,24 +353,107 @@ def _render_workflow_value(key, value):
     return _scalar_str(value)
 
 
-def render_workflow(content, workflow):
-    """Resolve {workflow.<key>} placeholders from the resolved [workflow] block.
-    Unknown keys emit an empty string (missingkey=zero, matching render_template).
-    Distinct regex from render_template so single-curly runtime placeholders
-    elsewhere are untouched."""
-    return re.sub(
-        r"\{workflow\.(\w+)\}",
-        lambda m: _render_workflow_value(m.group(1), workflow.get(m.group(1))),
-        content,
-    )
+MANIFEST = ".render-manifest.json"
+MANIFEST_VERSION = 1
 
 
-def main():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    skill_name = os.path.basename(script_dir)
-    root = find_project_root()
-    root = root.replace(os.sep, "/")
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _digest_json(value):
+    """Stable digest of a resolved structure (key order and TOML dates included)."""
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return _digest(encoded.encode("utf-8"))
+
+
+def _read_bytes(path):
+    try:
+        with open(path, "rb") as fh:
+            return fh.read()
+    except OSError:
+        return None
+
+
+def load_manifest(out_dir):
+    """The previous run's manifest, or {} when absent, unreadable or outdated."""
+    raw = _read_bytes(posixpath.join(out_dir, MANIFEST))
+    try:
+        manifest = json.loads(raw) if raw is not None else {}
+    except ValueError:
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def render_incremental(out_dir, sources, vars_, workflow, renderer_digest):
+    """Render sources into out_dir, touching only what changed. Returns the
+    number of files written.
+
+    A source is skipped without rendering when the config vars, [workflow]
+    block and renderer are unchanged, its own digest matches the manifest,
+    and its output on disk still has the recorded digest. Otherwise it is
+    rendered, and written only if the bytes differ from what is on disk.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    inputs = {
+        "renderer": renderer_digest,
+        "vars": _digest_json(vars_),
+        "workflow": _digest_json(workflow),
+    }
+    previous = load_manifest(out_dir)
+    unchanged = all(previous.get(key) == value for key, value in inputs.items())
+    prior_files = previous.get("files") if unchanged else None
+    prior_files = prior_files if isinstance(prior_files, dict) else {}
+
+    files = {}
+    written = 0
+    workflow_values = {}
+    for fname, content in sources:
+        dst = posixpath.join(out_dir, fname)
+        source_digest = _digest(content.encode("utf-8"))
+        existing = _read_bytes(dst)
+        prior = prior_files.get(fname)
+        if (
+            isinstance(prior, dict)
+            and prior.get("source") == source_digest
+            and existing is not None
+            and _digest(existing) == prior.get("output")
+        ):
+            files[fname] = prior
+            continue
+        rendered = render_compiled(
+            compile_template(content), vars_, workflow, workflow_values
+        ).encode("utf-8")
+        if rendered != existing:
+            with open(dst, "wb") as fh:
+                fh.write(rendered)
+            written += 1
+        files[fname] = {"source": source_digest, "output": _digest(rendered)}
+
+    rendered_names = {fname for fname, _ in sources}
+    for fname in os.listdir(out_dir):
+        if fname.endswith(".md") and fname not in rendered_names:
+            os.remove(posixpath.join(out_dir, fname))
 
+    manifest = {"version": MANIFEST_VERSION, **inputs, "files": files}
+    if manifest != previous:
+        tmp = posixpath.join(out_dir, f"{MANIFEST}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8", newline="") as fh:
+            json.dump(manifest, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+        os.replace(tmp, posixpath.join(out_dir, MANIFEST))
+    return written
+
+
+_ARTIFACT_VARS = ("implementation_artifacts", "sprint_status", "deferred_work_file")
+
+
+def central_vars(root):
+    """The {{.var}} namespace every skill renders against: the flattened
+    central config with {project-root} baked in, plus the derived
+    project_root, sprint_status and deferred_work_file values."""
     vars_ = flatten_central_config(load_central_config(root))
 
     for key in list(vars_.keys()):
@@ -320,32 +461,46 @@ def main():
 
     vars_["project_root"] = root
 
-    # Guarded ahead of the general missing-vars scan: sprint_status and
-    # deferred_work_file derive from it below, and unlike the scan (absent
-    # keys only) this also HALTs on a present-but-empty value.
     implementation_artifacts = vars_.get("implementation_artifacts", "").strip()
-    if not implementation_artifacts:
-        print(
-            "HALT and report to the user: config is missing `implementation_artifacts` "
-            "(expected under [core] or [modules.bmm] in _bmad/config.toml)"
+    if implementation_artifacts:
+        vars_["sprint_status"] = posixpath.join(
+            implementation_artifacts, "sprint-status.yaml"
         )
-        sys.exit(1)
+        vars_["deferred_work_file"] = posixpath.join(
+            implementation_artifacts, "deferred-work.md"
+        )
+    return vars_
 
-    vars_["sprint_status"] = posixpath.join(
-        implementation_artifacts, "sprint-status.yaml"
-    )
-    vars_["deferred_work_file"] = posixpath.join(
-        implementation_artifacts, "deferred-work.md"
-    )
 
+def read_sources(skill_dir):
+    """(filename, text) for every .md template in skill_dir except SKILL.md."""
     sources = []
-    for fname in sorted(os.listdir(script_dir)):
+    for fname in sorted(os.listdir(skill_dir)):
         if not fname.endswith(".md") or fname == "SKILL.md":
             continue
         with open(
-            posixpath.join(script_dir, fname), "r", encoding="utf-8", newline=""
+            posixpath.join(skill_dir, fname), "r", encoding="utf-8", newline=""
         ) as fh:
             sources.append((fname, fh.read()))
+    return sources
+
+
+def render_skill(root, skill_dir, vars_, renderer_digest):
+    """Render one skill's templates into _bmad/render/<skill>/ against the
+    already-resolved central vars. Returns the output directory; HALTs (raises
+    Halt) before writing anything if the config cannot satisfy the templates."""
+    skill_name = posixpath.basename(skill_dir)
+    sources = read_sources(skill_dir)
+
+    # Guarded ahead of the general missing-vars scan: sprint_status and
+    # deferred_work_file derive from it, and unlike the scan (absent keys
+    # only) this also HALTs on a present-but-empty value.
+    referenced = {name for _, content in sources for name in template_vars(content)}
+    if referenced.intersection(_ARTIFACT_VARS) and "sprint_status" not in vars_:
+        raise Halt(
+            "config is missing `implementation_artifacts` "
+            "(expected under [core] or [modules.bmm] in _bmad/config.toml)"
+        )
 
     missing = collect_missing_vars(sources, vars_)
     if missing:
@@ -353,28 +508,136 @@ def main():
             f"`{name}` (referenced by {', '.join(files)})"
             for name, files in sorted(missing.items())
         )
-        print(
-            f"HALT and report to the user: config is missing {details} "
+        raise Halt(
+            f"config is missing {details} "
             "(expected under [core] or [modules.bmm] in _bmad/config.toml)"
         )
-        sys.exit(1)
 
-    workflow = resolve_workflow(root, script_dir.replace(os.sep, "/"), skill_name)
+    workflow = resolve_workflow(root, skill_dir, skill_name)
 
     out_dir = posixpath.join(root, "_bmad", "render", skill_name)
-    os.makedirs(out_dir, exist_ok=True)
+    render_incremental(out_dir, sources, vars_, workflow, renderer_digest)
+    return out_dir
 
-    for fname in os.listdir(out_dir):
-        if fname.endswith(".md"):
-            os.remove(posixpath.join(out_dir, fname))
 
-    for fname, content in sources:
-        dst = posixpath.join(out_dir, fname)
-        with open(dst, "w", encoding="utf-8", newline="") as fh:
-            fh.write(render_workflow(render_template(content, vars_), workflow))
+def renderer_digest():
+    with open(os.path.abspath(__file__), "rb") as fh:
+        return _digest(fh.read())
+
+
+def opted_in_skills(skill_dir):
+    """This skill plus every sibling skill directory that ships a render.py."""
+    skills_root = posixpath.dirname(skill_dir)
+    found = []
+    for name in sorted(os.listdir(skills_root)):
+        candidate = posixpath.join(skills_root, name)
+        if os.path.isfile(posixpath.join(candidate, "render.py")):
+            found.append(candidate)
+    return found
 
-    workflow_md = posixpath.join(out_dir, "workflow.md")
-    print(f"read and follow {workflow_md}")
+
+_HALT_PREFIX = "HALT and report to the user: "
+
+
+def run_own_renderer(root, skill_dir):
+    """Run a skill's own render.py (one that differs from this renderer) as
+    its own process. Returns its report line; raises Halt on its HALT."""
+    env = dict(os.environ, **{PROJECT_ROOT_ENV: root})
+    proc = subprocess.run(
+        [sys.executable, posixpath.join(skill_dir, "render.py")],
+        cwd=skill_dir, env=env, capture_output=True, text=True, encoding="utf-8",
+    )
+    lines = proc.stdout.strip().splitlines()
+    for line in lines:
+        if line.startswith(_HALT_PREFIX):
+            raise Halt(line[len(_HALT_PREFIX):])
+    if proc.returncode:
+        detail = (proc.stderr.strip().splitlines() or [f"exit status {proc.returncode}"])[-1]
+        raise Halt(f"{skill_dir}/render.py failed: {detail}")
+    return f"rendered by its own render.py ({lines[-1] if lines else 'no output'})"
+
+
+def _render_job(job):
+    """Process-pool entry point: (skill_dir, report, None) or (skill_dir, None, halt)."""
+    root, skill_dir, vars_, digest = job
+    try:
+        own = _read_bytes(posixpath.join(skill_dir, "render.py"))
+        if own is not None and _digest(own) != digest:
+            return skill_dir, run_own_renderer(root, skill_dir), None
+        return skill_dir, f"rendered to {render_skill(root, skill_dir, vars_, digest)}", None
+    except Halt as halt:
+        return skill_dir, None, str(halt)
+    except OSError as error:
+        return skill_dir, None, f"cannot read {error.filename or skill_dir}: {error.strerror or error}"
+
+
+def render_all(root, skill_dirs, jobs=None):
+    """Precompile several skills against one central-config load. Skills fan
+    out across a process pool of `jobs` workers (default: one per CPU, never
+    more than there are skills); one worker renders inline. Returns
+    [(skill_dir, report or None, halt message or None)] in input order. A
+    config that cannot load HALTs for all of them."""
+    vars_ = central_vars(root)
+    digest = renderer_digest()
+    work = [(root, skill_dir, vars_, digest) for skill_dir in skill_dirs]
+    workers = min(jobs or os.cpu_count() or 1, len(work))
+    if workers <= 1:
+        return [_render_job(job) for job in work]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_render_job, work))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render BMad skill templates into _bmad/render/.",
+    )
+    parser.add_argument(
+        "--all", action="store_true",
+        help="Precompile this skill and every sibling skill that ships a render.py",
+    )
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=None,
+        help="Worker processes for --all (default: one per CPU)",
+    )
+    parser.add_argument(
+        "skills", nargs="*", metavar="SKILL_DIR",
+        help="Additional skill directories to precompile with --all",
+    )
+    args = parser.parse_args()
+    if args.skills and not args.all:
+        parser.error("SKILL_DIR arguments require --all")
+
+    script_dir = os.path.dirname(os.path.abspath(__file__)).replace(os.sep, "/")
+    try:
+        root = find_project_root().replace(os.sep, "/")
+        if not args.all:
+            out_dir = render_skill(root, script_dir, central_vars(root), renderer_digest())
+            workflow_md = posixpath.join(out_dir, "workflow.md")
+            print(f"read and follow {workflow_md}")
+            return
+        skill_dirs = opted_in_skills(script_dir)
+        for extra in args.skills:
+            extra = os.path.abspath(extra).replace(os.sep, "/")
+            if extra not in skill_dirs:
+                skill_dirs.append(extra)
+        results = render_all(root, skill_dirs, args.jobs)
+    except Halt as halt:
+        print(f"{_HALT_PREFIX}{halt}")
+        sys.exit(1)
+    except OSError as error:
+        print(f"{_HALT_PREFIX}cannot read {error.filename}: {error.strerror or error}")
+        sys.exit(1)
+
+    failed = False
+    for skill_dir, report, halt in results:
+        name = posixpath.basename(skill_dir)
+        if halt is None:
+            print(f"{name}: {report}")
+        else:
+            failed = True
+            print(f"{name}: HALT — {halt}")
+    if failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -25,12 +25,16 @@ comes from the core resolver; custom personas/parties come from
 this one, else from the user's override TOMLs read directly. Anything that
 can't be resolved is simply omitted and flagged, never fatal.
 
-Stdlib only (Python 3.11+ for tomllib).
+Stdlib only (Python 3.11+ for tomllib). Resolver answers come from the
+project's shared resolver_client.py (in-process, else a running
+resolver_server.py, else the scripts), or from spawning the scripts on an
+install that predates it.
 
   resolve_personas.py --project-root P --skill S
 """
 
 import argparse
+import importlib.util
 import json
 import subprocess
 import sys
@@ -59,6 +63,31 @@ def _run_json(cmd):
         return None
 
 
+_RESOLVER_CLIENTS = {}
+
+
+def _resolver_client(project_root: Path):
+    """{project-root}/_bmad/scripts/resolver_client.py, imported once per process.
+
+    It answers in-process, else from a running resolver_server.py, else by
+    spawning the resolver script. None when the install predates it or it
+    fails to import; the caller then spawns the resolver script itself.
+    """
+    path = project_root / "_bmad" / "scripts" / "resolver_client.py"
+    key = str(path)
+    if key not in _RESOLVER_CLIENTS:
+        module = None
+        if path.is_file():
+            spec = importlib.util.spec_from_file_location("_bmad_resolver_client", path)
+            try:
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+            except (Exception, SystemExit):
+                module = None
+        _RESOLVER_CLIENTS[key] = module
+    return _RESOLVER_CLIENTS[key]
+
+
 def _load_toml(path: Path):
     if not path.exists():
         return {}
@@ -76,8 +105,12 @@ def load_agents(project_root: Path):
     The core resolver may emit agents as a dict keyed by code or as an array
     of tables (depending on how the layers merged); normalize both to a dict.
     """
-    script = project_root / "_bmad" / "scripts" / "resolve_config.py"
-    data = _run_json([sys.executable, str(script), "--project-root", str(project_root), "--key", "agents"])
+    client = _resolver_client(project_root)
+    if client is not None:
+        data = client.config(project_root, ["agents"])
+    else:
+        script = project_root / "_bmad" / "scripts" / "resolve_config.py"
+        data = _run_json([sys.executable, str(script), "--project-root", str(project_root), "--key", "agents"])
     if data is None:
         return {}, False
     agents = data.get("agents", {}) or {}
@@ -107,8 +140,12 @@ def find_party_skill(project_root: Path, skill_root: Path):
 
 def load_party_workflow(project_root: Path, party_skill: Path):
     """Merged [workflow] table for bmad-party-mode (base + user overrides)."""
-    resolver = project_root / "_bmad" / "scripts" / "resolve_customization.py"
-    data = _run_json([sys.executable, str(resolver), "--skill", str(party_skill), "--key", "workflow"])
+    client = _resolver_client(project_root)
+    if client is not None:
+        data = client.customization(project_root, party_skill, ["workflow"])
+    else:
+        resolver = project_root / "_bmad" / "scripts" / "resolve_customization.py"
+        data = _run_json([sys.executable, str(resolver), "--skill", str(party_skill), "--key", "workflow"])
     if data is not None and isinstance(data.get("workflow"), dict):
         return data["workflow"]
     # Fallback: base customize.toml directly, no override merge.
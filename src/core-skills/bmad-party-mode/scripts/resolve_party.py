@@ -21,9 +21,11 @@ The merge is deterministic (a keyed union; a custom member whose code
 matches an installed agent overrides it), so the orchestrator consumes a
 resolved roster instead of re-deriving it every session.
 
-Stdlib only (Python 3.11+ for tomllib). Shells out to the project's
-resolve_config.py and resolve_customization.py; falls back to reading
-customize.toml directly if the customization resolver is unavailable.
+Stdlib only (Python 3.11+ for tomllib). Resolver answers come from the
+project's shared resolver_client.py (in-process, else a running
+resolver_server.py, else the scripts), or from spawning the scripts on an
+install that predates it. Falls back to reading customize.toml directly if
+the customization resolver is unavailable.
 
   resolve_party.py --project-root P --skill S
   resolve_party.py --project-root P --skill S --list-groups
@@ -31,6 +33,7 @@ customize.toml directly if the customization resolver is unavailable.
 """
 
 import argparse
+import importlib.util
 import json
 import subprocess
 import sys
@@ -57,10 +60,39 @@ def _run_json(cmd):
         return None
 
 
+_RESOLVER_CLIENTS = {}
+
+
+def _resolver_client(project_root: Path):
+    """{project-root}/_bmad/scripts/resolver_client.py, imported once per process.
+
+    It answers in-process, else from a running resolver_server.py, else by
+    spawning the resolver script. None when the install predates it or it
+    fails to import; the caller then spawns the resolver script itself.
+    """
+    path = project_root / "_bmad" / "scripts" / "resolver_client.py"
+    key = str(path)
+    if key not in _RESOLVER_CLIENTS:
+        module = None
+        if path.is_file():
+            spec = importlib.util.spec_from_file_location("_bmad_resolver_client", path)
+            try:
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+            except (Exception, SystemExit):
+                module = None
+        _RESOLVER_CLIENTS[key] = module
+    return _RESOLVER_CLIENTS[key]
+
+
 def load_agents(project_root: Path):
     """Installed agents as {code: entry}. Empty dict (with a flag) on failure."""
-    script = project_root / "_bmad" / "scripts" / "resolve_config.py"
-    data = _run_json([sys.executable, str(script), "--project-root", str(project_root), "--key", "agents"])
+    client = _resolver_client(project_root)
+    if client is not None:
+        data = client.config(project_root, ["agents"])
+    else:
+        script = project_root / "_bmad" / "scripts" / "resolve_config.py"
+        data = _run_json([sys.executable, str(script), "--project-root", str(project_root), "--key", "agents"])
     if data is None:
         return {}, False
     return data.get("agents", {}) or {}, True
@@ -68,8 +100,12 @@ def load_agents(project_root: Path):
 
 def load_workflow(project_root: Path, skill_root: Path):
     """Merged [workflow] table. Falls back to the skill's base customize.toml."""
-    script = project_root / "_bmad" / "scripts" / "resolve_customization.py"
-    data = _run_json([sys.executable, str(script), "--skill", str(skill_root), "--key", "workflow"])
+    client = _resolver_client(project_root)
+    if client is not None:
+        data = client.customization(project_root, skill_root, ["workflow"])
+    else:
+        script = project_root / "_bmad" / "scripts" / "resolve_customization.py"
+        data = _run_json([sys.executable, str(script), "--skill", str(skill_root), "--key", "workflow"])
     if data is not None and "workflow" in data:
         return data["workflow"]
     # Fallback: read the skill's base customize.toml directly (no override merge).
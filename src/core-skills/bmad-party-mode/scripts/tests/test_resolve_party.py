@@ -4,8 +4,11 @@
 # ///
 """Unit tests for resolve_party.py — merge, alias, override, group resolution."""
 
+import shutil
 import sys
+import tempfile
 import unittest
+import unittest.mock
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -142,5 +145,41 @@ class TestInstalledCodesIsDefaultRoom(unittest.TestCase):
         self.assertEqual(col["bmad-agent-analyst"]["name"], "Mary-Custom")
 
 
+class TestInProcessResolvers(unittest.TestCase):
+    SCRIPTS = Path(__file__).resolve().parents[4] / "scripts"
+
+    def test_loads_agents_and_workflow_through_the_shared_client(self):
+        with tempfile.TemporaryDirectory() as d:
+            root = Path(d)
+            scripts = root / "_bmad" / "scripts"
+            scripts.mkdir(parents=True)
+            for script in self.SCRIPTS.glob("*.py"):
+                shutil.copy(script, scripts / script.name)
+            (root / "_bmad" / "config.toml").write_text(
+                '[agents.bmad-agent-pm]\nname = "John"\n', encoding="utf-8")
+            skill = root / "bmad-party-mode"
+            skill.mkdir()
+            (skill / "customize.toml").write_text(
+                '[workflow]\ndefault_party = "wr"\n', encoding="utf-8")
+
+            with unittest.mock.patch("subprocess.run", side_effect=AssertionError("spawned")):
+                agents, ok = rp.load_agents(root)
+                workflow = rp.load_workflow(root, skill)
+            self.assertTrue(ok)
+            self.assertEqual(agents["bmad-agent-pm"]["name"], "John")
+            self.assertEqual(workflow, {"default_party": "wr"})
+
+    def test_install_without_the_client_spawns_the_scripts(self):
+        with tempfile.TemporaryDirectory() as d:
+            root = Path(d)
+            (root / "_bmad" / "scripts").mkdir(parents=True)
+            spawned = {"agents": {"bmad-agent-pm": {"name": "John"}}}
+            with unittest.mock.patch.object(rp, "_run_json", return_value=spawned) as run:
+                agents, ok = rp.load_agents(root)
+            self.assertTrue(ok)
+            self.assertEqual(agents, spawned["agents"])
+            self.assertIn("resolve_config.py", run.call_args.args[0][1])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# ///
+"""Benchmark word_metrics.word_count against the two-regex count it replaced.
+
+Builds English, Chinese, Japanese and mixed corpora, checks both
+implementations agree on every line and on each whole corpus (plus every
+single code point, so whitespace and CJK edges cannot drift), then times
+them line by line — the way scan() calls word_count — and on the whole text.
+Not collected by pytest (no test_ prefix).
+Run: uv run scripts/tests/bench_word_count.py
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import word_metrics  # noqa: E402
+
+CORPORA = {
+    "english": [
+        "The quick brown fox jumps over the lazy dog, again and again.",
+        "- Ground every estimate in the measured counts, not a guess.",
+        "",
+    ],
+    "chinese": [
+        "中文句子，没有空格分隔的词语。",
+        "认识 BMad-Help：你的智能向导，它也驱动工作流。",
+        "",
+    ],
+    "japanese": [
+        "これは日本語の文章です。ｶﾀｶﾅも数えます。",
+        "レビューは　全角スペースで区切られることもある。",
+        "",
+    ],
+    "mixed": [
+        "The quick brown fox jumps over the lazy dog, again and again.",
+        "これは日本語の文章です。Mixed with English words.",
+        "中文句子，没有空格分隔的词语。BMad 方法",
+        "Café naïve résumé — déjà vu with a no-break space",
+        "",
+    ],
+}
+
+
+def legacy_word_count(text: str) -> int:
+    """The pre-tokenizer count: one regex pass to count CJK, one to blank it."""
+    cjk = len(word_metrics.CJK.findall(text))
+    return cjk + len(word_metrics.CJK.sub(" ", text).split())
+
+
+def agree() -> str | None:
+    """First input the implementations disagree on, or None."""
+    for code in range(sys.maxunicode + 1):
+        char = chr(code)
+        if 0xD800 <= code <= 0xDFFF:
+            continue
+        sample = f"a{char}b {char}"
+        if word_metrics.word_count(sample) != legacy_word_count(sample):
+            return f"U+{code:04X}"
+    for name, lines in CORPORA.items():
+        for line in lines + ["\n".join(lines)]:
+            if word_metrics.word_count(line) != legacy_word_count(line):
+                return f"{name}: {line!r}"
+    return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=20000, help="lines per corpus")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    mismatch = agree()
+    if mismatch:
+        print(f"error: implementations disagree on {mismatch}", file=sys.stderr)
+        return 1
+
+    print(f"{args.lines} lines per corpus, best of {args.repeat}; counts identical")
+    for name, sample in CORPORA.items():
+        lines = (sample * (args.lines // len(sample) + 1))[: args.lines]
+        text = "\n".join(lines)
+        for label, call in (
+            ("per line", lambda f: sum(map(f, lines))),
+            ("whole text", lambda f: f(text)),
+        ):
+            legacy = min(timeit.repeat(lambda: call(legacy_word_count), number=1, repeat=args.repeat))
+            single = min(timeit.repeat(lambda: call(word_metrics.word_count), number=1, repeat=args.repeat))
+            print(
+                f"{name:9} {label:10}  legacy {legacy * 1e3:7.2f} ms"
+                f"  word_count {single * 1e3:7.2f} ms  ({legacy / single:.1f}x)"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,13 +4,33 @@
 # ///
 """Tests for word_metrics.py."""
 
+import io
+import json
+import shutil
+import subprocess
 import sys
+import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from word_metrics import section_metrics, word_count
+import word_metrics
+from word_metrics import (
+    BaselineError,
+    cached_metrics,
+    diff_metrics,
+    expand_paths,
+    load_cache,
+    measure_many,
+    metrics,
+    save_cache,
+    scan,
+    section_metrics,
+    word_count,
+    write_jsonl,
+)
 
 DOC = """Intro line before any heading.
 
@@ -38,6 +58,13 @@ class WordMetricsTest(unittest.TestCase):
         self.assertEqual(word_count("one two  three\nfour"), 4)
         self.assertEqual(word_count(""), 0)
 
+    def test_word_count_cjk(self):
+        self.assertEqual(word_count("中文字"), 3)
+        self.assertEqual(word_count("BMad 方法"), 3)
+        self.assertEqual(word_count("日本語の文章。ok"), 7)
+        self.assertEqual(word_count("全角\u3000スペース"), 6)
+        self.assertEqual(word_count("Café naïve\u00a0déjà"), 3)
+
     def test_sections_split_on_headings(self):
         sections = section_metrics(DOC)
         headings = [s["heading"] for s in sections]
@@ -57,6 +84,142 @@ class WordMetricsTest(unittest.TestCase):
         sections = section_metrics("# Only\n\nwords here\n")
         self.assertEqual([s["heading"] for s in sections], ["Only"])
 
+    def test_scan_streams_lines(self):
+        total, sections = scan(iter(DOC.splitlines(keepends=True)))
+        self.assertEqual(total, word_count(DOC))
+        self.assertEqual(sections, section_metrics(DOC))
+
+    def test_metrics_matches_whole_text_count(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "doc.md"
+            path.write_bytes(DOC.replace("\n", "\r\n").encode("utf-8"))
+            result = metrics(path)
+        self.assertEqual(result["total_words"], word_count(DOC))
+        self.assertEqual(result["sections"], section_metrics(DOC))
+
+
+class MultiFileTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        (self.root / "sub").mkdir()
+        (self.root / "a.md").write_text("# A\n\none two\n", encoding="utf-8")
+        (self.root / "sub" / "b.md").write_text("# B\n\nthree\n", encoding="utf-8")
+        (self.root / "notes.txt").write_text("skipped words\n", encoding="utf-8")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_directory_expands_recursively_to_markdown(self):
+        paths = expand_paths([str(self.root)])
+        self.assertEqual([Path(p).name for p in paths], ["a.md", "b.md"])
+
+    def test_glob_and_duplicates(self):
+        a = str(self.root / "a.md")
+        paths = expand_paths([a, str(self.root / "*.md"), str(self.root / "*.txt")])
+        self.assertEqual([Path(p).name for p in paths], ["a.md", "notes.txt"])
+
+    def test_pool_preserves_order_and_summarizes(self):
+        paths = expand_paths([str(self.root)]) + [str(self.root / "missing.md")]
+        out = io.StringIO()
+        summary = write_jsonl(measure_many(paths, jobs=2), out)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([line.get("total_words") for line in lines[:2]], [4, 3])
+        self.assertIn("error", lines[2])
+        self.assertEqual(lines[-1], {"summary": summary})
+        self.assertEqual(summary, {"files": 2, "errors": 1, "total_words": 7})
+
+
+class CachedMetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "doc.md"
+        self.path.write_text(DOC, encoding="utf-8")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_first_run_matches_metrics_and_flags_everything(self):
+        result, _ = cached_metrics(self.path, {})
+        plain = metrics(self.path)
+        self.assertEqual(result["total_words"], plain["total_words"])
+        self.assertEqual(
+            [{k: s[k] for k in ("heading", "level", "words")} for s in result["sections"]],
+            plain["sections"],
+        )
+        self.assertTrue(all(s["changed"] for s in result["sections"]))
+
+    def test_only_edited_section_is_recounted(self):
+        _, entry = cached_metrics(self.path, {})
+        self.path.write_text(DOC.replace("Delta epsilon.", "Delta epsilon zeta eta."), encoding="utf-8")
+        with mock.patch.object(word_metrics, "count_sections", wraps=word_metrics.count_sections) as counted:
+            result, _ = cached_metrics(self.path, entry)
+        self.assertEqual(counted.call_args.args[1], {3})
+        changed = {s["heading"]: (s["changed"], s["delta"]) for s in result["sections"]}
+        self.assertEqual(changed["Section B"], (True, 2))
+        self.assertEqual(changed["Section A"], (False, 0))
+        self.assertEqual(result["delta_words"], 2)
+        self.assertEqual(result["total_words"], metrics(self.path)["total_words"])
+
+    def test_removed_sections_reported(self):
+        _, entry = cached_metrics(self.path, {})
+        self.path.write_text(DOC.split("## Section B")[0], encoding="utf-8")
+        result, _ = cached_metrics(self.path, entry)
+        self.assertEqual(result["removed"], [{"heading": "Section B", "level": 2, "words": 2}])
+        self.assertEqual(result["delta_words"], -5)  # "##" counts as a word
+
+    def test_cache_round_trip_and_bad_files(self):
+        cache_path = Path(self.tmp.name) / "cache" / "metrics.json"
+        self.assertEqual(load_cache(cache_path), {})
+        _, entry = cached_metrics(self.path, {})
+        save_cache(cache_path, {"doc": entry})
+        self.assertEqual(load_cache(cache_path), {"doc": entry})
+        cache_path.write_text("not json", encoding="utf-8")
+        self.assertEqual(load_cache(cache_path), {})
+
+
+class DiffMetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.old = self.root / "old.md"
+        self.new = self.root / "doc.md"
+        self.old.write_text(DOC, encoding="utf-8")
+        edited = DOC.replace("Two words here indeed.", "Two words.").split("## Section B")[0]
+        self.new.write_text(edited + "## Section C\n\nNew.\n", encoding="utf-8")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def check(self, result):
+        rows = {r["heading"]: (r["before"], r["after"], r["delta"]) for r in result["sections"]}
+        self.assertEqual(rows["Title"], (4, 2, -2))
+        self.assertEqual(rows["Section A"], (14, 14, 0))
+        self.assertEqual(rows["Section C"], (0, 1, 1))
+        self.assertEqual(result["sections"][-1]["heading"], "Section B")
+        self.assertEqual(rows["Section B"], (2, 0, -2))
+        self.assertEqual(result["before_words"], metrics(self.old)["total_words"])
+        self.assertEqual(result["after_words"], metrics(self.new)["total_words"])
+        self.assertEqual(result["delta_words"], result["after_words"] - result["before_words"])
+
+    def test_diff_against_file(self):
+        result = diff_metrics(self.new, str(self.old))
+        self.check(result)
+        self.assertEqual(result["reduction_pct"], round(3 * 100 / result["before_words"], 1))
+
+    @unittest.skipUnless(shutil.which("git"), "git not installed")
+    def test_diff_against_git_revision(self):
+        git = ["git", "-C", str(self.root), "-c", "user.name=t", "-c", "user.email=t@t"]
+        subprocess.run(git + ["init", "-q"], check=True)
+        shutil.copy(self.new, self.root / "keep.md")
+        shutil.copy(self.old, self.new)
+        subprocess.run(git + ["add", "doc.md"], check=True)
+        subprocess.run(git + ["commit", "-qm", "old"], check=True)
+        shutil.copy(self.root / "keep.md", self.new)
+        self.check(diff_metrics(self.new, "HEAD"))
+        with self.assertRaises(BaselineError):
+            diff_metrics(self.new, "no-such-rev")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -13,89 +13,435 @@ run of the same character at least as long, so ```` fences may embed ```
 examples). A word is any whitespace-separated token, plus one word per CJK
 character since those scripts do not space-delimit words. For non-markdown
 input the result is a single section holding the full text.
+
+Given more than one path, a directory (measured recursively for *.md, or for
+--glob), or a quoted glob pattern, the documents are measured across a process
+pool and streamed as JSONL: one compact object per file in input order (a file
+that cannot be read yields {"file", "error"} instead), then one closing
+{"summary": {"files", "errors", "total_words"}} line.
+
+With --cache FILE, each section's count is stored against a digest of its
+body text. A later run hashes the sections first and recounts only those whose
+digest is new. Every section then carries "changed" (its body differs from the
+section at the same heading path last run) and "delta" (its word change), and
+the document carries "delta_words" plus "removed" for sections that
+disappeared. The first cached run of a document diffs against nothing, so
+every section shows as changed.
+
+With --baseline OLD, the document is diffed against OLD: another file, or a
+git revision (e.g. HEAD~1) of the same path when no such file exists. Both
+revisions are scanned once and their sections aligned by heading path; the
+result holds before/after/delta totals, the reduction percentage, and one
+{"heading", "level", "before", "after", "delta"} row per section, with
+sections only the baseline has listed last.
 """
 
 import argparse
+import glob
+import hashlib
+import io
 import json
+import os
 import re
+import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 HEADING = re.compile(r"^(#{1,6})\s+(\S.*)$")
 FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
-CJK = re.compile(r"[぀-ヿ㐀-䶿一-鿿豈-﫿가-힯ｦ-ﾟ]")
+CACHE_VERSION = 1
+CJK_RANGES = "぀-ヿ㐀-䶿一-鿿豈-﫿가-힯ｦ-ﾟ"
+CJK = re.compile(f"[{CJK_RANGES}]")
+# One CJK character, or a run of anything that is neither whitespace nor CJK.
+# `\s` matches exactly the characters str.split() splits on.
+WORD = re.compile(f"[{CJK_RANGES}]|[^\\s{CJK_RANGES}]+")
 
 
 def word_count(text: str) -> int:
-    cjk = len(CJK.findall(text))
-    return cjk + len(CJK.sub(" ", text).split())
+    # Most lines hold no CJK at all; str.split() counts those without a regex.
+    if text.isascii() or not CJK.search(text):
+        return len(text.split())
+    return sum(1 for _ in WORD.finditer(text))
 
 
-def section_metrics(text: str) -> list[dict]:
-    sections = []
-    current = {"heading": "(preamble)", "level": 0, "body": []}
+def walk(lines):
+    """Yield (line, heading) for each line, where heading is (level, title) for
+    a markdown heading outside any fenced block and None otherwise."""
     open_fence = None  # (char, length) while inside a fenced block
-    for line in text.splitlines():
-        fence = FENCE.match(line)
+    for line in lines:
+        first = line[:1]  # cheap prefilter: most lines can be neither a fence nor a heading
+        fence = FENCE.match(line) if first in "`~ " else None
         if fence:
             marker = fence.group(1)
             if open_fence is None:
                 open_fence = (marker[0], len(marker))
             elif marker[0] == open_fence[0] and len(marker) >= open_fence[1] and line.strip() == marker:
                 open_fence = None
-            current["body"].append(line)
+            yield line, None
             continue
-        match = None if open_fence else HEADING.match(line)
-        if match:
-            sections.append(current)
-            current = {
-                "heading": match.group(2).strip(),
-                "level": len(match.group(1)),
-                "body": [],
-            }
+        match = HEADING.match(line) if first == "#" and open_fence is None else None
+        yield line, (len(match.group(1)), match.group(2).strip()) if match else None
+
+
+def scan(lines) -> tuple[int, list[dict]]:
+    """One pass over an iterable of lines: (total words, per-section metrics).
+
+    Only a running word count is kept per section, never its lines, so a file
+    iterator streams documents of any size in constant memory. Counting line
+    by line matches counting the joined text because no word spans a newline.
+    """
+    sections = []
+    current = {"heading": "(preamble)", "level": 0, "words": 0}
+    total = 0
+    for line, heading in walk(lines):
+        words = word_count(line)
+        total += words
+        if heading:
+            if current["level"] or current["words"]:
+                sections.append(current)
+            current = {"heading": heading[1], "level": heading[0], "words": 0}
         else:
-            current["body"].append(line)
-    sections.append(current)
+            current["words"] += words
+    if current["level"] or current["words"]:
+        sections.append(current)
+    return total, sections
 
-    out = []
+
+def section_metrics(text: str) -> list[dict]:
+    return scan(text.splitlines())[1]
+
+
+def metrics_scan(path: Path) -> tuple[int, list[dict]]:
+    with path.open(encoding="utf-8", errors="replace") as f:
+        return scan(f)
+
+
+def metrics(path: Path) -> dict:
+    total, sections = metrics_scan(path)
+    return {"file": str(path), "total_words": total, "sections": sections}
+
+
+def heading_paths(sections: list[dict]) -> list[tuple]:
+    """Key each section by its heading path (the titles of its enclosing
+    sections, then its own) plus an occurrence number for repeated paths, so
+    sections of two revisions of a document can be aligned."""
+    stack = []
+    seen = {}
+    keys = []
     for section in sections:
-        words = word_count("\n".join(section["body"]))
-        if section["heading"] == "(preamble)" and words == 0:
+        level = section["level"]
+        while stack and stack[-1][0] >= level:
+            stack.pop()
+        if level:
+            stack.append((level, section["heading"]))
+        path = tuple(title for _, title in stack) or (section["heading"],)
+        seen[path] = seen.get(path, 0) + 1
+        keys.append((path, seen[path] - 1))
+    return keys
+
+
+def digest_sections(lines) -> list[dict]:
+    """First pass of a cached measure: per section its heading, the words of
+    its heading line, and a digest of its body. Hashing a line costs a
+    fraction of counting it."""
+    sections = []
+    current = {"heading": "(preamble)", "level": 0, "heading_words": 0}
+    digest = hashlib.blake2b(digest_size=16)
+    update = digest.update  # bound once: this loop runs per line
+    for line, heading in walk(lines):
+        if heading is None:
+            update(line.encode("utf-8"))
             continue
-        out.append(
-            {"heading": section["heading"], "level": section["level"], "words": words}
-        )
-    return out
+        current["digest"] = digest.hexdigest()
+        sections.append(current)
+        current = {"heading": heading[1], "level": heading[0], "heading_words": word_count(line)}
+        digest = hashlib.blake2b(digest_size=16)
+        update = digest.update
+    current["digest"] = digest.hexdigest()
+    sections.append(current)
+    return sections
 
 
-def metrics(path: Path) -> dict:
-    text = path.read_text(encoding="utf-8", errors="replace")
+def count_sections(lines, wanted: set[int]) -> dict[int, int]:
+    """Body word counts for the sections at the `wanted` indexes only."""
+    counts = dict.fromkeys(wanted, 0)
+    last = max(wanted, default=-1)
+    index = 0
+    for line, heading in walk(lines):
+        if heading:
+            index += 1
+            if index > last:
+                break
+        elif index in counts:
+            counts[index] += word_count(line)
+    return counts
+
+
+def cached_metrics(path: Path, previous: dict) -> tuple[dict, dict]:
+    """metrics() reusing the counts of `previous` — this document's cache entry
+    from the last run, {} if none — for every section body whose digest is
+    unchanged. Returns the annotated result and the new cache entry."""
+    known = {s["digest"]: s["words"] for s in previous.get("sections", ())}
+    with path.open(encoding="utf-8", errors="replace") as f:
+        sections = digest_sections(f)
+    missing = {i for i, s in enumerate(sections) if s["digest"] not in known}
+    counts = {}
+    if missing:
+        with path.open(encoding="utf-8", errors="replace") as f:
+            counts = count_sections(f, missing)
+    total = 0
+    kept = []
+    for i, section in enumerate(sections):
+        words = counts[i] if i in missing else known[section["digest"]]
+        total += words + section["heading_words"]
+        if section["level"] or words:
+            kept.append({"heading": section["heading"], "level": section["level"],
+                         "digest": section["digest"], "words": words})
+
+    before = dict(zip(heading_paths(previous.get("sections", [])), previous.get("sections", [])))
+    out = []
+    for key, section in zip(heading_paths(kept), kept):
+        old = before.pop(key, None)
+        out.append({
+            "heading": section["heading"],
+            "level": section["level"],
+            "words": section["words"],
+            "changed": old is None or old["digest"] != section["digest"],
+            "delta": section["words"] - (old["words"] if old else 0),
+        })
+    result = {
+        "file": str(path),
+        "total_words": total,
+        "delta_words": total - previous.get("total_words", 0),
+        "sections": out,
+        "removed": [
+            {"heading": s["heading"], "level": s["level"], "words": s["words"]}
+            for s in before.values()
+        ],
+    }
+    return result, {"total_words": total, "sections": kept}
+
+
+def load_cache(path: Path) -> dict:
+    """Cached document entries by absolute path; empty when the cache file is
+    missing, unreadable, or from another format version."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    documents = data.get("documents")
+    return documents if isinstance(documents, dict) else {}
+
+
+def save_cache(path: Path, documents: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    tmp.write_text(
+        json.dumps({"version": CACHE_VERSION, "documents": documents}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    os.replace(tmp, path)
+
+
+class BaselineError(Exception):
+    """The --baseline argument names neither a file nor a readable git revision."""
+
+
+def scan_revision(path: Path, rev: str) -> tuple[int, list[dict]]:
+    """scan() of `path` as committed at git revision `rev`, streamed from
+    `git show` so the old revision is never held in memory either."""
+    command = ["git", "-C", str(path.resolve().parent), "show", f"{rev}:./{path.name}"]
+    try:
+        proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except OSError as error:
+        raise BaselineError(f"cannot run git: {error.strerror or error}") from error
+    with proc:
+        result = scan(io.TextIOWrapper(proc.stdout, encoding="utf-8", errors="replace"))
+        stderr = proc.stderr.read().decode("utf-8", "replace").strip()
+    if proc.returncode:
+        raise BaselineError(f"{rev!r} is not a file or a git revision of {path}: {stderr}")
+    return result
+
+
+def diff_metrics(path: Path, baseline: str) -> dict:
+    """Per-section before/after/delta of `path` against `baseline` (a file,
+    else a git revision of `path`), aligned by heading path."""
+    old_path = Path(baseline)
+    if old_path.is_file():
+        with old_path.open(encoding="utf-8", errors="replace") as f:
+            before_total, before = scan(f)
+    else:
+        before_total, before = scan_revision(path, baseline)
+    after_total, after = metrics_scan(path)
+
+    old = dict(zip(heading_paths(before), before))
+    rows = []
+    for key, section in zip(heading_paths(after), after):
+        prior = old.pop(key, None)
+        words = prior["words"] if prior else 0
+        rows.append(_diff_row(section, words, section["words"]))
+    rows.extend(_diff_row(section, section["words"], 0) for section in old.values())
+    delta = after_total - before_total
     return {
         "file": str(path),
-        "total_words": word_count(text),
-        "sections": section_metrics(text),
+        "baseline": baseline,
+        "before_words": before_total,
+        "after_words": after_total,
+        "delta_words": delta,
+        "reduction_pct": round(-delta * 100 / before_total, 1) if before_total else 0.0,
+        "sections": rows,
     }
 
 
+def _diff_row(section: dict, before: int, after: int) -> dict:
+    return {"heading": section["heading"], "level": section["level"],
+            "before": before, "after": after, "delta": after - before}
+
+
+def _measure(path: str, previous: dict | None = None) -> dict:
+    try:
+        if previous is None:
+            return metrics(Path(path))
+        result, entry = cached_metrics(Path(path), previous)
+        result["_cache"] = entry
+        return result
+    except OSError as error:
+        return {"file": path, "error": error.strerror or str(error)}
+
+
+def expand_paths(args: list[str], pattern: str = "**/*.md") -> list[str]:
+    """Files named by args, in order and without duplicates: directories are
+    searched recursively for `pattern`, glob patterns are expanded, and any
+    other argument is kept as given so a missing file surfaces as an error."""
+    out = []
+    seen = set()
+    for arg in args:
+        if os.path.isdir(arg):
+            found = sorted(str(p) for p in Path(arg).glob(pattern) if p.is_file())
+        elif glob.has_magic(arg):
+            found = sorted(p for p in glob.glob(arg, recursive=True) if os.path.isfile(p))
+        else:
+            found = [arg]
+        for path in found:
+            if path not in seen:
+                seen.add(path)
+                out.append(path)
+    return out
+
+
+def measure_many(paths: list[str], jobs: int | None = None, cache: dict | None = None):
+    """Yield one metrics (or error) dict per path, in input order. More than
+    one job fans the files out over a process pool; chunked map keeps the
+    per-file IPC small on trees with hundreds of short documents. With a
+    `cache` (load_cache's documents dict) each document is measured against
+    its entry, which is replaced in place as results arrive."""
+    keys = [str(Path(p).resolve()) for p in paths] if cache is not None else None
+    previous = [cache.get(key, {}) for key in keys] if cache is not None else [None] * len(paths)
+
+    def collect(results):
+        for i, result in enumerate(results):
+            entry = result.pop("_cache", None)
+            if entry is not None:
+                cache[keys[i]] = entry
+            yield result
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(paths) < 2:
+        yield from collect(map(_measure, paths, previous))
+        return
+    jobs = min(jobs, len(paths))
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from collect(pool.map(_measure, paths, previous, chunksize=chunksize))
+
+
+def write_jsonl(results, out) -> dict:
+    """Stream results as JSONL to `out`, then the summary line; return it."""
+    summary = {"files": 0, "errors": 0, "total_words": 0}
+    for result in results:
+        if "error" in result:
+            summary["errors"] += 1
+        else:
+            summary["files"] += 1
+            summary["total_words"] += result["total_words"]
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    out.write(json.dumps({"summary": summary}) + "\n")
+    return summary
+
+
 def main() -> int:
     if hasattr(sys.stdout, "reconfigure"):
         sys.stdout.reconfigure(encoding="utf-8")  # JSON is UTF-8 regardless of locale code page
     parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
-    parser.add_argument("path", help="document to measure")
+    parser.add_argument(
+        "paths", nargs="+", metavar="path",
+        help="document(s) to measure; a directory or glob switches to JSONL output",
+    )
     parser.add_argument("-o", "--output", help="write JSON here (default: stdout)")
+    parser.add_argument(
+        "--glob", default="**/*.md",
+        help="pattern for files inside directory arguments (default: **/*.md)",
+    )
+    parser.add_argument(
+        "--cache",
+        help="reuse and update per-section counts in this JSON file, flagging changed sections",
+    )
+    parser.add_argument(
+        "--baseline", metavar="OLD",
+        help="diff against this earlier file or git revision of the one path given",
+    )
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=0,
+        help="worker processes for multi-file mode (default: one per CPU)",
+    )
     args = parser.parse_args()
 
-    path = Path(args.path)
-    if not path.is_file():
-        print(f"error: not a readable file: {path}", file=sys.stderr)
-        return 2
+    single = len(args.paths) == 1 and not os.path.isdir(args.paths[0]) and not glob.has_magic(args.paths[0])
+    if args.baseline and (not single or args.cache):
+        parser.error("--baseline takes exactly one document and no --cache")
+    cache_path = Path(args.cache) if args.cache else None
+    cache = load_cache(cache_path) if cache_path else None
 
-    result = json.dumps(metrics(path), indent=2, ensure_ascii=False)
+    if single:
+        path = Path(args.paths[0])
+        if not path.is_file():
+            print(f"error: not a readable file: {path}", file=sys.stderr)
+            return 2
+        if args.baseline:
+            try:
+                result = diff_metrics(path, args.baseline)
+            except BaselineError as error:
+                print(f"error: {error}", file=sys.stderr)
+                return 2
+        elif cache is None:
+            result = metrics(path)
+        else:
+            key = str(path.resolve())
+            result, cache[key] = cached_metrics(path, cache.get(key, {}))
+            save_cache(cache_path, cache)
+        result = json.dumps(result, indent=2, ensure_ascii=False)
+        if args.output:
+            Path(args.output).write_text(result + "\n", encoding="utf-8")
+        else:
+            print(result)
+        return 0
+
+    if args.jobs < 0:
+        print("error: --jobs must be zero or more", file=sys.stderr)
+        return 2
+    paths = expand_paths(args.paths, args.glob)
+    results = measure_many(paths, args.jobs or None, cache)
     if args.output:
-        Path(args.output).write_text(result + "\n", encoding="utf-8")
+        with open(args.output, "w", encoding="utf-8") as out:
+            summary = write_jsonl(results, out)
     else:
-        print(result)
-    return 0
+        summary = write_jsonl(results, sys.stdout)
+    if cache is not None:
+        save_cache(cache_path, cache)
+    return 1 if summary["errors"] else 0
 
 
 if __name__ == "__main__":
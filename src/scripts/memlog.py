@@ -22,8 +22,8 @@ Three invariants make it trustworthy:
      edit or delete subcommand by design; history is never rewritten.
   2. Write-only / blind. Every command is an atomic, context-free write and echoes the
      new state as one line of JSON, so the caller never re-reads the file mid-session.
-     The one time the file is read is on resume — and the caller reads it itself, not
-     via this script.
+     The one time the file is read is on resume — by the caller itself, or through
+     the read-only `head` and `tail` commands, which never write anything.
   3. No lifecycle status. A memory log has no "complete" flag. Whether the work is done,
      blocked, or paused is itself a fact that happened, so it is recorded as an entry
      (e.g. `append --type event --text "session complete"`), never as frontmatter the
@@ -31,8 +31,16 @@ Three invariants make it trustworthy:
      resume learns the state by reading the last entries — the same way it learns
      everything else.
 
-Atomicity: every write goes to a temp file, is flushed and fsync'd, then atomically
-renamed over the target, so a crash never leaves a half-written entry.
+Atomicity: `init`, `set`, and the first `append` write the whole file to a temp file,
+flush and fsync it, then atomically rename it over the target. Every later `append` is a
+true append: it writes only the new line at the end of the file, rewrites the fixed-width
+`updated` stamp in place, and fsyncs once, so a session of N appends costs O(N) bytes
+written, not O(N^2). A crash mid-append can leave at most one unterminated tail line;
+the next write truncates it before adding anything, so a half-written entry never
+survives into the log. An append records the size it is about to reach in `.memlog.count`
+before writing (fsync'd first whenever the append itself is), which is how a torn tail
+is told apart from a line hand-added without a final newline: that one is terminated
+and kept.
 
 The file shape (.memlog.md):
 
@@ -61,7 +69,90 @@ for a plain note. The host skill names the vocabulary; the script does not enfor
 Commands:
   init   (--workspace DIR | --path FILE) [--field k=v ...]    create the memlog (errors if it exists)
   append (--workspace DIR | --path FILE) --text STR [--type T] [--by W]  append one entry at the end
+  append-many (--workspace DIR | --path FILE) < entries    append a batch read from stdin
   set    (--workspace DIR | --path FILE) --key K --value V    set/replace a descriptive frontmatter field
+  verify (--workspace DIR | --path FILE)                      recount entries, repair the cached count
+  head   (--workspace DIR | --path FILE)                      frontmatter + entry count only
+  tail   (--workspace DIR | --path FILE) [--n N] [--type T]   the last N entries (of type T)
+  query  (--workspace DIR | --path FILE) [--type T] [--by W] [--entry N]  indexed lookup
+  snapshot (--workspace DIR | --path FILE) [--keep N]         archive old entries, write a digest
+  export (--workspace DIR | --path FILE) --format F [--out FILE]  stream entries as jsonl/csv/sqlite
+  serve  (--workspace DIR | --path FILE)                      answer append/set commands on stdin
+
+`append-many` reads a JSON array, or JSON Lines, of {"text", "type", "by"} objects from
+stdin (`type` and `by` optional) and commits the whole batch with one write and one
+fsync, in input order. A malformed batch is rejected whole; nothing is written.
+
+The `entries` count every ack reports (archived entries included) is cached in a sidecar next to the log
+(`.memlog.count`, JSON `{"entries", "size"}`), so an ack never rescans the body. The
+cache is trusted only while the log's byte size matches the size it recorded; any write
+it did not see (a hand edit, a torn append) invalidates it and the next command
+recounts once. The sidecar is derived data: deleting it is always safe, and `verify`
+recounts from the body and rewrites it unconditionally.
+
+Resume in constant time: `head` parses only the frontmatter, and `tail` reads backwards
+from EOF in blocks until it has N entries, so neither cost grows with the log. Both
+print one JSON object: `head` → {"meta", "entries"}, `tail` → {"entries", "tail": [line,
+...]} in chronological order.
+
+Durability: `--durability` on every writing command (default: the BMAD_MEMLOG_DURABILITY
+environment variable, else `strict`) picks how hard each write is pushed to disk:
+
+  strict  fsync every write (the default; a crash never loses an acked entry)
+  batch   fsync an append only when the last fsync is older than a few seconds or the
+          batch holds an `event` entry (session start/complete/...); init and set always
+          fsync. A crash can drop the last few seconds of acked entries, never tear one.
+  none    never fsync; rely on the rename/append atomicity alone (tmpfs, CI, throwaway runs)
+
+Every ack reports the mode it wrote with. Queued batches keep their own mode: a group
+commit fsyncs if any batch in it asked for strict.
+
+Concurrent writers: every write holds an advisory lock on `.memlog.lock` (flock, or
+msvcrt on Windows), so several agents can record into one workspace without a lost
+update. Appends that find the lock taken don't wait idle: each drops its lines into
+`.memlog.spool/` and queues. Whoever holds the lock next claims every queued batch and
+commits them with its own lines in one write and one fsync (group commit), oldest
+first, so entries stay chronological. A queued writer whose batch was committed for it
+just acks. A batch claimed by a writer that crashed mid-commit is recovered by the next
+one: written again if it never reached the log, dropped if it already did.
+
+Random access: every write also maintains `.memlog.idx`, a binary sidecar holding one
+fixed-size record per entry — its byte offset in the log plus CRC-32 hashes of its type
+and `by` tags — behind a header naming the log size it covers. An append extends it in
+the same write step as the entry; a full rewrite rebuilds it. `query` finds entry N
+with one seek, and `--type`/`--by` matches by scanning 16-byte records instead of the
+markdown, then reads (and re-checks) each hit at its offset. The markdown stays the
+source of truth: an index whose header does not match the log's size is rebuilt from it.
+
+Compaction: `snapshot` rolls all but the newest `--keep` entries (default 50) into the
+next numbered archive segment — `.memlog.1.md`, `.memlog.2.md`, … — then writes a
+derived digest, `.memlog.snapshot.md` (totals, per-type and per-author counts, and the
+latest entry of each type across the whole history). Segments and digest are written
+read-only. A segment is never edited once written, and nothing is dropped: the segments
+in order, followed by the live log, are the complete chronology. The live log records
+how many entries it has archived (`archived` frontmatter field), so every `entries`
+count — and every entry number `query` reports — covers the whole history, and `tail`
+continues into the segments when the live log holds fewer matches than asked for.
+`query` itself searches the live log only. Resume cost is bounded by `--keep` plus the
+digest, however long the effort runs.
+
+Export: `export` streams the whole history (segments, then the live log) one entry at a
+time, with each tag parsed into columns: memlog, n, type, by, text (absent tags are
+null/empty). `jsonl` and `csv` go to stdout unless `--out` names a file; `sqlite` needs
+`--out` and upserts into an `entries` table keyed by (memlog, n), so re-exporting a log,
+or exporting many logs into one database, never duplicates a row.
+
+Server mode: `serve` keeps one process alive for a whole session and reads one JSON
+command per line on stdin, answering each with the same JSON ack on stdout (flushed per
+line) that the one-shot command prints, or {"ok": false, "error"} for a bad command:
+
+  {"cmd": "append", "text": "...", "type": "idea", "by": "user"}
+  {"cmd": "append-many", "entries": [{"text": "...", "type": "idea"}, ...]}
+  {"cmd": "set", "key": "mode", "value": "partner"}
+
+Any command may carry "durability" to override the server's. Every write goes through
+the same lock, spool, and atomic paths as the one-shot commands — still append-only, no
+edits — so a server and one-shot writers can share a log. It exits at EOF.
 
 Addressing: `--workspace` is the run folder, and the memlog is always {workspace}/.memlog.md.
 `--path` points straight at the memlog file instead, for callers that already hold the path.
@@ -69,17 +160,35 @@ Addressing: `--workspace` is the run folder, and the memlog is always {workspace
 from __future__ import annotations  # keep type-hint syntax lazy so the script runs on 3.8+
 
 import argparse
+import csv
 import json
 import os
+import struct
 import sys
+import threading
+import time
+import zlib
+from contextlib import closing, contextmanager
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 MEMLOG = ".memlog.md"
+DURABILITY_ENV = "BMAD_MEMLOG_DURABILITY"
+DURABILITY_LEVELS = ("none", "batch", "strict")  # weakest → strongest
+BATCH_SYNC_INTERVAL = 5.0  # seconds between fsyncs under `batch`
+STAMP_FORMAT = "%Y-%m-%dT%H:%M"
+STAMP_WIDTH = len("YYYY-MM-DDTHH:MM")
+UPDATED_PREFIX = "updated: "
 
 
 def now() -> str:
-    return datetime.now().strftime("%Y-%m-%dT%H:%M")
+    return datetime.now().strftime(STAMP_FORMAT)
 
 
 def resolve(args) -> Path:
@@ -87,6 +196,42 @@ def resolve(args) -> Path:
     return Path(args.path) if args.path else Path(args.workspace) / MEMLOG
 
 
+def sidecar(path: Path, suffix: str) -> Path:
+    """A derived file next to the memlog: .memlog.md → .memlog{suffix}."""
+    return path.with_suffix(suffix)
+
+
+def segment_path(path: Path, k: int) -> Path:
+    """Archive segment k: .memlog.md → .memlog.{k}.md."""
+    return path.with_suffix(f".{k}{path.suffix}")
+
+
+def segments(path: Path) -> list[Path]:
+    """Every archive segment, oldest first. A last segment reaching past the entries the
+    live log records as archived was orphaned by a crash between writing it and rewriting
+    the live log: its entries are still live, so it is left out (the next snapshot
+    rewrites it) and no reader sees them twice."""
+    found = []
+    while segment_path(path, len(found) + 1).is_file():
+        found.append(segment_path(path, len(found) + 1))
+    if found:
+        with open(path, "rb") as f:
+            archived = archived_of(read_head(f)[0])
+        with open(found[-1], "rb") as f:
+            last = read_head(f)[0].get("last", "0")
+        if last.isdigit() and int(last) > archived:
+            found.pop()
+    return found
+
+
+def archived_of(meta: dict) -> int:
+    """How many entries earlier snapshots moved into archive segments."""
+    try:
+        return max(0, int(meta.get("archived", 0)))
+    except ValueError:
+        return 0
+
+
 def split(text: str) -> tuple[dict, str]:
     """Return (frontmatter dict in source order, body str). Frontmatter is plain key: value.
 
@@ -107,6 +252,16 @@ def split(text: str) -> tuple[dict, str]:
     return meta, "\n".join(lines[end + 1:]).lstrip("\n")
 
 
+def read_text(path: Path) -> str:
+    """The memlog's text with its tail settled as repair_tail would: a line a crashed
+    append tore is dropped, any other unterminated last line is kept and terminated."""
+    data = path.read_bytes()
+    if data and not data.endswith(b"\n"):
+        pos = data.rfind(b"\n") + 1
+        data = data[:pos] if torn(path, pos, len(data)) else data + b"\n"
+    return data.decode("utf-8")
+
+
 def render(meta: dict, body: str) -> str:
     # Neutralize newlines in values so a multi-line field can't break the fence on re-read.
     fm = "\n".join(f"{k}: {' '.join(str(v).splitlines())}" for k, v in meta.items())
@@ -119,27 +274,342 @@ def touch(meta: dict) -> None:
     meta["updated"] = now()
 
 
-def write_atomic(path: Path, text: str) -> None:
-    """Temp + flush + fsync + atomic rename, so a crash never half-writes an entry."""
-    tmp = path.with_suffix(path.suffix + ".tmp")
+def write_atomic(path: Path, text: str, sync: bool = True) -> None:
+    """Temp + flush + fsync + atomic rename, so a crash never half-writes an entry. The temp
+    name is unique per writer, so two writers can never rename each other's file. With
+    sync=False (durability `none`) only the rename's atomicity remains."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
     with open(tmp, "w", encoding="utf-8") as f:
         f.write(text)
         f.flush()
-        os.fsync(f.fileno())
+        if sync:
+            os.fsync(f.fileno())
     os.replace(tmp, path)
 
 
+def read_head(f) -> tuple[dict, int, int | None]:
+    """Parse only the frontmatter of a memlog opened in binary mode.
+
+    Returns (meta, offset where the body starts, offset of the `updated` value or None).
+    The offset is only reported for a fixed-width stamp, the one value an append can
+    overwrite in place without shifting a byte of the body.
+    """
+    f.seek(0)
+    if f.readline().rstrip(b"\r\n") != b"---":
+        raise ValueError(".memlog.md has no frontmatter")
+    meta: dict[str, str] = {}
+    slot = None
+    while True:
+        start = f.tell()
+        line = f.readline()
+        if not line:
+            raise ValueError(".memlog.md frontmatter is not terminated")
+        text = line.decode("utf-8").rstrip("\r\n")
+        if text == "---":
+            return meta, f.tell(), slot
+        if ":" not in text:
+            continue
+        k, v = text.split(":", 1)
+        meta[k.strip()] = v.strip()
+        if text.startswith(UPDATED_PREFIX) and len(text) == len(UPDATED_PREFIX) + STAMP_WIDTH:
+            slot = start + len(UPDATED_PREFIX)
+
+
+def complete_end(f, floor: int) -> int:
+    """Offset just past the last newline at or after `floor` — the end of the last complete
+    line — or `floor` if there is none."""
+    pos = f.seek(0, os.SEEK_END)
+    while pos > floor:
+        step = min(4096, pos - floor)
+        f.seek(pos - step)
+        cut = f.read(step).rfind(b"\n")
+        if cut != -1:
+            return pos - step + cut + 1
+        pos -= step
+    return floor
+
+
+def torn(path: Path, pos: int, end: int) -> bool:
+    """Whether an unterminated tail running from `pos` to `end` is a torn append: one
+    that began at or after where the last append started and stops short of the size it
+    recorded up front. Anything else — a line hand-added without a final newline — is
+    not ours to drop."""
+    state = _load_state(path)
+    start, size = state.get("from"), state.get("size")
+    return isinstance(start, int) and isinstance(size, int) and start <= pos and end < size
+
+
+def repair_tail(f, floor: int, path: Path) -> int:
+    """Settle an unterminated tail line and return the new end offset: a torn append is
+    truncated, any other line is terminated and kept."""
+    end = f.seek(0, os.SEEK_END)
+    pos = complete_end(f, floor)
+    if pos == end:
+        return end
+    if torn(path, pos, end):
+        f.truncate(pos)
+        return pos
+    f.seek(end)  # complete_end() leaves the position wherever its last block read stopped
+    f.write(b"\n")
+    return end + 1
+
+
+def scan_entries(f, start: int) -> int:
+    """Count complete entry lines from `start` to EOF without decoding the body."""
+    f.seek(start)
+    return sum(1 for ln in f if ln.startswith(b"- ") and ln.endswith(b"\n"))
+
+
+def iter_lines_reverse(f, floor: int, block: int = 8192):
+    """Yield complete lines (bytes, newline stripped) from EOF back to `floor`, newest
+    first, reading one block at a time. An unterminated tail line is skipped."""
+    pos = complete_end(f, floor)
+    if pos > floor:
+        pos -= 1  # the last line's own newline
+    carry = b""
+    while pos > floor:
+        step = min(block, pos - floor)
+        pos -= step
+        f.seek(pos)
+        parts = (f.read(step) + carry).split(b"\n")
+        carry = parts.pop(0)
+        yield from reversed(parts)
+    if carry:
+        yield carry
+
+
+def parse_entry(line: str) -> tuple[str | None, str | None, str] | None:
+    """(type, by, text) for a `- (type by who) text` entry line; None if not an entry."""
+    if not line.startswith("- "):
+        return None
+    text = line[2:]
+    if not text.startswith("(") or ") " not in text:
+        return None, None, text
+    label, text = text[1:].split(") ", 1)
+    if label.startswith("by "):
+        return None, label[3:], text
+    if " by " in label:
+        entry_type, by = label.split(" by ", 1)
+        return entry_type, by, text
+    return label, None, text
+
+
+INDEX_MAGIC = b"MLX1"
+INDEX_HEADER = struct.Struct("<4sIQ")  # magic, reserved, byte size of the log it covers
+INDEX_RECORD = struct.Struct("<QII")  # entry offset, crc32(type), crc32(by); 0 = no tag
+
+
+def tag_hash(value: str | None) -> int:
+    return zlib.crc32(value.encode("utf-8")) if value else 0
+
+
+def index_record(offset: int, line: str) -> bytes:
+    entry_type, by, _ = parse_entry(line)
+    return INDEX_RECORD.pack(offset, tag_hash(entry_type), tag_hash(by))
+
+
+def index_records(f, start: int):
+    """Yield an index record for every complete entry line from `start` to EOF."""
+    f.seek(start)
+    offset = start
+    for raw in f:
+        if raw.startswith(b"- ") and raw.endswith(b"\n"):
+            yield index_record(offset, raw.decode("utf-8").rstrip("\r\n"))
+        offset += len(raw)
+
+
+def index_length(f, size: int) -> int | None:
+    """Number of records in an open index, or None unless it covers a log of `size` bytes."""
+    f.seek(0)
+    header = f.read(INDEX_HEADER.size)
+    if len(header) != INDEX_HEADER.size:
+        return None
+    magic, _, covered = INDEX_HEADER.unpack(header)
+    length = f.seek(0, os.SEEK_END) - INDEX_HEADER.size
+    if magic != INDEX_MAGIC or covered != size or length % INDEX_RECORD.size:
+        return None
+    return length // INDEX_RECORD.size
+
+
+def rebuild_index(path: Path) -> None:
+    """Rewrite `.memlog.idx` from the log in one scan (temp + rename, like the count)."""
+    with open(path, "rb") as f:
+        _, body_start, _ = read_head(f)
+        size = f.seek(0, os.SEEK_END)
+        records = b"".join(index_records(f, body_start))
+    target = sidecar(path, ".idx")
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(INDEX_HEADER.pack(INDEX_MAGIC, 0, size) + records)
+    os.replace(tmp, target)
+
+
+def extend_index(path: Path, before: int, size: int, records: bytes) -> None:
+    """Append records for entries that grew the log from `before` to `size` bytes, then
+    move the header to `size`. An index that did not cover `before` is rebuilt instead.
+    Like the count, it is never fsync'd: a crash between the two writes leaves a header
+    that no longer matches the log, which forces a rebuild."""
+    try:
+        with open(sidecar(path, ".idx"), "r+b") as f:
+            if index_length(f, before) is not None:
+                f.write(records)
+                f.seek(0)
+                f.write(INDEX_HEADER.pack(INDEX_MAGIC, 0, size))
+                return
+    except OSError:
+        pass
+    refresh_index(path)
+
+
+def refresh_index(path: Path) -> None:
+    try:
+        rebuild_index(path)
+    except OSError:
+        pass  # derived data; the next query rebuilds it
+
+
+def _load_state(path: Path) -> dict:
+    try:
+        state = json.loads(sidecar(path, ".count").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def load_count(path: Path, size: int) -> int | None:
+    """The cached entry count, or None if it is missing, unreadable, or was recorded for
+    a log of a different size."""
+    state = _load_state(path)
+    if state.get("size") != size:
+        return None
+    entries = state.get("entries")
+    return entries if isinstance(entries, int) and entries >= 0 else None
+
+
+def last_synced(path: Path) -> float:
+    """When this log was last fsync'd (epoch seconds; 0 if unknown)."""
+    synced = _load_state(path).get("synced")
+    return synced if isinstance(synced, (int, float)) else 0.0
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Make a rename inside `directory` durable. Skipped where a directory cannot be
+    opened for fsync (Windows)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def store_count(path: Path, entries: int, size: int, synced: float, start: int | None = None,
+                sync: bool = False) -> None:
+    """Record the count for a log of `size` bytes, plus the last fsync time. A count lost
+    to a crash fails the size check and is recounted, so the cache can be stale but never
+    wrong. An append stores its state before writing, with `start` set to the offset it
+    writes at, so a crash that tears it is recognizable (see torn()). An append that
+    fsyncs its entry passes sync=True, so after a power loss the state describing it is
+    on disk whenever any of the entry is, and a zero-filled or partial tail is still
+    recognized as torn. Otherwise the state is never fsync'd."""
+    target = sidecar(path, ".count")
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        state = {"entries": entries, "size": size, "synced": synced}
+        if start is not None:
+            state["from"] = start
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps(state))
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, target)
+        if sync:
+            _fsync_dir(target.parent)
+    except OSError:
+        pass
+
+
+def default_durability() -> str:
+    return os.environ.get(DURABILITY_ENV) or "strict"
+
+
+def should_sync(path: Path, durability: str, lines: list[str]) -> bool:
+    """Whether an append under `durability` must fsync (see Durability above)."""
+    if durability == "strict":
+        return True
+    if durability == "none":
+        return False
+    if any((parse_entry(ln) or (None,))[0] == "event" for ln in lines):
+        return True
+    return time.time() - last_synced(path) >= BATCH_SYNC_INTERVAL
+
+
+def append_lines(path: Path, lines: list[str], durability: str = "strict") -> int | None:
+    """O(1) append: write `lines` as the new last lines and restamp `updated` in place,
+    with at most one fsync for the whole batch. Returns the entry count, or None when the
+    log needs a full rewrite instead (no entries yet, or no fixed-width `updated` stamp to
+    overwrite)."""
+    with open(path, "r+b") as f:
+        meta, body_start, slot = read_head(f)
+        end = repair_tail(f, body_start, path)
+        if slot is None:
+            return None
+        f.seek(body_start)
+        if not f.read(64).strip():  # no entries yet: the first one goes through a full rewrite
+            return None
+        encoded = [(ln + "\n").encode("utf-8") for ln in lines]
+        data = b"".join(encoded)
+        before = load_count(path, end)
+        if before is None:
+            before = archived_of(meta) + scan_entries(f, body_start)
+        entries = before + len(lines)
+        size = end + len(data)
+        sync = should_sync(path, durability, lines)
+        # Recorded before the write: a log that stops short of `size` was torn mid-append.
+        store_count(path, entries, size, time.time() if sync else last_synced(path), start=end, sync=sync)
+        f.seek(end)
+        f.write(data)
+        f.seek(slot)
+        f.write(now().encode("ascii"))
+        f.flush()
+        if sync:
+            os.fsync(f.fileno())
+    records = []
+    offset = end
+    for line, raw in zip(lines, encoded):
+        records.append(index_record(offset, line))
+        offset += len(raw)
+    extend_index(path, end, size, b"".join(records))
+    return entries
+
+
+def rewrite(path: Path, meta: dict, body: str, durability: str) -> int:
+    """Full atomic rewrite (init, set, first append), then refresh both sidecars, since every
+    offset may have moved. Only `none` skips the fsync. Returns the entry count."""
+    touch(meta)
+    sync = durability != "none"
+    write_atomic(path, render(meta, body), sync=sync)
+    entries = archived_of(meta) + entry_count(body)
+    store_count(path, entries, path.stat().st_size, time.time() if sync else last_synced(path))
+    refresh_index(path)
+    return entries
+
+
 def entry_count(body: str) -> int:
     return sum(1 for ln in body.splitlines() if ln.startswith("- "))
 
 
-def ack(path: Path, body: str) -> None:
+def ack_payload(path: Path, entries: int, durability: str) -> dict:
+    return {"ok": True, "memlog": str(path), "entries": entries, "durability": durability}
+
+
+def ack(path: Path, entries: int, durability: str) -> None:
     """Echo new state so the caller never re-reads the file to know where it stands."""
-    print(json.dumps({
-        "ok": True,
-        "memlog": str(path),
-        "entries": entry_count(body),
-    }))
+    print(json.dumps(ack_payload(path, entries, durability)))
 
 
 def cmd_init(args) -> int:
@@ -147,7 +617,6 @@ def cmd_init(args) -> int:
     if path.exists():
         print(f"error: {path} already exists; use append/set to update it", file=sys.stderr)
         return 2
-    path.parent.mkdir(parents=True, exist_ok=True)
     meta: dict[str, str] = {}
     for pair in args.field or []:
         if "=" not in pair:
@@ -155,35 +624,569 @@ def cmd_init(args) -> int:
             return 2
         k, v = pair.split("=", 1)
         meta[k.strip()] = v.strip()
-    touch(meta)
-    write_atomic(path, render(meta, ""))
-    ack(path, "")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with locked(path):
+        if path.exists():  # another writer created it while we waited
+            print(f"error: {path} already exists; use append/set to update it", file=sys.stderr)
+            return 2
+        rewrite(path, meta, "", args.durability)
+    ack(path, 0, args.durability)
     return 0
 
 
+def format_entry(text: str, entry_type: str | None = None, by: str | None = None) -> str:
+    """One `- (type by who) text` line."""
+    text = " ".join(text.split())  # collapse newlines/runs → one-line entry, no prose bloat
+    label = entry_type or ""
+    if by:
+        label = f"{label} by {by}".strip()  # attribution: "(idea by user)" / "(by coach)"
+    tag = f"({label}) " if label else ""
+    return f"- {tag}{text}"
+
+
+def _try_lock(f, blocking: bool) -> bool:
+    if fcntl is not None:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            return False
+        return True
+    while True:
+        f.seek(0)
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            if not blocking:
+                return False
+            time.sleep(0.01)
+
+
+@contextmanager
+def locked(path: Path, blocking: bool = True):
+    """Hold the memlog's advisory write lock for the block. Yields whether it was taken,
+    which is only ever False with blocking=False. The lock file is never deleted."""
+    with open(sidecar(path, ".lock"), "a+b") as f:
+        held = _try_lock(f, blocking)
+        try:
+            yield held
+        finally:
+            if held and fcntl is None:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        # closing the file releases a flock
+
+
+def enqueue(path: Path, lines: list[str], durability: str = "strict") -> Path:
+    """Queue a batch in the spool for the current lock holder to commit. Names sort by
+    arrival; the rename makes a batch visible only once it is complete."""
+    spool = sidecar(path, ".spool")
+    spool.mkdir(exist_ok=True)
+    name = f"{time.time_ns():020d}-{os.getpid()}-{threading.get_ident()}"
+    tmp = spool / f"{name}.tmp"
+    tmp.write_text(json.dumps({"lines": lines, "durability": durability}), encoding="utf-8")
+    queued = spool / f"{name}.json"
+    os.replace(tmp, queued)
+    return queued
+
+
+def strongest(modes) -> str:
+    return max(modes, key=DURABILITY_LEVELS.index, default="none")
+
+
+def _spooled(files: list[Path]) -> tuple[list[str], str]:
+    """The queued batches' lines, in order, and the strongest durability any asked for."""
+    lines: list[str] = []
+    modes = []
+    for batch in files:
+        queued = json.loads(batch.read_text(encoding="utf-8"))
+        lines.extend(queued["lines"])
+        modes.append(queued["durability"])
+    return lines, strongest(modes)
+
+
+def _log_ends_with(path: Path, lines: list[str]) -> bool:
+    tail = "".join(ln + "\n" for ln in lines).encode("utf-8")
+    with open(path, "r+b") as f:
+        _, body_start, _ = read_head(f)
+        end = repair_tail(f, body_start, path)
+        if end - body_start < len(tail):
+            return False
+        f.seek(end - len(tail))
+        return f.read(len(tail)) == tail
+
+
+def _claim_landed(claim: Path, interrupted: list[Path], path: Path) -> bool:
+    """Whether a crashed holder's write reached the log: its claim must name every
+    interrupted batch (a holder that died partway through cleanup leaves only some of
+    them; batch names are unique), and the log must end with everything it recorded
+    writing."""
+    try:
+        recorded = json.loads(claim.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False  # it died before writing the claim, so before writing the log
+    if not {p.name for p in interrupted} <= set(recorded.get("batches", [])):
+        return False
+    return _log_ends_with(path, recorded.get("lines", []))
+
+
+def commit_locked(path: Path, lines: list[str], durability: str = "strict") -> int | None:
+    """Under the lock: commit every queued batch, oldest first, then `lines`, as one write
+    at the strongest durability any of them asked for. Returns the entry count, or None if
+    there was nothing to write.
+
+    Before writing claimed batches, the full batch — claimed lines and our own — goes into
+    `.memlog.spool/claim`, so the next holder can tell whether a crashed write landed."""
+    spool = sidecar(path, ".spool")
+    claim = spool / "claim"
+    interrupted = sorted(spool.glob("*.committing")) if spool.is_dir() else []
+    queued = sorted(spool.glob("*.json")) if spool.is_dir() else []
+    batch, recovered_mode = _spooled(interrupted)
+    if batch and _claim_landed(claim, interrupted, path):
+        batch, recovered_mode = [], "none"  # a crashed holder wrote these, then died
+    claimed = []
+    for queued_batch in queued:
+        claimed.append(queued_batch.with_suffix(".committing"))
+        os.replace(queued_batch, claimed[-1])
+    queued_lines, queued_mode = _spooled(claimed)
+    batch += queued_lines + lines
+    mode = strongest([recovered_mode, queued_mode, durability if lines else "none"])
+    if batch and (interrupted or claimed):
+        record = {"batches": [p.name for p in interrupted + claimed], "lines": batch}
+        write_atomic(claim, json.dumps(record), sync=False)  # like the spool: a process crash is the case
+    entries = write_entries(path, batch, mode) if batch else None
+    for done in interrupted + claimed:
+        done.unlink()
+    if batch and (interrupted or claimed):
+        claim.unlink()
+    return entries
+
+
+def committed_count(path: Path) -> int:
+    with open(path, "rb") as f:
+        entries = load_count(path, f.seek(0, os.SEEK_END))
+        if entries is None:
+            meta, body_start, _ = read_head(f)
+            entries = archived_of(meta) + scan_entries(f, body_start)
+    return entries
+
+
+def commit(path: Path, lines: list[str], durability: str = "strict") -> int:
+    """Append entry lines at the end, in order, as one write at `durability`. Returns the
+    entry count.
+
+    Uncontended, this takes the lock and writes. Contended, it queues the lines and waits
+    for the lock; by then the holder has usually group-committed them already."""
+    with locked(path, blocking=False) as held:
+        if held:
+            return commit_locked(path, lines, durability)
+    mine = enqueue(path, lines, durability)
+    with locked(path):
+        if mine.exists() or mine.with_suffix(".committing").exists():
+            entries = commit_locked(path, [])
+            if entries is not None:
+                return entries
+        return committed_count(path)
+
+
+def write_entries(path: Path, lines: list[str], durability: str = "strict") -> int:
+    """The write itself (caller holds the lock): true append, or a full rewrite."""
+    entries = append_lines(path, lines, durability)
+    if entries is None:
+        meta, body = split(read_text(path))
+        added = "\n".join(lines)
+        body = (body.rstrip("\n") + "\n" + added) if body.strip() else added  # always at the end
+        entries = rewrite(path, meta, body, durability)
+    return entries
+
+
+def parse_batch(raw: str) -> list[str]:
+    """Entry lines from a JSON array or JSON Lines of {text, type, by} objects.
+    Raises ValueError naming the first bad item, so a batch is all-or-nothing."""
+    raw = raw.strip()
+    if raw.startswith("["):
+        items = json.loads(raw)
+    else:
+        items = [json.loads(ln) for ln in raw.splitlines() if ln.strip()]
+    return batch_lines(items)
+
+
+def batch_lines(items) -> list[str]:
+    """Entry lines from a list of {text, type, by} objects; ValueError on the first bad one."""
+    if not isinstance(items, list) or not items:
+        raise ValueError("no entries given")
+    lines = []
+    for n, item in enumerate(items, 1):
+        if not isinstance(item, dict):
+            raise ValueError(f"entry {n} is not an object")
+        text = item.get("text")
+        if not isinstance(text, str) or not text.strip():
+            raise ValueError(f"entry {n} has no text")
+        for field in ("type", "by"):
+            if item.get(field) is not None and not isinstance(item[field], str):
+                raise ValueError(f"entry {n}: {field} must be a string")
+        lines.append(format_entry(text, item.get("type"), item.get("by")))
+    return lines
+
+
 def cmd_append(args) -> int:
     path = resolve(args)
-    meta, body = split(path.read_text(encoding="utf-8"))
-    text = " ".join(args.text.split())  # collapse newlines/runs → one-line entry, no prose bloat
-    label = args.type or ""
-    if args.by:
-        label = f"{label} by {args.by}".strip()  # attribution: "(idea by user)" / "(by coach)"
-    tag = f"({label}) " if label else ""
-    entry = f"- {tag}{text}"
-    body = (body.rstrip("\n") + "\n" + entry) if body.strip() else entry  # always at the end
-    touch(meta)
-    write_atomic(path, render(meta, body))
-    ack(path, body)
+    entries = commit(path, [format_entry(args.text, args.type, args.by)], args.durability)
+    ack(path, entries, args.durability)
     return 0
 
 
+def cmd_append_many(args) -> int:
+    path = resolve(args)
+    try:
+        lines = parse_batch(sys.stdin.read())
+    except ValueError as e:  # json.JSONDecodeError is a ValueError
+        print(f"error: append-many: {e}", file=sys.stderr)
+        return 2
+    ack(path, commit(path, lines, args.durability), args.durability)
+    return 0
+
+
+def set_field(path: Path, key: str, value: str, durability: str) -> int:
+    with locked(path):
+        meta, body = split(read_text(path))
+        meta[key] = value
+        return rewrite(path, meta, body, durability)
+
+
 def cmd_set(args) -> int:
     path = resolve(args)
-    meta, body = split(path.read_text(encoding="utf-8"))
-    meta[args.key] = args.value
-    touch(meta)
-    write_atomic(path, render(meta, body))
-    ack(path, body)
+    ack(path, set_field(path, args.key, args.value, args.durability), args.durability)
+    return 0
+
+
+def serve_one(path: Path, request, durability: str) -> dict:
+    """Run one serve-mode command and return its ack. ValueError for a bad request."""
+    if not isinstance(request, dict):
+        raise ValueError("command must be a JSON object")
+    durability = request.get("durability") or durability
+    if durability not in DURABILITY_LEVELS:
+        raise ValueError(f"durability must be one of {', '.join(DURABILITY_LEVELS)}")
+    cmd = request.get("cmd")
+    if cmd == "append":
+        lines = batch_lines([{k: request.get(k) for k in ("text", "type", "by")}])
+    elif cmd == "append-many":
+        lines = batch_lines(request.get("entries"))
+    elif cmd == "set":
+        key, value = request.get("key"), request.get("value")
+        if not isinstance(key, str) or not key.strip() or not isinstance(value, str):
+            raise ValueError("set needs string key and value")
+        return ack_payload(path, set_field(path, key, value, durability), durability)
+    else:
+        raise ValueError(f"unknown cmd: {cmd!r} (expected append, append-many, or set)")
+    return ack_payload(path, commit(path, lines, durability), durability)
+
+
+def cmd_serve(args) -> int:
+    """One process, many commands: NDJSON in on stdin, one ack per line out on stdout."""
+    path = resolve(args)
+    if not path.is_file():
+        print(f"error: {path} does not exist; run init first", file=sys.stderr)
+        return 2
+    for raw in sys.stdin:
+        if not raw.strip():
+            continue
+        try:
+            reply = serve_one(path, json.loads(raw), args.durability)
+        except ValueError as e:  # json.JSONDecodeError is a ValueError
+            reply = {"ok": False, "error": str(e)}
+        except OSError as e:
+            reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        sys.stdout.write(json.dumps(reply) + "\n")
+        sys.stdout.flush()
+    return 0
+
+
+def cmd_verify(args) -> int:
+    """Recount from the body and repair the cache. Never touches the log itself."""
+    path = resolve(args)
+    with locked(path), open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        cached = load_count(path, size)
+        meta, body_start, _ = read_head(f)
+        entries = archived_of(meta) + scan_entries(f, body_start)
+        store_count(path, entries, size, last_synced(path))
+    print(json.dumps({
+        "ok": True,
+        "memlog": str(path),
+        "entries": entries,
+        "cached": cached,
+        "repaired": cached != entries,
+    }))
+    return 0
+
+
+def known_count(path: Path, f, meta: dict, body_start: int) -> int:
+    """Entry count for read-only commands: the cache when current, else a scan (not stored)."""
+    entries = load_count(path, f.seek(0, os.SEEK_END))
+    return archived_of(meta) + scan_entries(f, body_start) if entries is None else entries
+
+
+def cmd_head(args) -> int:
+    path = resolve(args)
+    with open(path, "rb") as f:
+        meta, body_start, _ = read_head(f)
+        entries = known_count(path, f, meta, body_start)
+    print(json.dumps({"ok": True, "memlog": str(path), "meta": meta, "entries": entries}))
+    return 0
+
+
+def cmd_tail(args) -> int:
+    path = resolve(args)
+    if args.n < 0:
+        print("error: --n must be zero or more", file=sys.stderr)
+        return 2
+    picked: list[str] = []
+    with open(path, "rb") as f:
+        meta, body_start, _ = read_head(f)
+        entries = known_count(path, f, meta, body_start)
+    for line in iter_history_reverse(path):
+        if len(picked) >= args.n:
+            break
+        parsed = parse_entry(line)
+        if parsed is None or (args.type is not None and parsed[0] != args.type):
+            continue
+        picked.append(line)
+    picked.reverse()
+    print(json.dumps({"ok": True, "memlog": str(path), "entries": entries, "tail": picked}))
+    return 0
+
+
+def iter_history_reverse(path: Path):
+    """Every line of the history, newest first: the live log, then each segment back to
+    the oldest. Lazy, so a caller that stops early never opens the older segments."""
+    for source in [path] + segments(path)[::-1]:
+        with open(source, "rb") as f:
+            _, body_start, _ = read_head(f)
+            for raw in iter_lines_reverse(f, body_start):
+                yield raw.decode("utf-8").rstrip("\r")
+
+
+def iter_history(path: Path):
+    """Every complete entry line of the history, oldest first: each segment in order, then
+    the live log. Streams line by line; never holds a body in memory."""
+    for source in segments(path) + [path]:
+        with open(source, "rb") as f:
+            _, body_start, _ = read_head(f)
+            f.seek(body_start)
+            for raw in f:
+                if raw.startswith(b"- ") and raw.endswith(b"\n"):
+                    yield raw.decode("utf-8").rstrip("\r\n")
+
+
+def cmd_query(args) -> int:
+    """Indexed lookup over the live log: entry N by position, or every entry matching
+    --type/--by. Entry numbers count archived entries too."""
+    path = resolve(args)
+    if args.entry is None and args.type is None and args.by is None:
+        print("error: query needs --entry, --type, or --by", file=sys.stderr)
+        return 2
+    # Under the lock, so no append moves the log or the index between the size we
+    # check against and the files we read. Both are appended in place or replaced by
+    # rename, so the open handles stay valid for the first `size` bytes once it is
+    # released.
+    with locked(path):
+        size = path.stat().st_size
+        try:
+            with open(sidecar(path, ".idx"), "rb") as idx:
+                fresh = index_length(idx, size) is not None
+        except OSError:
+            fresh = False
+        if not fresh:
+            rebuild_index(path)
+        idx = open(sidecar(path, ".idx"), "rb")
+        log = open(path, "rb")
+        live = index_length(idx, size)
+
+    matches = []
+    with idx, log:
+        if live is None:
+            print(f"error: cannot index {path}", file=sys.stderr)
+            return 1
+        archived = archived_of(read_head(log)[0])
+        total = archived + live
+        if args.entry is not None:
+            position = args.entry - archived - 1
+            if not 0 <= position < live:
+                hits = []
+            else:
+                idx.seek(INDEX_HEADER.size + position * INDEX_RECORD.size)
+                hits = [(position, INDEX_RECORD.unpack(idx.read(INDEX_RECORD.size)))]
+        else:
+            idx.seek(INDEX_HEADER.size)
+            hits = enumerate(INDEX_RECORD.iter_unpack(idx.read(live * INDEX_RECORD.size)))
+        want_type, want_by = tag_hash(args.type), tag_hash(args.by)
+        for n, (offset, type_hash, by_hash) in hits:
+            if args.type is not None and type_hash != want_type:
+                continue
+            if args.by is not None and by_hash != want_by:
+                continue
+            log.seek(offset)
+            line = log.readline().decode("utf-8").rstrip("\r\n")
+            parsed = parse_entry(line)  # the log is the source of truth; re-check the hit
+            if parsed is None:
+                continue
+            if args.type is not None and parsed[0] != args.type:
+                continue
+            if args.by is not None and parsed[1] != args.by:
+                continue
+            matches.append({"n": archived + n + 1, "entry": line})
+    print(json.dumps({"ok": True, "memlog": str(path), "entries": total, "matches": matches}))
+    return 0
+
+
+def write_readonly(target: Path, text: str, sync: bool) -> None:
+    """Atomic write of an archive segment or the digest, left read-only."""
+    if target.exists():
+        os.chmod(target, 0o644)  # Windows refuses to replace a read-only file
+    write_atomic(target, text, sync=sync)
+    os.chmod(target, 0o444)
+
+
+def render_digest(path: Path, meta: dict, archived: int, segment_count: int) -> str:
+    """The derived snapshot: totals, per-type and per-author counts, and the latest entry of
+    each type, from one streaming pass over the whole history."""
+    total = 0
+    by_type: dict[str, int] = {}
+    by_author: dict[str, int] = {}
+    latest: dict[str, str] = {}
+    for line in iter_history(path):
+        entry_type, by, _ = parse_entry(line)
+        total += 1
+        kind = entry_type or "untyped"
+        by_type[kind] = by_type.get(kind, 0) + 1
+        if by:
+            by_author[by] = by_author.get(by, 0) + 1
+        latest[kind] = line
+    out = [
+        "# Memlog snapshot",
+        "",
+        f"Derived from `{path.name}` at {now()} by `memlog.py snapshot`. Read-only; do not edit.",
+        "",
+        f"- entries: {total} ({archived} archived in {segment_count} segments, {total - archived} live)",
+    ]
+    out += [f"- {k}: {' '.join(str(v).splitlines())}" for k, v in meta.items() if k != "archived"]
+    out += ["", "## Entries by type", ""]
+    out += [f"- {kind}: {n}" for kind, n in sorted(by_type.items())] or ["_None._"]
+    out += ["", "## Entries by author", ""]
+    out += [f"- {who}: {n}" for who, n in sorted(by_author.items())] or ["_None._"]
+    out += ["", "## Latest entry of each type", ""]
+    out += [latest[kind] for kind in sorted(latest)] or ["_None._"]
+    return "\n".join(out) + "\n"
+
+
+def cmd_snapshot(args) -> int:
+    """Roll old entries into the next archive segment and rewrite the digest."""
+    path = resolve(args)
+    if args.keep < 0:
+        print("error: --keep must be zero or more", file=sys.stderr)
+        return 2
+    sync = args.durability != "none"
+    with locked(path):
+        meta, body = split(read_text(path))
+        archived = archived_of(meta)
+        existing = segments(path)  # an orphaned segment is left out, so rewritten below
+        lines = body.splitlines()
+        entry_at = [i for i, ln in enumerate(lines) if ln.startswith("- ")]
+        roll = max(0, len(entry_at) - args.keep)
+        if roll:
+            cut = entry_at[roll - 1] + 1
+            seg_meta = {
+                "source": path.name,
+                "segment": str(len(existing) + 1),
+                "first": str(archived + 1),
+                "last": str(archived + roll),
+                "written": now(),
+            }
+            seg = segment_path(path, len(existing) + 1)
+            write_readonly(seg, render(seg_meta, "\n".join(lines[:cut])), sync)
+            existing.append(seg)
+            archived += roll
+            meta["archived"] = str(archived)
+            entries = rewrite(path, meta, "\n".join(lines[cut:]), args.durability)
+        else:
+            entries = archived + len(entry_at)
+        digest = sidecar(path, ".snapshot.md")
+        write_readonly(digest, render_digest(path, meta, archived, len(existing)), sync)
+    print(json.dumps({
+        "ok": True,
+        "memlog": str(path),
+        "entries": entries,
+        "archived": archived,
+        "segments": len(existing),
+        "snapshot": str(digest),
+        "durability": args.durability,
+    }))
+    return 0
+
+
+EXPORT_COLUMNS = ("memlog", "n", "type", "by", "text")
+
+
+def export_rows(path: Path):
+    """One dict per entry across the whole history, numbered from 1, tags parsed.
+    Keyed on the resolved path, so one log reached by different spellings (relative,
+    symlinked) upserts the same rows."""
+    memlog = str(path.resolve())
+    for n, line in enumerate(iter_history(path), 1):
+        entry_type, by, text = parse_entry(line)
+        yield {"memlog": memlog, "n": n, "type": entry_type, "by": by, "text": text}
+
+
+def export_sqlite(rows, out: Path) -> None:
+    import sqlite3  # optional in some Python builds; only this format needs it
+
+    # The connection's own context manager only commits; closing() releases the file.
+    with closing(sqlite3.connect(str(out))) as db, db:
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "memlog TEXT NOT NULL, n INTEGER NOT NULL, type TEXT, by TEXT, text TEXT NOT NULL, "
+            "PRIMARY KEY (memlog, n))"
+        )
+        db.executemany(
+            "INSERT OR REPLACE INTO entries (memlog, n, type, by, text) VALUES (?, ?, ?, ?, ?)",
+            (tuple(row[c] for c in EXPORT_COLUMNS) for row in rows),
+        )
+
+
+def cmd_export(args) -> int:
+    path = resolve(args)
+    if args.format == "sqlite" and not args.out:
+        print("error: --format sqlite needs --out FILE", file=sys.stderr)
+        return 2
+    exported = 0
+
+    def counted():
+        nonlocal exported
+        for row in export_rows(path):
+            exported += 1
+            yield row
+
+    if args.format == "sqlite":
+        export_sqlite(counted(), Path(args.out))
+    else:
+        out = open(args.out, "w", encoding="utf-8", newline="") if args.out else sys.stdout
+        try:
+            if args.format == "jsonl":
+                for row in counted():
+                    out.write(json.dumps(row, ensure_ascii=False) + "\n")
+            else:
+                writer = csv.DictWriter(out, fieldnames=EXPORT_COLUMNS)
+                writer.writeheader()
+                writer.writerows(counted())
+        finally:
+            if args.out:
+                out.close()
+    if args.out:  # stdout carried the data itself otherwise
+        print(json.dumps({
+            "ok": True, "memlog": str(path), "exported": exported,
+            "format": args.format, "out": args.out,
+        }))
     return 0
 
 
@@ -194,29 +1197,88 @@ def add_target(sp) -> None:
     g.add_argument("--path", help="explicit memlog file path (alternative to --workspace)")
 
 
+def add_durability(sp) -> None:
+    sp.add_argument(
+        "--durability", choices=DURABILITY_LEVELS, default=None,
+        help=f"fsync policy (default: ${DURABILITY_ENV} or strict)",
+    )
+
+
 def main(argv: list[str] | None = None) -> int:
     p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
     sub = p.add_subparsers(dest="cmd", required=True)
 
     pi = sub.add_parser("init", help="create the memlog")
     add_target(pi)
+    add_durability(pi)
     pi.add_argument("--field", action="append", metavar="KEY=VALUE", help="frontmatter field (repeatable)")
     pi.set_defaults(func=cmd_init)
 
     pa = sub.add_parser("append", help="append one entry at the end")
     add_target(pa)
+    add_durability(pa)
     pa.add_argument("--text", required=True)
     pa.add_argument("--type", help="entry kind, rendered as an inline tag")
     pa.add_argument("--by", help="who the entry came from (e.g. user, coach); rendered into the tag")
     pa.set_defaults(func=cmd_append)
 
+    pm = sub.add_parser("append-many", help="append a batch of entries from stdin (JSON array or JSONL)")
+    add_target(pm)
+    add_durability(pm)
+    pm.set_defaults(func=cmd_append_many)
+
     pset = sub.add_parser("set", help="set a descriptive frontmatter field")
     add_target(pset)
+    add_durability(pset)
     pset.add_argument("--key", required=True)
     pset.add_argument("--value", required=True)
     pset.set_defaults(func=cmd_set)
 
+    pv = sub.add_parser("verify", help="recount entries from the body and repair the cached count")
+    add_target(pv)
+    pv.set_defaults(func=cmd_verify)
+
+    ph = sub.add_parser("head", help="print the frontmatter and entry count (read-only)")
+    add_target(ph)
+    ph.set_defaults(func=cmd_head)
+
+    pt = sub.add_parser("tail", help="print the last N entries (read-only)")
+    add_target(pt)
+    pt.add_argument("--n", type=int, default=10, help="how many entries (default 10)")
+    pt.add_argument("--type", help="only entries of this kind")
+    pt.set_defaults(func=cmd_tail)
+
+    pq = sub.add_parser("query", help="indexed lookup by entry number, type, or attribution (never writes the log)")
+    add_target(pq)
+    pq.add_argument("--entry", type=int, help="the Nth entry (1-based)")
+    pq.add_argument("--type", help="entries of this kind")
+    pq.add_argument("--by", help="entries attributed to this author")
+    pq.set_defaults(func=cmd_query)
+
+    ps = sub.add_parser("snapshot", help="roll old entries into an archive segment and write a digest")
+    add_target(ps)
+    add_durability(ps)
+    ps.add_argument("--keep", type=int, default=50, help="newest entries kept live (default 50)")
+    ps.set_defaults(func=cmd_snapshot)
+
+    pe = sub.add_parser("export", help="stream every entry as JSONL, CSV, or into SQLite (read-only)")
+    add_target(pe)
+    pe.add_argument("--format", choices=("jsonl", "csv", "sqlite"), required=True)
+    pe.add_argument("--out", help="output file (required for sqlite; default stdout)")
+    pe.set_defaults(func=cmd_export)
+
+    pserve = sub.add_parser("serve", help="answer NDJSON append/set commands from stdin until EOF")
+    add_target(pserve)
+    add_durability(pserve)
+    pserve.set_defaults(func=cmd_serve)
+
     args = p.parse_args(argv)
+    if "durability" in args and args.durability is None:
+        args.durability = default_durability()
+        if args.durability not in DURABILITY_LEVELS:
+            print(f"error: {DURABILITY_ENV} must be one of {', '.join(DURABILITY_LEVELS)}, "
+                  f"got {args.durability!r}", file=sys.stderr)
+            return 2
     return args.func(args)
 
 
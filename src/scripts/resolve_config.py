@@ -10,6 +10,10 @@ Reads from four layers (highest priority last):
 
 Outputs merged JSON to stdout. Errors go to stderr.
 
+Importable: `resolve(project_root, keys)` returns the same dict in-process
+(raising ResolveError where the CLI would exit 1), so sibling scripts can skip
+the interpreter start-up of a subprocess.
+
 Uses only the Python stdlib (`tomllib`) — no third-party dependencies.
 BMad is standardizing on `uv run` to invoke scripts (uv provisions a suitable
 interpreter for you); a plain `python3` on PATH still works during the
@@ -18,16 +22,33 @@ transition. Either runner needs Python 3.11+ for `tomllib`.
   uv run resolve_config.py --project-root /abs/path/to/project
   uv run resolve_config.py --project-root ... --key core
   uv run resolve_config.py --project-root ... --key agents
+  uv run resolve_config.py --project-root ... --no-cache
+  uv run resolve_config.py --project-root ... --cache-stats
 
-Merge rules (same as resolve_customization.py):
+Merge rules (shared with resolve_customization.py via structural_merge.py):
   - Scalars: override wins
   - Tables: deep merge
   - Arrays of tables where every item shares `code` or `id`: merge by that key
   - All other arrays: append
+  - Base subtrees an override does not touch are shared, not copied
+    (--merge-stats reports copied vs shared counts)
+
+Cache: the merged result is stored in {project-root}/_bmad/.cache/, keyed by
+the (path, mtime_ns, size, inode) of every layer. A warm call only stats the
+four layers and deserializes the cached JSON; any layer change (or a layer
+appearing or disappearing) is a miss and re-merges from TOML. A run where an
+optional layer failed to parse is never cached, so its warning repeats until
+the file is fixed. --no-cache bypasses the cache for one call. Every cached
+call, CLI or in-process resolve(), appends its hit or miss as one short line
+to a tally in {project-root}/_bmad/.cache/ (a single O_APPEND write: no read,
+no rename, no lost counts between concurrent resolvers); --cache-stats
+reports this call's outcome and the running hit/miss counts as one JSON line
+on stderr.
 """
 
 import argparse
 import json
+import os
 import sys
 from pathlib import Path
 
@@ -39,16 +60,30 @@ except ImportError:
     )
     sys.exit(3)
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from structural_merge import deep_merge  # noqa: E402  (re-exported for importers)
+
 
 _MISSING = object()
-_KEYED_MERGE_FIELDS = ("code", "id")
+
+CACHE_DIR = ".cache"
+CACHE_FILE = "resolve_config.json"
+CACHE_STATS_FILE = "resolve_config.stats"
+CACHE_VERSION = 1
 
 
-def load_toml(file_path: Path, required: bool = False) -> dict:
+class ResolveError(Exception):
+    """The required base config.toml is missing or unreadable.
+
+    The CLI reports it as `error: ...` on stderr and exits 1; importers of
+    `resolve()` catch it instead of losing their process to sys.exit.
+    """
+
+
+def load_toml(file_path: Path, required: bool = False, problems: list | None = None) -> dict:
     if not file_path.exists():
         if required:
-            sys.stderr.write(f"error: required config file not found: {file_path}\n")
-            sys.exit(1)
+            raise ResolveError(f"required config file not found: {file_path}")
         return {}
     try:
         with file_path.open("rb") as f:
@@ -57,74 +92,21 @@ def load_toml(file_path: Path, required: bool = False) -> dict:
             return {}
         return parsed
     except tomllib.TOMLDecodeError as error:
-        level = "error" if required else "warning"
-        sys.stderr.write(f"{level}: failed to parse {file_path}: {error}\n")
         if required:
-            sys.exit(1)
+            raise ResolveError(f"failed to parse {file_path}: {error}") from error
+        sys.stderr.write(f"warning: failed to parse {file_path}: {error}\n")
+        if problems is not None:
+            problems.append(str(file_path))
         return {}
     except OSError as error:
-        level = "error" if required else "warning"
-        sys.stderr.write(f"{level}: failed to read {file_path}: {error}\n")
         if required:
-            sys.exit(1)
+            raise ResolveError(f"failed to read {file_path}: {error}") from error
+        sys.stderr.write(f"warning: failed to read {file_path}: {error}\n")
+        if problems is not None:
+            problems.append(str(file_path))
         return {}
 
 
-def _detect_keyed_merge_field(items):
-    if not items or not all(isinstance(item, dict) for item in items):
-        return None
-    for candidate in _KEYED_MERGE_FIELDS:
-        if all(item.get(candidate) is not None for item in items):
-            return candidate
-    return None
-
-
-def _merge_by_key(base, override, key_name):
-    result = []
-    index_by_key = {}
-    for item in base:
-        if not isinstance(item, dict):
-            continue
-        if item.get(key_name) is not None:
-            index_by_key[item[key_name]] = len(result)
-        result.append(dict(item))
-    for item in override:
-        if not isinstance(item, dict):
-            result.append(item)
-            continue
-        key = item.get(key_name)
-        if key is not None and key in index_by_key:
-            result[index_by_key[key]] = dict(item)
-        else:
-            if key is not None:
-                index_by_key[key] = len(result)
-            result.append(dict(item))
-    return result
-
-
-def _merge_arrays(base, override):
-    base_arr = base if isinstance(base, list) else []
-    override_arr = override if isinstance(override, list) else []
-    keyed_field = _detect_keyed_merge_field(base_arr + override_arr)
-    if keyed_field:
-        return _merge_by_key(base_arr, override_arr, keyed_field)
-    return base_arr + override_arr
-
-
-def deep_merge(base, override):
-    if isinstance(base, dict) and isinstance(override, dict):
-        result = dict(base)
-        for key, over_val in override.items():
-            if key in result:
-                result[key] = deep_merge(result[key], over_val)
-            else:
-                result[key] = over_val
-        return result
-    if isinstance(base, list) and isinstance(override, list):
-        return _merge_arrays(base, override)
-    return override
-
-
 def extract_key(data, dotted_key: str):
     parts = dotted_key.split(".")
     current = data
@@ -136,6 +118,185 @@ def extract_key(data, dotted_key: str):
     return current
 
 
+def select_keys(merged, keys):
+    """Project dotted keys out of a merge; absent keys are omitted. No keys → full dump."""
+    if not keys:
+        return merged
+    output = {}
+    for key in keys:
+        value = extract_key(merged, key)
+        if value is not _MISSING:
+            output[key] = value
+    return output
+
+
+def layer_paths(bmad_dir: Path) -> list:
+    """The four config layers, lowest priority first."""
+    return [
+        bmad_dir / "config.toml",
+        bmad_dir / "config.user.toml",
+        bmad_dir / "custom" / "config.toml",
+        bmad_dir / "custom" / "config.user.toml",
+    ]
+
+
+def merge_layers(paths, problems: list | None = None, stats: dict | None = None, load=load_toml) -> dict:
+    """Parse every layer and fold them together, highest priority last. `load`
+    stands in for load_toml (resolver_server.py passes its parsed-layer cache)."""
+    merged = load(paths[0], required=True)
+    for path in paths[1:]:
+        merged = deep_merge(merged, load(path, problems=problems), stats)
+    return merged
+
+
+def layer_fingerprint(paths):
+    """[path, mtime_ns, size, inode] per layer; a missing layer stats as Nones.
+
+    Returns None when a layer exists but cannot be stat'd, which disables the
+    cache for that call rather than risking a stale hit.
+    """
+    key = []
+    for path in paths:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            key.append([str(path), None, None, None])
+            continue
+        except OSError:
+            return None
+        key.append([str(path), st.st_mtime_ns, st.st_size, st.st_ino])
+    return key
+
+
+def _read_json(path: Path):
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def ensure_cache_dir(cache_dir: Path) -> None:
+    """Create _bmad/.cache/ with a catch-all .gitignore so nothing in it is committed."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    ignore = cache_dir / ".gitignore"
+    if not ignore.exists():
+        ignore.write_text("*\n", encoding="utf-8")
+
+
+def _write_json(path: Path, data) -> None:
+    """Best-effort atomic write: a per-process temp file renamed into place, so
+    concurrent resolvers never read a torn cache. Failures (read-only tree,
+    full disk) are swallowed — the cache is an optimization, never a gate."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        ensure_cache_dir(path.parent)
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError):
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def load_cached(cache_path: Path, fingerprint):
+    """The cached merge for this fingerprint, or None on a miss."""
+    if fingerprint is None:
+        return None
+    cached = _read_json(cache_path)
+    if (
+        not isinstance(cached, dict)
+        or cached.get("version") != CACHE_VERSION
+        or cached.get("layers") != fingerprint
+        or not isinstance(cached.get("merged"), dict)
+    ):
+        return None
+    return cached["merged"]
+
+
+def store_cache(cache_path: Path, fingerprint, merged: dict) -> None:
+    if fingerprint is None:
+        return
+    _write_json(cache_path, {"version": CACHE_VERSION, "layers": fingerprint, "merged": merged})
+
+
+def count_outcome(stats_path: Path, outcome: str) -> None:
+    """Append one call's outcome to the tally: "h" or "m" plus a newline, in a
+    single O_APPEND write, so concurrent resolvers never lose a count and a warm
+    hit pays one small write. Best-effort, like the cache itself."""
+    flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+    try:
+        try:
+            fd = os.open(stats_path, flags, 0o644)
+        except FileNotFoundError:
+            ensure_cache_dir(stats_path.parent)
+            fd = os.open(stats_path, flags, 0o644)
+    except OSError:
+        return
+    try:
+        os.write(fd, b"h\n" if outcome == "hit" else b"m\n")
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def read_cache_stats(stats_path: Path, outcome: str) -> dict:
+    """The tally's hit/miss counts, with this call's outcome."""
+    try:
+        tally = stats_path.read_bytes()
+    except OSError:
+        tally = b""
+    hits = tally.count(b"h")
+    misses = tally.count(b"m")
+    total = hits + misses
+    return {
+        "cache": outcome,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total, 4) if total else 0.0,
+    }
+
+
+def resolve_merged(bmad_dir: Path, use_cache: bool = True, stats: dict | None = None):
+    """Merged config plus the cache outcome: "hit", "miss" or "disabled".
+    `stats` counts the merge's copied/shared containers (untouched on a hit)."""
+    paths = layer_paths(bmad_dir)
+    if not use_cache:
+        return merge_layers(paths, stats=stats), "disabled"
+
+    cache_path = bmad_dir / CACHE_DIR / CACHE_FILE
+    fingerprint = layer_fingerprint(paths)
+    stats_path = bmad_dir / CACHE_DIR / CACHE_STATS_FILE
+    merged = load_cached(cache_path, fingerprint)
+    if merged is not None:
+        count_outcome(stats_path, "hit")
+        return merged, "hit"
+
+    problems = []
+    merged = merge_layers(paths, problems, stats)
+    # Re-stat after parsing: a layer rewritten mid-merge must not be cached
+    # under the fingerprint of its previous contents.
+    if not problems and layer_fingerprint(paths) == fingerprint:
+        store_cache(cache_path, fingerprint, merged)
+    count_outcome(stats_path, "miss")
+    return merged, "miss"
+
+
+def resolve(project_root, keys=None, use_cache: bool = True) -> dict:
+    """Importable entry point: the same dict the CLI prints, without a subprocess.
+
+    `keys` is an iterable of dotted paths (None or empty for the full merge).
+    Shares the on-disk cache and its hit/miss tally with the CLI.
+    Raises ResolveError when the base config.toml is missing or unreadable.
+    """
+    bmad_dir = Path(project_root).resolve() / "_bmad"
+    merged, _ = resolve_merged(bmad_dir, use_cache=use_cache)
+    return select_keys(merged, list(keys or []))
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Resolve BMad central config using four-layer TOML merge.",
@@ -148,28 +309,41 @@ def main():
         "--key", "-k", action="append", default=[],
         help="Dotted field path to resolve (repeatable). Omit for full dump.",
     )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Re-parse every layer; neither read nor write _bmad/.cache/.",
+    )
+    parser.add_argument(
+        "--cache-stats", action="store_true",
+        help="Report this call's cache outcome and the running hit/miss counts as JSON on stderr.",
+    )
+    parser.add_argument(
+        "--merge-stats", action="store_true",
+        help="Report containers copied vs subtrees shared by the merge as JSON on stderr.",
+    )
     args = parser.parse_args()
 
     project_root = Path(args.project_root).resolve()
     bmad_dir = project_root / "_bmad"
+    stats = {"copied": 0, "shared": 0} if args.merge_stats else None
+
+    try:
+        merged, outcome = resolve_merged(bmad_dir, use_cache=not args.no_cache, stats=stats)
+    except ResolveError as error:
+        sys.stderr.write(f"error: {error}\n")
+        sys.exit(1)
+
+    if args.cache_stats:
+        if outcome == "disabled":
+            report = {"cache": outcome}
+        else:
+            report = read_cache_stats(bmad_dir / CACHE_DIR / CACHE_STATS_FILE, outcome)
+        sys.stderr.write(json.dumps(report) + "\n")
+    if stats is not None:
+        # A cache hit runs no merge; pair with --no-cache to measure every call.
+        sys.stderr.write(json.dumps({"merge": stats if outcome != "hit" else "cached"}) + "\n")
 
-    base_team = load_toml(bmad_dir / "config.toml", required=True)
-    base_user = load_toml(bmad_dir / "config.user.toml")
-    custom_team = load_toml(bmad_dir / "custom" / "config.toml")
-    custom_user = load_toml(bmad_dir / "custom" / "config.user.toml")
-
-    merged = deep_merge(base_team, base_user)
-    merged = deep_merge(merged, custom_team)
-    merged = deep_merge(merged, custom_user)
-
-    if args.key:
-        output = {}
-        for key in args.key:
-            value = extract_key(merged, key)
-            if value is not _MISSING:
-                output[key] = value
-    else:
-        output = merged
+    output = select_keys(merged, args.key)
 
     sys.stdout.write(json.dumps(output, indent=2, ensure_ascii=False) + "\n")
 
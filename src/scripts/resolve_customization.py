@@ -9,8 +9,16 @@ Reads customization from three layers (highest priority first):
 
 Skill name is derived from the basename of the skill directory.
 
+Project root: the nearest ancestor of the skill directory holding `_bmad/`
+or `.git`. Walks are memoized per process, and a valid BMAD_PROJECT_ROOT
+environment variable skips the walk entirely.
+
 Outputs merged JSON to stdout. Errors go to stderr.
 
+Importable: `resolve_skill(skill_dir, keys)` returns the same dict in-process
+(raising ResolveError where the CLI would exit 1), so sibling scripts can skip
+the interpreter start-up of a subprocess.
+
 Uses only the Python stdlib (`tomllib`) — no third-party dependencies.
 BMad is standardizing on `uv run` to invoke scripts (uv provisions a suitable
 interpreter for you); a plain `python3` on PATH still works during the
@@ -19,8 +27,17 @@ transition. Either runner needs Python 3.11+ for `tomllib`.
   uv run resolve_customization.py --skill /abs/path/to/skill-dir
   uv run resolve_customization.py --skill ... --key agent
   uv run resolve_customization.py --skill ... --key agent.menu
+  uv run resolve_customization.py --skills DIR [DIR ...] --key workflow
+  find ... | uv run resolve_customization.py --skills-from-stdin
+
+Batch mode (--skills / --skills-from-stdin) resolves many skills in one
+process and emits one JSON object keyed by skill name. Sibling skills share
+one project-root discovery and _bmad/custom/ is listed once per project. A
+skill that fails is reported on stderr and omitted; the rest are still
+printed, and the exit code is 1.
 
-Merge rules (purely structural — no field-name special-casing):
+Merge rules (purely structural — no field-name special-casing; implemented
+once in structural_merge.py and shared with resolve_config.py and render.py):
   - Scalars (string, int, bool, float): override wins
   - Tables: deep merge (recursively apply these rules)
   - Arrays of tables where every item shares the *same* identifier
@@ -30,6 +47,10 @@ Merge rules (purely structural — no field-name special-casing):
     `code` or `id`, or where items mix the two keys:
     append (base items followed by override items)
 
+The merge shares structure: base subtrees an override does not touch are
+reused by reference rather than copied. --merge-stats reports how many
+containers were copied versus shared.
+
 No removal mechanism — overrides cannot delete base items. To suppress
 a default, fork the skill or override the item by code with a no-op
 description/prompt.
@@ -37,6 +58,7 @@ description/prompt.
 
 import argparse
 import json
+import os
 import sys
 from pathlib import Path
 
@@ -50,133 +72,194 @@ except ImportError:
     )
     sys.exit(3)
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from structural_merge import deep_merge  # noqa: E402  (re-exported for importers)
+
 
 _MISSING = object()
-_KEYED_MERGE_FIELDS = ("code", "id")
 
 
-def find_project_root(start: Path):
+PROJECT_ROOT_ENV = "BMAD_PROJECT_ROOT"
+
+# Process-wide memo: every directory a walk visited → the root it resolved to
+# (or None). A later lookup from any of them — or from a path nested below
+# one — stops at the first memoized directory instead of re-statting ancestors.
+_ROOT_MEMO: dict = {}
+
+
+def _has_project_marker(directory: Path) -> bool:
+    return (directory / "_bmad").exists() or (directory / ".git").exists()
+
+
+def _project_root_hint():
+    """BMAD_PROJECT_ROOT, when it names a directory holding _bmad/ or .git."""
+    hint = os.environ.get(PROJECT_ROOT_ENV)
+    if not hint:
+        return None
+    root = Path(hint).resolve()
+    return root if _has_project_marker(root) else None
+
+
+def find_project_root(start: Path, memo: bool = True):
+    """The nearest ancestor of `start` holding _bmad/ or .git (BMAD_PROJECT_ROOT
+    wins when set). memo=False walks without reading or filling _ROOT_MEMO, for
+    a long-lived caller (resolver_server.py) that must see markers created or
+    removed after an earlier lookup."""
+    hint = _project_root_hint()
+    if hint is not None:
+        return hint
     current = start.resolve()
+    visited = []
     while True:
-        if (current / "_bmad").exists() or (current / ".git").exists():
-            return current
+        if memo and current in _ROOT_MEMO:
+            root = _ROOT_MEMO[current]
+            break
+        visited.append(current)
+        if _has_project_marker(current):
+            root = current
+            break
         parent = current.parent
         if parent == current:
-            return None
+            root = None
+            break
         current = parent
+    if memo:
+        for directory in visited:
+            _ROOT_MEMO[directory] = root
+    return root
+
+
+class ResolveError(Exception):
+    """The skill's customize.toml is missing, unreadable or not a table.
+
+    The CLI reports it as `error: ...` on stderr and exits 1; importers of
+    `resolve_skill()` catch it instead of losing their process to sys.exit.
+    """
 
 
 def load_toml(file_path: Path, required: bool = False) -> dict:
     if not file_path.exists():
         if required:
-            sys.stderr.write(f"error: required customization file not found: {file_path}\n")
-            sys.exit(1)
+            raise ResolveError(f"required customization file not found: {file_path}")
         return {}
     try:
         with file_path.open("rb") as f:
             parsed = tomllib.load(f)
         if not isinstance(parsed, dict):
             if required:
-                sys.stderr.write(f"error: {file_path} did not parse to a table\n")
-                sys.exit(1)
+                raise ResolveError(f"{file_path} did not parse to a table")
             return {}
         return parsed
     except tomllib.TOMLDecodeError as error:
-        level = "error" if required else "warning"
-        sys.stderr.write(f"{level}: failed to parse {file_path}: {error}\n")
         if required:
-            sys.exit(1)
+            raise ResolveError(f"failed to parse {file_path}: {error}") from error
+        sys.stderr.write(f"warning: failed to parse {file_path}: {error}\n")
         return {}
     except OSError as error:
-        level = "error" if required else "warning"
-        sys.stderr.write(f"{level}: failed to read {file_path}: {error}\n")
         if required:
-            sys.exit(1)
+            raise ResolveError(f"failed to read {file_path}: {error}") from error
+        sys.stderr.write(f"warning: failed to read {file_path}: {error}\n")
         return {}
 
 
-def _detect_keyed_merge_field(items):
-    """Return 'code' or 'id' if every table item carries that *same* field.
-
-    All items must share the same identifier (all `code`, or all `id`).
-    Mixed arrays — where some items use `code` and others use `id` —
-    return None and fall through to append semantics. This is intentional:
-    mixing identifier keys within one array is a schema smell, and
-    append-fallback is safer than guessing which key should merge.
-    """
-    if not items or not all(isinstance(item, dict) for item in items):
-        return None
-    for candidate in _KEYED_MERGE_FIELDS:
-        if all(item.get(candidate) is not None for item in items):
-            return candidate
-    return None
+def extract_key(data, dotted_key: str):
+    parts = dotted_key.split(".")
+    current = data
+    for part in parts:
+        if isinstance(current, dict) and part in current:
+            current = current[part]
+        else:
+            return _MISSING
+    return current
 
 
-def _merge_by_key(base, override, key_name):
-    result = []
-    index_by_key = {}
+def select_keys(merged, keys):
+    """Project dotted keys out of a merge; absent keys are omitted. No keys → full dump."""
+    if not keys:
+        return merged
+    output = {}
+    for key in keys:
+        value = extract_key(merged, key)
+        if value is not _MISSING:
+            output[key] = value
+    return output
 
-    for item in base:
-        if not isinstance(item, dict):
-            continue
-        if item.get(key_name) is not None:
-            index_by_key[item[key_name]] = len(result)
-        result.append(dict(item))
 
-    for item in override:
-        if not isinstance(item, dict):
-            result.append(item)
-            continue
-        key = item.get(key_name)
-        if key is not None and key in index_by_key:
-            result[index_by_key[key]] = dict(item)
-        else:
-            if key is not None:
-                index_by_key[key] = len(result)
-            result.append(dict(item))
+def _custom_listing(project_root: Path) -> frozenset:
+    """File names in _bmad/custom/, read once so batch mode never probes absent overrides."""
+    try:
+        return frozenset(os.listdir(project_root / "_bmad" / "custom"))
+    except OSError:
+        return frozenset()
 
-    return result
 
+def _merge_skill(skill_dir: Path, project_root, listing=None, stats=None, load=load_toml) -> dict:
+    """Defaults → team → user for one skill. `listing` (a _custom_listing) lets
+    the caller skip override files already known to be absent; `load` stands in
+    for load_toml (resolver_server.py passes its parsed-layer cache)."""
+    merged = load(skill_dir / "customize.toml", required=True)
+    if project_root:
+        custom_dir = project_root / "_bmad" / "custom"
+        for name in (f"{skill_dir.name}.toml", f"{skill_dir.name}.user.toml"):
+            if listing is None or name in listing:
+                merged = deep_merge(merged, load(custom_dir / name), stats)
+    return merged
 
-def _merge_arrays(base, override):
-    """Shape-aware array merge. Base + override combined tables may opt into
-    keyed merge if every item has `code` or `id`. Otherwise: append."""
-    base_arr = base if isinstance(base, list) else []
-    override_arr = override if isinstance(override, list) else []
-    keyed_field = _detect_keyed_merge_field(base_arr + override_arr)
-    if keyed_field:
-        return _merge_by_key(base_arr, override_arr, keyed_field)
-    return base_arr + override_arr
 
+def resolve_skill(skill_dir, keys=None, cwd=None, stats=None) -> dict:
+    """Importable entry point: the same dict the CLI prints, without a subprocess.
 
-def deep_merge(base, override):
-    """Recursively merge override into base using structural rules.
-    - Table + table: deep merge
-    - Array + array: shape-aware (keyed merge if all items have code/id, else append)
-    - Anything else: override wins
+    `keys` is an iterable of dotted paths (None or empty for the full merge);
+    `cwd` stands in for the working directory when the skill sits outside any
+    project tree (defaults to the process cwd, like the CLI); `stats` is
+    passed through to deep_merge. Raises ResolveError when the skill's
+    customize.toml is missing or unreadable.
     """
-    if isinstance(base, dict) and isinstance(override, dict):
-        result = dict(base)
-        for key, over_val in override.items():
-            if key in result:
-                result[key] = deep_merge(result[key], over_val)
-            else:
-                result[key] = over_val
-        return result
-    if isinstance(base, list) and isinstance(override, list):
-        return _merge_arrays(base, override)
-    return override
+    skill_dir = Path(skill_dir).resolve()
 
+    # Prefer the project that contains this skill. Only fall back to cwd if
+    # the skill isn't inside a recognizable project tree (unusual but possible
+    # for standalone skills invoked directly). Using cwd first is unsafe when
+    # an ancestor of cwd happens to have a stray _bmad/ from another project.
+    project_root = find_project_root(skill_dir) or find_project_root(
+        Path(cwd) if cwd else Path.cwd()
+    )
+    return select_keys(_merge_skill(skill_dir, project_root, stats=stats), list(keys or []))
 
-def extract_key(data, dotted_key: str):
-    parts = dotted_key.split(".")
-    current = data
-    for part in parts:
-        if isinstance(current, dict) and part in current:
-            current = current[part]
-        else:
-            return _MISSING
-    return current
+
+def resolve_skills(skill_dirs, keys=None, cwd=None, stats=None):
+    """Batch form of resolve_skill: ({skill name: resolved dict}, [errors]).
+
+    Each skill finds its project root exactly as resolve_skill does, and
+    find_project_root's memo stops a sibling's walk at their shared parent;
+    each project's _bmad/custom/ is listed once. Resolving every installed
+    skill costs one process and a handful of stats instead of one
+    interpreter start per skill. A skill that fails (missing or
+    unreadable customize.toml) is reported in `errors` and left out of the
+    result; the others still resolve.
+    """
+    keys = list(keys or [])
+    fallback = Path(cwd) if cwd else Path.cwd()
+    listings = {}
+    results = {}
+    errors = []
+    for raw in skill_dirs:
+        skill_dir = Path(raw).resolve()
+        project_root = find_project_root(skill_dir) or find_project_root(fallback)
+        listing = None
+        if project_root:
+            if project_root not in listings:
+                listings[project_root] = _custom_listing(project_root)
+            listing = listings[project_root]
+        try:
+            merged = _merge_skill(skill_dir, project_root, listing, stats)
+        except ResolveError as error:
+            errors.append(str(error))
+            continue
+        if skill_dir.name in results:
+            sys.stderr.write(f"warning: duplicate skill name {skill_dir.name}; {skill_dir} wins\n")
+        results[skill_dir.name] = select_keys(merged, keys)
+    return results, errors
 
 
 def write_json_stdout(output):
@@ -192,48 +275,51 @@ def main():
         description="Resolve customization for a BMad skill using three-layer TOML merge.",
         add_help=True,
     )
-    parser.add_argument(
-        "--skill", "-s", required=True,
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
+        "--skill", "-s",
         help="Absolute path to the skill directory (must contain customize.toml)",
     )
+    target.add_argument(
+        "--skills", nargs="+", metavar="DIR",
+        help="Resolve several skill directories in one process; output is keyed by skill name",
+    )
+    target.add_argument(
+        "--skills-from-stdin", action="store_true",
+        help="Like --skills, reading one skill directory per line from stdin",
+    )
     parser.add_argument(
         "--key", "-k", action="append", default=[],
         help="Dotted field path to resolve (repeatable). Omit for full dump.",
     )
+    parser.add_argument(
+        "--merge-stats", action="store_true",
+        help="Report containers copied vs subtrees shared by the merge as JSON on stderr.",
+    )
     args = parser.parse_args()
+    stats = {"copied": 0, "shared": 0} if args.merge_stats else None
 
-    skill_dir = Path(args.skill).resolve()
-    skill_name = skill_dir.name
-    defaults_path = skill_dir / "customize.toml"
-
-    defaults = load_toml(defaults_path, required=True)
-
-    # Prefer the project that contains this skill. Only fall back to cwd if
-    # the skill isn't inside a recognizable project tree (unusual but possible
-    # for standalone skills invoked directly). Using cwd first is unsafe when
-    # an ancestor of cwd happens to have a stray _bmad/ from another project.
-    project_root = find_project_root(skill_dir) or find_project_root(Path.cwd())
-
-    team = {}
-    user = {}
-    if project_root:
-        custom_dir = project_root / "_bmad" / "custom"
-        team = load_toml(custom_dir / f"{skill_name}.toml")
-        user = load_toml(custom_dir / f"{skill_name}.user.toml")
-
-    merged = deep_merge(defaults, team)
-    merged = deep_merge(merged, user)
-
-    if args.key:
-        output = {}
-        for key in args.key:
-            value = extract_key(merged, key)
-            if value is not _MISSING:
-                output[key] = value
+    if args.skill:
+        try:
+            output = resolve_skill(args.skill, args.key, stats=stats)
+        except ResolveError as error:
+            sys.stderr.write(f"error: {error}\n")
+            sys.exit(1)
+        errors = []
     else:
-        output = merged
+        if args.skills_from_stdin:
+            skill_dirs = [line.strip() for line in sys.stdin if line.strip()]
+        else:
+            skill_dirs = args.skills
+        output, errors = resolve_skills(skill_dirs, args.key, stats=stats)
+        for error in errors:
+            sys.stderr.write(f"error: {error}\n")
 
+    if stats is not None:
+        sys.stderr.write(json.dumps({"merge": stats}) + "\n")
     write_json_stdout(output)
+    if errors:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
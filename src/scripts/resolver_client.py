@@ -0,0 +1,105 @@
+"""
+Config and customization answers for skill scripts, cheapest route first.
+
+Skill scripts that need resolved config or customization (resolve_party.py,
+resolve_personas.py) import this module from {project-root}/_bmad/scripts/
+instead of each carrying its own fallback chain. Every call tries, in order:
+
+  1. the resolver's importable API, in this process (no interpreter start);
+  2. a running resolver_server.py, over its Unix socket (opt-in; with no
+     server listening this costs one stat);
+  3. spawning the resolver script, as skills did before either existed.
+
+Each route returns exactly what the script would print, or None when all
+three fail, so a caller only keeps its own last-resort fallback. Warnings the
+resolvers write to stderr are swallowed, as they were when the scripts ran as
+captured subprocesses. Library only — no CLI.
+
+Uses only the Python stdlib. Needs Python 3.11+ (for `tomllib`).
+"""
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+import resolve_config  # noqa: E402
+import resolve_customization  # noqa: E402
+import resolver_server  # noqa: E402
+
+
+def _in_process(func, *args):
+    try:
+        with contextlib.redirect_stderr(io.StringIO()):
+            result = func(*args)
+    except Exception:
+        return None
+    return result if isinstance(result, dict) else None
+
+
+def _ask_server(project_root: Path, request: dict):
+    socket_path = resolver_server.default_socket_path(project_root)
+    if not os.path.exists(socket_path):
+        return None
+    reply = resolver_server.query(socket_path, request)
+    if reply is None or not reply.get("ok"):
+        return None
+    result = reply.get("result")
+    return result if isinstance(result, dict) else None
+
+
+def _run_json(cmd, cwd=None):
+    """Run a resolver script and parse its JSON stdout. None on any failure."""
+    try:
+        out = subprocess.run(cmd, capture_output=True, text=True, timeout=60, cwd=cwd)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if out.returncode != 0 or not out.stdout.strip():
+        return None
+    try:
+        result = json.loads(out.stdout)
+    except json.JSONDecodeError:
+        return None
+    return result if isinstance(result, dict) else None
+
+
+def config(project_root, keys=None):
+    """What `resolve_config.py --project-root P --key K...` prints, or None."""
+    project_root = Path(project_root).resolve()
+    keys = list(keys or [])
+    result = _in_process(resolve_config.resolve, project_root, keys)
+    if result is None:
+        result = _ask_server(project_root, {"op": "config", "keys": keys})
+    if result is None:
+        cmd = [sys.executable, str(SCRIPTS_DIR / "resolve_config.py"), "--project-root", str(project_root)]
+        for key in keys:
+            cmd += ["--key", key]
+        result = _run_json(cmd)
+    return result
+
+
+def customization(project_root, skill_dir, keys=None, cwd=None):
+    """What `resolve_customization.py --skill S --key K...` prints, or None.
+
+    `cwd` stands in for the working directory, as in resolve_skill(); the
+    spawned script runs in it.
+    """
+    project_root = Path(project_root).resolve()
+    skill_dir = Path(skill_dir).resolve()
+    keys = list(keys or [])
+    cwd = str(cwd) if cwd else os.getcwd()
+    result = _in_process(resolve_customization.resolve_skill, skill_dir, keys, cwd)
+    if result is None:
+        result = _ask_server(project_root, {
+            "op": "customization", "skill": str(skill_dir), "keys": keys, "cwd": cwd})
+    if result is None:
+        cmd = [sys.executable, str(SCRIPTS_DIR / "resolve_customization.py"), "--skill", str(skill_dir)]
+        for key in keys:
+            cmd += ["--key", key]
+        result = _run_json(cmd, cwd)
+    return result
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Serve resolve_config.py and resolve_customization.py answers over a Unix socket.
+
+Opt-in. Skill scripts that resolve config or customization (resolve_party.py,
+resolve_personas.py) go through resolver_client.py, which asks this server's
+socket when the in-process resolvers fail and spawns the resolver scripts when
+no server is listening, so running it never changes an answer.
+
+The server holds every parsed TOML layer in memory and re-stats the layers on
+each query. A layer whose (mtime_ns, size, inode) changed — or that appeared or
+disappeared — is re-parsed before answering, so edits are picked up without a
+restart.
+
+Uses only the Python stdlib. Needs Python 3.11+ (for `tomllib`) and a platform
+with Unix domain sockets.
+
+  uv run resolver_server.py --project-root /abs/path/to/project
+  uv run resolver_server.py --project-root ... --idle-timeout 1800
+  uv run resolver_server.py --project-root ... --socket /tmp/bmad.sock
+
+Socket: {project-root}/_bmad/.cache/resolver.sock unless --socket (or the
+BMAD_RESOLVER_SOCKET environment variable, which clients also honor) names
+another path. A stale socket left by a crashed server is replaced; a live
+one is an error (exit 2), and so is a path that is not a socket at all.
+
+Protocol: one newline-terminated JSON request per connection.
+
+  {"op": "ping"}
+  {"op": "config", "keys": ["agents"]}
+  {"op": "customization", "skill": "/abs/skill-dir", "keys": ["workflow"], "cwd": "/abs"}
+
+`keys` is optional (omit for a full dump). `cwd` is the caller's working
+directory, used exactly as resolve_customization.py uses its own when the skill
+is not inside a project tree. The reply is one JSON line:
+
+  {"ok": true, "result": <exactly what the script would print>}
+  {"ok": false, "error": "..."}
+
+A failed query (missing required layer, unknown op) replies ok=false; callers
+then fall back to the script, which reports the error the usual way.
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import resolve_config  # noqa: E402
+import resolve_customization  # noqa: E402
+
+SOCKET_NAME = "resolver.sock"
+SOCKET_ENV = "BMAD_RESOLVER_SOCKET"
+
+
+def default_socket_path(project_root: Path) -> Path:
+    override = os.environ.get(SOCKET_ENV)
+    if override:
+        return Path(override)
+    return project_root / "_bmad" / resolve_config.CACHE_DIR / SOCKET_NAME
+
+
+def _stat_key(path: Path):
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class LayerCache:
+    """Parsed TOML layers held in memory, re-parsed only when a file's stats change."""
+
+    def __init__(self):
+        self._layers = {}
+
+    def load(self, path: Path, loader, required: bool = False) -> dict:
+        key = _stat_key(path)
+        held = self._layers.get(path)
+        if held is not None and held[0] == key:
+            return held[1]
+        data = loader(path, required=required)
+        self._layers[path] = (key, data)
+        return data
+
+
+class Resolver:
+    """Answers config/customization queries for one project from a LayerCache."""
+
+    def __init__(self, project_root: Path):
+        self.project_root = project_root
+        self.layers = LayerCache()
+
+    def config(self, keys=None):
+        paths = resolve_config.layer_paths(self.project_root / "_bmad")
+
+        def load(path, required=False, problems=None):
+            return self.layers.load(path, resolve_config.load_toml, required)
+
+        # The CLI's own merge, fed from the cache, so the two can never drift.
+        merged = resolve_config.merge_layers(paths, load=load)
+        return resolve_config.select_keys(merged, keys)
+
+    def customization(self, skill, keys=None, cwd=None):
+        skill_dir = Path(skill).resolve()
+        # Uncached walk: the process memo would pin a root for the server's whole
+        # lifetime, missing a _bmad/ or .git created or removed since.
+        find_root = resolve_customization.find_project_root
+        project_root = find_root(skill_dir, memo=False) or find_root(
+            Path(cwd) if cwd else Path.cwd(), memo=False
+        )
+
+        def load(path, required=False):
+            return self.layers.load(path, resolve_customization.load_toml, required)
+
+        # The CLI's own merge, fed from the cache, so the two can never drift.
+        merged = resolve_customization._merge_skill(skill_dir, project_root, load=load)
+        return resolve_customization.select_keys(merged, keys)
+
+    def handle(self, request) -> dict:
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "request must be a JSON object"}
+        keys = request.get("keys") or []
+        if not isinstance(keys, list) or not all(isinstance(k, str) for k in keys):
+            return {"ok": False, "error": "keys must be a list of strings"}
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "result": {}}
+        try:
+            if op == "config":
+                return {"ok": True, "result": self.config(keys)}
+            if op == "customization":
+                skill = request.get("skill")
+                if not isinstance(skill, str) or not skill:
+                    return {"ok": False, "error": "customization requires a skill path"}
+                return {"ok": True, "result": self.customization(skill, keys, request.get("cwd"))}
+        except (resolve_config.ResolveError, resolve_customization.ResolveError) as error:
+            return {"ok": False, "error": str(error)}
+        return {"ok": False, "error": f"unknown op: {op!r}"}
+
+
+def query(socket_path: Path, request: dict, timeout: float = 5.0):
+    """Send one request and return the reply dict, or None if nothing answers."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(timeout)
+            conn.connect(str(socket_path))
+            conn.sendall((json.dumps(request) + "\n").encode("utf-8"))
+            conn.shutdown(socket.SHUT_WR)
+            chunks = []
+            while True:
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        return None
+    try:
+        reply = json.loads(b"".join(chunks).decode("utf-8"))
+    except (UnicodeDecodeError, ValueError):
+        return None
+    return reply if isinstance(reply, dict) else None
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    # The server is single-threaded, so a client that connects and never sends
+    # its line (or never reads the reply) would stall every other caller.
+    # setup() applies this to the connection; a timed-out client is dropped.
+    timeout = 5.0
+
+    def handle(self):
+        try:
+            line = self.rfile.readline()
+        except OSError:
+            return
+        try:
+            request = json.loads(line.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError):
+            reply = {"ok": False, "error": "request is not valid JSON"}
+        else:
+            reply = self.server.resolver.handle(request)
+        try:
+            payload = json.dumps(reply, ensure_ascii=False)
+        except (TypeError, ValueError) as error:
+            payload = json.dumps({"ok": False, "error": f"result is not JSON-serializable: {error}"})
+        try:
+            self.wfile.write(payload.encode("utf-8") + b"\n")
+        except OSError:
+            pass
+
+
+class ResolverServer(socketserver.UnixStreamServer):
+    """Single-threaded on purpose: queries are sub-millisecond, and one thread
+    keeps the LayerCache free of locking."""
+
+    def __init__(self, socket_path: Path, resolver: Resolver, idle_timeout: float = 0):
+        self.resolver = resolver
+        self.timeout = idle_timeout or None
+        self.idle = False
+        super().__init__(str(socket_path), _Handler)
+
+    def handle_timeout(self):
+        self.idle = True
+
+
+def is_socket(path: Path) -> bool:
+    try:
+        return stat.S_ISSOCK(path.lstat().st_mode)
+    except OSError:
+        return False
+
+
+def claim_socket(socket_path: Path) -> bool:
+    """Clear a stale socket file. False if a live server already owns the path, or if
+    the path is something other than a socket, which is never deleted."""
+    if not os.path.lexists(socket_path):
+        return True
+    if not is_socket(socket_path):
+        return False
+    if query(socket_path, {"op": "ping"}, timeout=1.0) is not None:
+        return False
+    try:
+        socket_path.unlink()
+    except FileNotFoundError:
+        pass
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve config/customization resolution over a Unix socket.",
+    )
+    parser.add_argument(
+        "--project-root", "-p", required=True,
+        help="Absolute path to the project root (contains _bmad/)",
+    )
+    parser.add_argument(
+        "--socket",
+        help=f"Socket path (default: ${SOCKET_ENV} or _bmad/.cache/{SOCKET_NAME})",
+    )
+    parser.add_argument(
+        "--idle-timeout", type=float, default=0,
+        help="Exit after this many seconds without a query (default: never)",
+    )
+    args = parser.parse_args()
+
+    if not hasattr(socket, "AF_UNIX"):
+        sys.stderr.write("error: this platform has no Unix domain sockets\n")
+        return 2
+
+    project_root = Path(args.project_root).resolve()
+    socket_path = Path(args.socket) if args.socket else default_socket_path(project_root)
+    if not args.socket and socket_path.parent.name == resolve_config.CACHE_DIR:
+        resolve_config.ensure_cache_dir(socket_path.parent)
+    if not claim_socket(socket_path):
+        if not is_socket(socket_path):
+            sys.stderr.write(f"error: {socket_path} exists and is not a socket; refusing to replace it\n")
+        else:
+            sys.stderr.write(f"error: a resolver server is already listening on {socket_path}\n")
+        return 2
+
+    try:
+        server = ResolverServer(socket_path, Resolver(project_root), args.idle_timeout)
+    except OSError as error:
+        sys.stderr.write(f"error: cannot listen on {socket_path}: {error}\n")
+        return 2
+
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    sys.stderr.write(f"resolver server listening on {socket_path}\n")
+    try:
+        with server:
+            while not server.idle:
+                server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        try:
+            socket_path.unlink()
+        except OSError:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Structural TOML merge shared by BMad's resolvers.
+
+One implementation of the merge rules used by resolve_config.py,
+resolve_customization.py and bmad-quick-dev's render.py, so a fix or an
+optimization here reaches every entry point. Library only — no CLI.
+
+Merge rules (purely structural — no field-name special-casing):
+  - Scalars (string, int, bool, float): override wins
+  - Tables: deep merge (recursively apply these rules)
+  - Arrays of tables where every item shares the *same* identifier
+    field (every item has `code`, or every item has `id`):
+    merge by that key (matching keys replace, new keys append)
+  - All other arrays — including arrays where only some items have
+    `code` or `id`, or where items mix the two keys:
+    append (base items followed by override items)
+
+Structural sharing: only containers on a path the override touches are
+rebuilt; every base subtree the override does not reach is reused by
+reference. Results therefore alias their inputs and must be treated as
+read-only. Pass a {"copied": 0, "shared": 0} dict as `stats` to count
+containers built versus subtrees reused.
+
+Uses only the Python stdlib.
+"""
+
+KEYED_MERGE_FIELDS = ("code", "id")
+
+
+def _count(stats, field, n=1):
+    if stats is not None:
+        stats[field] += n
+
+
+def detect_keyed_merge_field(base, override):
+    """Return 'code' or 'id' if every table item in base + override carries
+    that *same* field, else None.
+
+    Mixed arrays — where some items use `code` and others use `id` — return
+    None and fall through to append semantics. This is intentional: mixing
+    identifier keys within one array is a schema smell, and append-fallback
+    is safer than guessing which key should merge. One pass over both arrays,
+    without concatenating them.
+    """
+    candidates = KEYED_MERGE_FIELDS
+    seen = False
+    for items in (base, override):
+        for item in items:
+            if not isinstance(item, dict):
+                return None
+            seen = True
+            for candidate in candidates:
+                if item.get(candidate) is None:
+                    # Narrow only on a miss, so the common all-keyed case never allocates.
+                    candidates = tuple(c for c in candidates if item.get(c) is not None)
+                    if not candidates:
+                        return None
+                    break
+    return candidates[0] if seen else None
+
+
+def merge_by_key(base, override, key_name, stats=None):
+    """Keyed replace-then-append through a key → position index. Items are
+    carried by reference — a base item no override touches is shared, and a
+    replacing item is the override's own table — so only the result list
+    itself is new."""
+    result = []
+    index_by_key = {}
+
+    for item in base:
+        if not isinstance(item, dict):
+            continue
+        if item.get(key_name) is not None:
+            index_by_key[item[key_name]] = len(result)
+        result.append(item)
+    shared = len(result)
+
+    for item in override:
+        if not isinstance(item, dict):
+            result.append(item)
+            continue
+        key = item.get(key_name)
+        if key is not None and key in index_by_key:
+            result[index_by_key[key]] = item
+            shared -= 1
+        else:
+            if key is not None:
+                index_by_key[key] = len(result)
+            result.append(item)
+
+    _count(stats, "copied")
+    _count(stats, "shared", shared)
+    return result
+
+
+def merge_arrays(base, override, stats=None):
+    """Shape-aware array merge: keyed merge if every item has code/id, else append."""
+    base_arr = base if isinstance(base, list) else []
+    override_arr = override if isinstance(override, list) else []
+    if not override_arr:
+        _count(stats, "shared")
+        return base_arr
+    keyed_field = detect_keyed_merge_field(base_arr, override_arr)
+    if keyed_field:
+        return merge_by_key(base_arr, override_arr, keyed_field, stats)
+    _count(stats, "copied")
+    _count(stats, "shared", len(base_arr))
+    return base_arr + override_arr
+
+
+def deep_merge(base, override, stats=None):
+    """Recursively merge override into base using the structural rules above.
+    - Table + table: deep merge
+    - Array + array: shape-aware (keyed merge if all items have code/id, else append)
+    - Anything else: override wins
+    """
+    if isinstance(base, dict) and isinstance(override, dict):
+        if not override:
+            _count(stats, "shared")
+            return base
+        result = dict(base)
+        _count(stats, "copied")
+        for key, over_val in override.items():
+            if key in result:
+                result[key] = deep_merge(result[key], over_val, stats)
+            else:
+                result[key] = over_val
+        if stats is not None:
+            stats["shared"] += sum(1 for key in base if key not in override)
+        return result
+    if isinstance(base, list) and isinstance(override, list):
+        return merge_arrays(base, override, stats)
+    return override
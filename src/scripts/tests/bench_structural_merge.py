@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.11"
+# ///
+"""Benchmark structural_merge.deep_merge against the copy-everything merge it replaced.
+
+Builds a config shaped like a large install — a wide `agents` table and long
+keyed `menu` arrays — plus a small override touching a few entries, then times
+both implementations and checks they produce equal results. Not collected by
+pytest (no test_ prefix). Run: uv run scripts/tests/bench_structural_merge.py
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import structural_merge  # noqa: E402
+
+
+def legacy_deep_merge(base, override):
+    """The pre-shared-library merge: copies every table level and every keyed item."""
+    def detect(items):
+        if not items or not all(isinstance(item, dict) for item in items):
+            return None
+        for candidate in ("code", "id"):
+            if all(item.get(candidate) is not None for item in items):
+                return candidate
+        return None
+
+    def merge_by_key(base_arr, override_arr, key_name):
+        result, index_by_key = [], {}
+        for item in base_arr:
+            if item.get(key_name) is not None:
+                index_by_key[item[key_name]] = len(result)
+            result.append(dict(item))
+        for item in override_arr:
+            key = item.get(key_name)
+            if key is not None and key in index_by_key:
+                result[index_by_key[key]] = dict(item)
+            else:
+                if key is not None:
+                    index_by_key[key] = len(result)
+                result.append(dict(item))
+        return result
+
+    if isinstance(base, dict) and isinstance(override, dict):
+        result = dict(base)
+        for key, over_val in override.items():
+            result[key] = legacy_deep_merge(result[key], over_val) if key in result else over_val
+        return result
+    if isinstance(base, list) and isinstance(override, list):
+        keyed = detect(base + override)
+        return merge_by_key(base, override, keyed) if keyed else base + override
+    return override
+
+
+def build(agents: int, menu: int):
+    base = {
+        "core": {"user_name": "Ada", "communication_language": "English"},
+        "agents": {
+            f"bmad-agent-{i}": {
+                "name": f"Agent {i}",
+                "menu": [{"code": f"m{j}", "description": f"item {j}"} for j in range(menu)],
+            }
+            for i in range(agents)
+        },
+    }
+    override = {
+        "core": {"user_name": "Grace"},
+        "agents": {
+            "bmad-agent-0": {"menu": [{"code": "m1", "description": "replaced"}]},
+            "bmad-agent-1": {"name": "Renamed"},
+        },
+    }
+    return base, override
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=200)
+    parser.add_argument("--menu", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    base, override = build(args.agents, args.menu)
+    if structural_merge.deep_merge(base, override) != legacy_deep_merge(base, override):
+        print("error: implementations disagree", file=sys.stderr)
+        return 1
+
+    stats = {"copied": 0, "shared": 0}
+    structural_merge.deep_merge(base, override, stats)
+    legacy = timeit.timeit(lambda: legacy_deep_merge(base, override), number=args.repeat)
+    shared = timeit.timeit(lambda: structural_merge.deep_merge(base, override), number=args.repeat)
+    print(f"config: {args.agents} agents x {args.menu} menu items, {args.repeat} merges")
+    print(f"legacy copy merge:  {legacy / args.repeat * 1e6:9.1f} us/merge")
+    print(f"structural_merge:   {shared / args.repeat * 1e6:9.1f} us/merge  ({legacy / shared:.1f}x)")
+    print(f"containers copied: {stats['copied']}, subtrees shared: {stats['shared']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,8 +8,14 @@ The spine under test is the flat, append-only, chronological invariant: every en
 one line recorded at the end in the order it happened — no sections, no grouping, and no
 lifecycle status the log would have to mutate.
 """
+import contextlib
+import csv
+import io
 import json
+import multiprocessing
+import os
 import sys
+import time
 from pathlib import Path
 
 import pytest
@@ -304,3 +310,882 @@ def test_ack_entry_count_climbs(ws, capsys):
     append(ws, "b")
     out = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
     assert out["entries"] == 2
+
+
+# --- true append: O(1) per entry, crash-safe ------------------------------
+
+def test_append_extends_file_in_place(ws):
+    # After the first entry, an append writes only the new tail: same inode (no
+    # temp+rename), and every byte before the updated stamp is untouched.
+    init(ws)
+    append(ws, "first", entry_type="idea")
+    target = Path(ws) / MEMLOG
+    before = target.read_bytes()
+    inode = target.stat().st_ino
+    append(ws, "second", entry_type="idea")
+    after = target.read_bytes()
+    assert target.stat().st_ino == inode
+    assert len(after) == len(before) + len(b"- (idea) second\n")
+    assert after.endswith(b"- (idea) first\n- (idea) second\n")
+
+
+def test_append_restamps_updated_in_place(ws, monkeypatch):
+    init(ws)
+    append(ws, "first")
+    monkeypatch.setattr(memlog, "now", lambda: "2031-01-02T03:04")
+    append(ws, "second")
+    meta, _ = memlog.split(read(ws))
+    assert meta["updated"] == "2031-01-02T03:04"
+    assert list(meta)[-1] == "updated"
+
+
+def test_torn_tail_is_truncated_before_next_append(ws):
+    init(ws)
+    append(ws, "kept")
+    append(ws, "half-written")
+    target = Path(ws) / MEMLOG
+    with open(target, "r+b") as f:  # a crash mid-append: the write stopped short
+        f.truncate(f.seek(0, os.SEEK_END) - 4)
+    append(ws, "next")
+    assert entries(ws) == ["- kept", "- next"]
+
+
+def test_hand_added_line_without_newline_is_kept(ws):
+    init(ws)
+    append(ws, "a")
+    with open(Path(ws) / MEMLOG, "ab") as f:
+        f.write(b"- hand-added decision")  # an editor that writes no final newline
+    append(ws, "b")
+    assert entries(ws) == ["- a", "- hand-added decision", "- b"]
+    memlog.main(["set", "--workspace", ws, "--key", "k", "--value", "v"])
+    assert entries(ws) == ["- a", "- hand-added decision", "- b"]
+
+
+def test_hand_added_line_longer_than_a_read_block_is_kept(ws, capsys):
+    init(ws)
+    append(ws, "a")
+    long_line = "- " + "x" * 5000
+    with open(Path(ws) / MEMLOG, "ab") as f:
+        f.write(long_line.encode("utf-8"))
+    append(ws, "b")
+    assert entries(ws) == ["- a", long_line, "- b"]
+    assert b"\0" not in (Path(ws) / MEMLOG).read_bytes()
+    assert run_json(capsys, ["verify", "--workspace", ws])["entries"] == 3
+
+
+def test_hand_added_line_survives_a_full_rewrite(ws):
+    init(ws)
+    append(ws, "a")
+    with open(Path(ws) / MEMLOG, "ab") as f:
+        f.write(b"- hand-added")
+    memlog.main(["set", "--workspace", ws, "--key", "k", "--value", "v"])
+    assert entries(ws) == ["- a", "- hand-added"]
+
+
+def test_nonstandard_updated_falls_back_to_full_rewrite(ws):
+    init(ws)
+    append(ws, "first")
+    memlog.main(["set", "--workspace", ws, "--key", "owner", "--value", "BMad"])
+    target = Path(ws) / MEMLOG
+    target.write_text(read(ws).replace("updated: ", "updated: yesterday "), encoding="utf-8")
+    append(ws, "second")
+    meta, _ = memlog.split(read(ws))
+    assert len(meta["updated"]) == memlog.STAMP_WIDTH  # rewrite restored the fixed-width slot
+    assert entries(ws) == ["- first", "- second"]
+
+
+def test_roundtrip_stable_after_many_appends(ws):
+    init(ws)
+    for i in range(5):
+        append(ws, f"entry {i}", entry_type="idea")
+    text = read(ws)
+    meta, body = memlog.split(text)
+    assert memlog.render(meta, body) == text
+
+
+# --- append-many: one write, one fsync, same order -------------------------
+
+def append_many(ws, monkeypatch, payload):
+    monkeypatch.setattr(sys, "stdin", io.StringIO(payload))
+    return memlog.main(["append-many", "--workspace", ws])
+
+
+def test_append_many_json_array_keeps_order(ws, monkeypatch):
+    init(ws)
+    batch = [
+        {"text": "first", "type": "idea", "by": "user"},
+        {"text": "second"},
+        {"text": "third", "by": "coach"},
+    ]
+    assert append_many(ws, monkeypatch, json.dumps(batch)) == 0
+    assert entries(ws) == ["- (idea by user) first", "- second", "- (by coach) third"]
+
+
+def test_append_many_jsonl_after_existing_entries(ws, monkeypatch):
+    init(ws)
+    append(ws, "earlier")
+    payload = '{"text": "a", "type": "idea"}\n\n{"text": "b\\nwrapped", "type": "note"}\n'
+    assert append_many(ws, monkeypatch, payload) == 0
+    assert entries(ws) == ["- earlier", "- (idea) a", "- (note) b wrapped"]
+
+
+def test_append_many_fsyncs_once(ws, monkeypatch):
+    init(ws)
+    append(ws, "earlier")
+    calls = count_fsyncs(monkeypatch)
+    assert append_many(ws, monkeypatch, json.dumps([{"text": str(i)} for i in range(10)])) == 0
+    assert len(calls) == 1
+
+
+def test_append_many_acks_final_count(ws, monkeypatch, capsys):
+    init(ws)
+    append(ws, "earlier")
+    capsys.readouterr()
+    assert append_many(ws, monkeypatch, json.dumps([{"text": "x"}, {"text": "y"}])) == 0
+    out = json.loads(capsys.readouterr().out.strip())
+    assert out["ok"] is True
+    assert out["entries"] == 3
+
+
+@pytest.mark.parametrize("payload", [
+    "",
+    "[]",
+    "not json",
+    '[{"text": "ok"}, {"type": "idea"}]',
+    '[{"text": "ok"}, "bare string"]',
+    '[{"text": "ok", "by": 7}]',
+])
+def test_append_many_rejects_bad_batch_whole(ws, monkeypatch, payload):
+    init(ws)
+    append(ws, "earlier")
+    before = read(ws)
+    assert append_many(ws, monkeypatch, payload) == 2
+    assert read(ws) == before
+
+
+# --- cached entry count + verify ------------------------------------------
+
+def count_sidecar(ws):
+    return Path(ws) / ".memlog.count"
+
+
+def last_ack(capsys):
+    return json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+
+
+def test_append_uses_cached_count_without_rescanning(ws, monkeypatch, capsys):
+    init(ws)
+    append(ws, "a")
+    append(ws, "b")
+    monkeypatch.setattr(memlog, "scan_entries", lambda *a: pytest.fail("body rescanned"))
+    append(ws, "c")
+    assert last_ack(capsys)["entries"] == 3
+
+
+def test_count_cache_tracks_log_size(ws):
+    init(ws)
+    append(ws, "a")
+    cached = json.loads(count_sidecar(ws).read_text(encoding="utf-8"))
+    assert cached["entries"] == 1
+    assert cached["size"] == (Path(ws) / MEMLOG).stat().st_size
+
+
+def test_hand_edit_invalidates_cached_count(ws, capsys):
+    init(ws)
+    append(ws, "a")
+    with open(Path(ws) / MEMLOG, "a", encoding="utf-8") as f:
+        f.write("- added by hand\n")
+    append(ws, "b")
+    assert last_ack(capsys)["entries"] == 3
+
+
+def test_missing_count_sidecar_is_rebuilt(ws, capsys):
+    init(ws)
+    append(ws, "a")
+    append(ws, "b")
+    count_sidecar(ws).unlink()
+    append(ws, "c")
+    assert last_ack(capsys)["entries"] == 3
+    assert json.loads(count_sidecar(ws).read_text(encoding="utf-8"))["entries"] == 3
+
+
+def test_verify_repairs_stale_count(ws, capsys):
+    init(ws)
+    append(ws, "a")
+    size = (Path(ws) / MEMLOG).stat().st_size
+    count_sidecar(ws).write_text(json.dumps({"entries": 99, "size": size}), encoding="utf-8")
+    capsys.readouterr()
+    assert memlog.main(["verify", "--workspace", ws]) == 0
+    out = last_ack(capsys)
+    assert out["entries"] == 1
+    assert out["cached"] == 99
+    assert out["repaired"] is True
+    assert json.loads(count_sidecar(ws).read_text(encoding="utf-8"))["entries"] == 1
+
+
+def test_verify_never_touches_the_log(ws, capsys):
+    init(ws)
+    append(ws, "a")
+    before = read(ws)
+    assert memlog.main(["verify", "--workspace", ws]) == 0
+    assert last_ack(capsys)["repaired"] is False
+    assert read(ws) == before
+
+
+# --- head / tail: read-only resume ---------------------------------------
+
+def run_json(capsys, argv):
+    capsys.readouterr()
+    assert memlog.main(argv) == 0
+    return last_ack(capsys)
+
+
+def test_head_reports_frontmatter_and_count(ws, capsys):
+    init(ws, topic="T", goal="G")
+    append(ws, "a")
+    append(ws, "b")
+    out = run_json(capsys, ["head", "--workspace", ws])
+    assert out["meta"]["topic"] == "T"
+    assert out["meta"]["goal"] == "G"
+    assert out["entries"] == 2
+
+
+def test_tail_returns_last_entries_in_order(ws, capsys):
+    init(ws)
+    for i in range(20):
+        append(ws, f"e{i}")
+    out = run_json(capsys, ["tail", "--workspace", ws, "--n", "3"])
+    assert out["tail"] == ["- e17", "- e18", "- e19"]
+    assert out["entries"] == 20
+
+
+def test_tail_filters_by_type(ws, capsys):
+    init(ws)
+    append(ws, "d1", entry_type="decision")
+    append(ws, "i1", entry_type="idea")
+    append(ws, "d2", entry_type="decision", by="user")
+    append(ws, "i2", entry_type="idea")
+    out = run_json(capsys, ["tail", "--workspace", ws, "--n", "5", "--type", "decision"])
+    assert out["tail"] == ["- (decision) d1", "- (decision by user) d2"]
+
+
+def test_tail_crosses_block_boundaries(ws):
+    init(ws)
+    lines = [f"- entry {i} " + "x" * (i % 37) for i in range(300)]
+    memlog.commit(Path(ws) / MEMLOG, lines)
+    with open(Path(ws) / MEMLOG, "rb") as f:
+        _, body_start, _ = memlog.read_head(f)
+        got = [ln.decode() for ln in memlog.iter_lines_reverse(f, body_start, block=64) if ln]
+    assert got == list(reversed(lines))
+
+
+def test_tail_skips_torn_line_and_never_writes(ws, capsys):
+    init(ws)
+    append(ws, "a")
+    with open(Path(ws) / MEMLOG, "ab") as f:
+        f.write(b"- torn")
+    before = read(ws)
+    out = run_json(capsys, ["tail", "--workspace", ws, "--n", "5"])
+    assert out["tail"] == ["- a"]
+    assert read(ws) == before
+
+
+def test_tail_on_empty_log(ws, capsys):
+    init(ws)
+    out = run_json(capsys, ["tail", "--workspace", ws])
+    assert out["tail"] == []
+    assert out["entries"] == 0
+
+
+@pytest.mark.parametrize("line, parsed", [
+    ("- plain", (None, None, "plain")),
+    ("- (idea) x", ("idea", None, "x")),
+    ("- (idea by user) x", ("idea", "user", "x")),
+    ("- (by coach) x", (None, "coach", "x")),
+    ("not an entry", None),
+])
+def test_parse_entry(line, parsed):
+    assert memlog.parse_entry(line) == parsed
+
+
+# --- .memlog.idx + query ----------------------------------------------------
+
+def query(capsys, ws, *extra):
+    return run_json(capsys, ["query", "--workspace", ws, *extra])
+
+
+def seeded(ws):
+    init(ws)
+    append(ws, "i1", entry_type="idea", by="user")
+    append(ws, "d1", entry_type="decision", by="user")
+    append(ws, "d2", entry_type="decision", by="coach")
+    append(ws, "plain note")
+    append(ws, "d3", entry_type="decision", by="user")
+
+
+def test_query_by_type_and_by(ws, capsys):
+    seeded(ws)
+    out = query(capsys, ws, "--type", "decision", "--by", "user")
+    assert [m["entry"] for m in out["matches"]] == ["- (decision by user) d1", "- (decision by user) d3"]
+    assert [m["n"] for m in out["matches"]] == [2, 5]
+    assert out["entries"] == 5
+
+
+def test_query_entry_by_position(ws, capsys):
+    seeded(ws)
+    assert query(capsys, ws, "--entry", "4")["matches"] == [{"n": 4, "entry": "- plain note"}]
+    assert query(capsys, ws, "--entry", "99")["matches"] == []
+
+
+def test_query_requires_a_filter(ws):
+    seeded(ws)
+    assert memlog.main(["query", "--workspace", ws]) == 2
+
+
+def test_index_tracks_appends_without_rebuilding(ws, monkeypatch, capsys):
+    seeded(ws)
+    monkeypatch.setattr(memlog, "rebuild_index", lambda *a: pytest.fail("index rebuilt"))
+    append(ws, "d4", entry_type="decision", by="user")
+    out = query(capsys, ws, "--type", "decision", "--by", "user")
+    assert out["matches"][-1] == {"n": 6, "entry": "- (decision by user) d4"}
+
+
+def test_query_survives_an_append_landing_mid_query(ws, monkeypatch, capsys):
+    # an append between sizing the log and reading the index used to leave the
+    # index longer than the size checked against, and the query crashed on it
+    seeded(ws)
+    read_head = memlog.read_head
+    raced = []
+
+    def append_first(f):
+        if not raced:
+            raced.append(True)
+            append(ws, "d4", entry_type="decision", by="user")
+        return read_head(f)
+
+    monkeypatch.setattr(memlog, "read_head", append_first)
+    out = query(capsys, ws, "--type", "decision", "--by", "user")
+    assert raced
+    assert [m["n"] for m in out["matches"]] == [2, 5]
+    assert out["entries"] == 5
+
+
+def test_index_covers_whole_log_after_set(ws, capsys):
+    # set rewrites the frontmatter, shifting every offset; the index must follow
+    seeded(ws)
+    memlog.main(["set", "--workspace", ws, "--key", "mode", "--value", "a much longer value than before"])
+    out = query(capsys, ws, "--type", "idea")
+    assert out["matches"] == [{"n": 1, "entry": "- (idea by user) i1"}]
+
+
+def test_stale_index_is_rebuilt_from_the_log(ws, capsys):
+    seeded(ws)
+    with open(Path(ws) / MEMLOG, "a", encoding="utf-8") as f:
+        f.write("- (decision by user) added by hand\n")
+    out = query(capsys, ws, "--type", "decision", "--by", "user")
+    assert out["matches"][-1] == {"n": 6, "entry": "- (decision by user) added by hand"}
+
+
+def test_missing_index_is_rebuilt(ws, capsys):
+    seeded(ws)
+    (Path(ws) / ".memlog.idx").unlink()
+    out = query(capsys, ws, "--entry", "2")
+    assert out["matches"] == [{"n": 2, "entry": "- (decision by user) d1"}]
+
+
+# --- concurrent writers: lock + group commit --------------------------------
+
+def _writer(ws, name, n):
+    for i in range(n):
+        memlog.main(["append", "--workspace", ws, "--text", f"{name} {i}", "--by", name])
+
+
+def test_concurrent_appenders_lose_nothing(ws, capsys):
+    init(ws)
+    ctx = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+    procs = [ctx.Process(target=_writer, args=(ws, f"w{k}", 25)) for k in range(6)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    lines = entries(ws)
+    assert len(lines) == 150
+    for k in range(6):  # each writer's own entries stay in the order it made them
+        mine = [ln for ln in lines if ln.startswith(f"- (by w{k}) ")]
+        assert mine == [f"- (by w{k}) w{k} {i}" for i in range(25)]
+    assert run_json(capsys, ["verify", "--workspace", ws])["repaired"] is False
+    assert query(capsys, ws, "--by", "w3")["matches"][-1]["entry"] == "- (by w3) w3 24"
+    assert not list((Path(ws) / ".memlog.spool").glob("*.json"))
+
+
+def test_holder_group_commits_queued_batches_first(ws):
+    init(ws)
+    append(ws, "earlier")
+    target = Path(ws) / MEMLOG
+    memlog.enqueue(target, ["- queued 1"])
+    memlog.enqueue(target, ["- queued 2", "- queued 3"])
+    assert memlog.commit(target, ["- mine"]) == 5
+    assert entries(ws) == ["- earlier", "- queued 1", "- queued 2", "- queued 3", "- mine"]
+    assert not any((Path(ws) / ".memlog.spool").iterdir())
+
+
+def test_queued_writer_acks_when_its_batch_was_committed_for_it(ws, monkeypatch):
+    init(ws)
+    append(ws, "earlier")
+    target = Path(ws) / MEMLOG
+    real_enqueue = memlog.enqueue
+
+    def enqueue_then_holder_commits(path, lines, durability):
+        queued = real_enqueue(path, lines, durability)
+        with memlog.locked(path):
+            memlog.commit_locked(path, [])  # the holder drains the spool before we get the lock
+        return queued
+
+    @contextlib.contextmanager
+    def contended(path, blocking=True):
+        if not blocking:
+            yield False
+            return
+        with real_locked(path) as held:
+            yield held
+
+    real_locked = memlog.locked
+    monkeypatch.setattr(memlog, "enqueue", enqueue_then_holder_commits)
+    monkeypatch.setattr(memlog, "locked", contended)
+    assert memlog.commit(target, ["- queued"]) == 2
+    assert entries(ws) == ["- earlier", "- queued"]
+
+
+def test_interrupted_commit_already_in_log_is_not_duplicated(ws):
+    init(ws)
+    append(ws, "a")
+    append(ws, "b")
+    target = Path(ws) / MEMLOG
+    spool = Path(ws) / ".memlog.spool"
+    spool.mkdir()
+    (spool / "00000000000000000001-1-1.committing").write_text(json.dumps({"lines": ["- b"], "durability": "strict"}), encoding="utf-8")
+    claim = {"batches": ["00000000000000000001-1-1.committing"], "lines": ["- b"]}
+    (spool / "claim").write_text(json.dumps(claim), encoding="utf-8")
+    memlog.commit(target, ["- c"])
+    assert entries(ws) == ["- a", "- b", "- c"]
+
+
+def test_interrupted_commit_with_holders_own_lines_is_not_duplicated(ws, monkeypatch):
+    init(ws)
+    append(ws, "a")
+    target = Path(ws) / MEMLOG
+    memlog.enqueue(target, ["- from B"])
+
+    class Crash(Exception):
+        pass
+
+    def crash(*args):
+        raise Crash
+
+    real_unlink = Path.unlink
+    monkeypatch.setattr(Path, "unlink", crash)  # A dies after writing, before cleaning up
+    with pytest.raises(Crash):
+        memlog.commit_locked(target, ["- A own"])
+    monkeypatch.setattr(Path, "unlink", real_unlink)
+    assert list((Path(ws) / ".memlog.spool").glob("*.committing"))
+    memlog.commit(target, ["- C"])
+    assert entries(ws) == ["- a", "- from B", "- A own", "- C"]
+
+
+def test_crash_partway_through_cleanup_is_not_duplicated(ws, monkeypatch):
+    init(ws)
+    append(ws, "first")
+    target = Path(ws) / MEMLOG
+    memlog.enqueue(target, ["- from A"])
+    memlog.enqueue(target, ["- from B"])
+
+    class Crash(Exception):
+        pass
+
+    real_unlink = Path.unlink
+    removed = []
+
+    def unlink_once(self, *args, **kwargs):
+        if removed:
+            raise Crash  # dies after cleaning up the first batch only
+        removed.append(self.name)
+        real_unlink(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "unlink", unlink_once)
+    with pytest.raises(Crash):
+        memlog.commit_locked(target, ["- own"])
+    monkeypatch.setattr(Path, "unlink", real_unlink)
+    assert len(list((Path(ws) / ".memlog.spool").glob("*.committing"))) == 1
+    memlog.commit(target, ["- next"])
+    assert entries(ws) == ["- first", "- from A", "- from B", "- own", "- next"]
+
+
+def test_stale_claim_does_not_vouch_for_later_batches(ws):
+    init(ws)
+    append(ws, "a")
+    append(ws, "b")
+    target = Path(ws) / MEMLOG
+    spool = Path(ws) / ".memlog.spool"
+    spool.mkdir()
+    # left by a holder that wrote "- b" and died before removing its claim
+    (spool / "claim").write_text(json.dumps({"batches": ["old.committing"], "lines": ["- b"]}), encoding="utf-8")
+    # claimed by a later holder that died before writing anything
+    (spool / "00000000000000000002-1-1.committing").write_text(json.dumps({"lines": ["- b"], "durability": "strict"}), encoding="utf-8")
+    memlog.commit(target, ["- c"])
+    assert entries(ws) == ["- a", "- b", "- b", "- c"]
+
+
+def test_interrupted_commit_missing_from_log_is_recovered(ws):
+    init(ws)
+    append(ws, "a")
+    target = Path(ws) / MEMLOG
+    spool = Path(ws) / ".memlog.spool"
+    spool.mkdir()
+    (spool / "00000000000000000001-1-1.committing").write_text(json.dumps({"lines": ["- lost"], "durability": "strict"}), encoding="utf-8")
+    memlog.commit(target, ["- c"])
+    assert entries(ws) == ["- a", "- lost", "- c"]
+
+
+def test_atomic_writes_use_unique_temp_names(ws, monkeypatch):
+    init(ws)
+    seen = []
+    real_replace = memlog.os.replace
+    monkeypatch.setattr(memlog.os, "replace", lambda a, b: (seen.append(Path(a).name), real_replace(a, b)))
+    memlog.main(["set", "--workspace", ws, "--key", "k", "--value", "v"])
+    assert any(str(os.getpid()) in name for name in seen)
+    assert ".memlog.md.tmp" not in seen
+
+
+# --- durability levels ------------------------------------------------------
+
+def count_fsyncs(monkeypatch):
+    """Record fsyncs of the log itself. The count sidecar's own syncs, the torn-append
+    guard of a synced append, are left out."""
+    calls = []
+    in_store = []
+    real_fsync = memlog.os.fsync
+    real_store = memlog.store_count
+
+    def store(*args, **kwargs):
+        in_store.append(True)
+        try:
+            return real_store(*args, **kwargs)
+        finally:
+            in_store.pop()
+
+    monkeypatch.setattr(memlog, "store_count", store)
+    monkeypatch.setattr(memlog.os, "fsync", lambda fd: (in_store or calls.append(fd), real_fsync(fd)))
+    return calls
+
+
+def test_synced_append_makes_its_count_state_durable_before_writing(ws, monkeypatch):
+    init(ws)
+    append(ws, "a")
+    target = Path(ws) / MEMLOG
+    seen = []
+    real_store = memlog.store_count
+
+    def store(path, entries, size, synced, start=None, sync=False):
+        seen.append((target.stat().st_size, size, sync))
+        real_store(path, entries, size, synced, start, sync)
+
+    monkeypatch.setattr(memlog, "store_count", store)
+    append(ws, "b")
+    before, recorded, sync = seen[0]
+    assert before < recorded  # stored ahead of the write it describes
+    assert sync
+    memlog.main(["append", "--workspace", ws, "--text", "c", "--durability", "none"])
+    assert seen[-1][2] is False
+
+
+def test_strict_is_the_default_and_fsyncs_every_append(ws, monkeypatch, capsys):
+    monkeypatch.delenv(memlog.DURABILITY_ENV, raising=False)
+    init(ws)
+    append(ws, "a")
+    calls = count_fsyncs(monkeypatch)
+    append(ws, "b")
+    append(ws, "c")
+    assert len(calls) == 2
+    assert last_ack(capsys)["durability"] == "strict"
+
+
+def test_none_never_fsyncs(ws, monkeypatch, capsys):
+    calls = count_fsyncs(monkeypatch)
+    assert memlog.main(["init", "--workspace", ws, "--field", "topic=T", "--durability", "none"]) == 0
+    for text in ("a", "b"):
+        assert memlog.main(["append", "--workspace", ws, "--text", text, "--durability", "none"]) == 0
+    assert memlog.main(["set", "--workspace", ws, "--key", "k", "--value", "v", "--durability", "none"]) == 0
+    assert calls == []
+    assert last_ack(capsys)["durability"] == "none"
+    assert entries(ws) == ["- a", "- b"]
+
+
+def test_batch_fsyncs_on_interval_and_session_events(ws, monkeypatch, capsys):
+    monkeypatch.setenv(memlog.DURABILITY_ENV, "batch")
+    init(ws)
+    append(ws, "first")  # the first entry is a full rewrite, which always syncs
+    calls = count_fsyncs(monkeypatch)
+    append(ws, "idea a", entry_type="idea")
+    append(ws, "idea b", entry_type="idea")
+    assert calls == []  # inside the interval
+    append(ws, "session complete", entry_type="event")
+    assert len(calls) == 1  # a session event forces the sync
+    clock = time.time() + memlog.BATCH_SYNC_INTERVAL + 1
+    monkeypatch.setattr(memlog.time, "time", lambda: clock)
+    append(ws, "idea c", entry_type="idea")
+    assert len(calls) == 2  # the interval elapsed
+    assert last_ack(capsys)["durability"] == "batch"
+
+
+def test_group_commit_syncs_if_any_queued_batch_is_strict(ws, monkeypatch):
+    init(ws)
+    append(ws, "first")
+    target = Path(ws) / MEMLOG
+    memlog.enqueue(target, ["- strict one"], "strict")
+    calls = count_fsyncs(monkeypatch)
+    memlog.commit(target, ["- relaxed"], "none")
+    assert len(calls) == 1
+    assert entries(ws) == ["- first", "- strict one", "- relaxed"]
+
+
+def test_invalid_durability_env_is_rejected(ws, monkeypatch):
+    init(ws)
+    monkeypatch.setenv(memlog.DURABILITY_ENV, "sometimes")
+    assert memlog.main(["append", "--workspace", ws, "--text", "x"]) == 2
+    assert entries(ws) == []
+
+
+# --- snapshot: archive segments + derived digest ----------------------------
+
+def snapshot(capsys, ws, keep):
+    return run_json(capsys, ["snapshot", "--workspace", ws, "--keep", str(keep)])
+
+
+def history(ws):
+    return list(memlog.iter_history(Path(ws) / MEMLOG))
+
+
+def test_snapshot_rolls_old_entries_into_a_segment(ws, capsys):
+    init(ws, topic="T")
+    for i in range(10):
+        append(ws, f"e{i}", entry_type="idea" if i % 2 else "decision")
+    out = snapshot(capsys, ws, 3)
+    assert out["entries"] == 10
+    assert out["archived"] == 7
+    assert out["segments"] == 1
+    assert entries(ws) == ["- (idea) e7", "- (decision) e8", "- (idea) e9"]
+    seg = Path(ws) / ".memlog.1.md"
+    seg_meta, seg_body = memlog.split(seg.read_text(encoding="utf-8"))
+    assert (seg_meta["first"], seg_meta["last"]) == ("1", "7")
+    assert seg_body.splitlines()[0] == "- (decision) e0"
+    assert not seg.stat().st_mode & 0o222  # written read-only
+
+
+def test_history_stays_complete_and_chronological(ws, capsys):
+    init(ws)
+    for i in range(6):
+        append(ws, f"e{i}")
+    snapshot(capsys, ws, 2)
+    for i in range(6, 9):
+        append(ws, f"e{i}")
+    snapshot(capsys, ws, 1)
+    assert [p.name for p in memlog.segments(Path(ws) / MEMLOG)] == [".memlog.1.md", ".memlog.2.md"]
+    assert history(ws) == [f"- e{i}" for i in range(9)]
+
+
+def test_counts_and_numbers_span_the_archive(ws, capsys):
+    init(ws)
+    for i in range(5):
+        append(ws, f"e{i}", entry_type="decision")
+    snapshot(capsys, ws, 2)
+    append(ws, "e5", entry_type="decision")
+    assert last_ack(capsys)["entries"] == 6
+    assert run_json(capsys, ["head", "--workspace", ws])["entries"] == 6
+    assert query(capsys, ws, "--entry", "6")["matches"] == [{"n": 6, "entry": "- (decision) e5"}]
+    assert [m["n"] for m in query(capsys, ws, "--type", "decision")["matches"]] == [4, 5, 6]
+    assert run_json(capsys, ["verify", "--workspace", ws])["repaired"] is False
+
+
+def test_tail_reaches_into_segments(ws, capsys):
+    init(ws)
+    for i in range(6):
+        append(ws, f"e{i}")
+    snapshot(capsys, ws, 2)
+    assert run_json(capsys, ["tail", "--workspace", ws, "--n", "4"])["tail"] == ["- e2", "- e3", "- e4", "- e5"]
+
+
+def test_snapshot_digest_summarizes_the_whole_history(ws, capsys):
+    init(ws, topic="Lunchbox")
+    append(ws, "i1", entry_type="idea", by="user")
+    append(ws, "d1", entry_type="decision", by="coach")
+    append(ws, "i2", entry_type="idea", by="user")
+    out = snapshot(capsys, ws, 1)
+    digest = Path(out["snapshot"]).read_text(encoding="utf-8")
+    assert "- entries: 3 (2 archived in 1 segments, 1 live)" in digest
+    assert "- topic: Lunchbox" in digest
+    assert "- idea: 2" in digest
+    assert "- user: 2" in digest
+    assert "- (idea by user) i2" in digest
+    assert "- (idea by user) i1" not in digest  # only the latest of each type
+    snapshot(capsys, ws, 1)  # regenerating replaces the read-only digest
+
+
+def test_snapshot_with_nothing_to_roll_only_writes_digest(ws, capsys):
+    init(ws)
+    append(ws, "a")
+    before = read(ws)
+    out = snapshot(capsys, ws, 5)
+    assert out["segments"] == 0
+    assert read(ws) == before
+    assert (Path(ws) / ".memlog.snapshot.md").is_file()
+
+
+def test_segment_orphaned_by_a_crash_is_rewritten(ws, capsys):
+    init(ws)
+    for i in range(4):
+        append(ws, f"e{i}")
+    # a crash after writing segment 1 but before the live log dropped those entries
+    orphan = Path(ws) / ".memlog.1.md"
+    orphan.write_text(memlog.render({"first": "1", "last": "2"}, "- e0\n- e1"), encoding="utf-8")
+    target = Path(ws) / MEMLOG
+    assert history(ws) == [f"- e{i}" for i in range(4)]  # readers skip the orphan
+    assert [ln for ln in memlog.iter_history_reverse(target) if ln.startswith("- ")] == [f"- e{i}" for i in range(3, -1, -1)]
+    assert run_json(capsys, ["tail", "--workspace", ws, "--n", "10"])["tail"] == [f"- e{i}" for i in range(4)]
+    snapshot(capsys, ws, 1)
+    assert history(ws) == [f"- e{i}" for i in range(4)]
+    assert memlog.split(orphan.read_text(encoding="utf-8"))[0]["last"] == "3"
+
+
+# --- export -------------------------------------------------------------------
+
+def exported_fixture(ws, capsys):
+    init(ws)
+    append(ws, "old idea", entry_type="idea", by="user")
+    append(ws, "plain, with a comma")
+    append(ws, "newer", entry_type="decision")
+    snapshot(capsys, ws, 1)  # history now spans a segment and the live log
+    capsys.readouterr()
+
+
+def test_export_jsonl_streams_parsed_rows(ws, capsys):
+    exported_fixture(ws, capsys)
+    assert memlog.main(["export", "--workspace", ws, "--format", "jsonl"]) == 0
+    rows = [json.loads(ln) for ln in capsys.readouterr().out.splitlines()]
+    assert [(r["n"], r["type"], r["by"], r["text"]) for r in rows] == [
+        (1, "idea", "user", "old idea"),
+        (2, None, None, "plain, with a comma"),
+        (3, "decision", None, "newer"),
+    ]
+
+
+def test_export_csv_to_file(ws, capsys, tmp_path):
+    exported_fixture(ws, capsys)
+    out = tmp_path / "log.csv"
+    assert memlog.main(["export", "--workspace", ws, "--format", "csv", "--out", str(out)]) == 0
+    assert last_ack(capsys)["exported"] == 3
+    with open(out, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert rows[1]["text"] == "plain, with a comma"
+    assert rows[0]["by"] == "user"
+    assert rows[1]["type"] == ""
+
+
+def test_export_sqlite_upserts(ws, capsys, tmp_path):
+    sqlite3 = pytest.importorskip("sqlite3")
+    exported_fixture(ws, capsys)
+    db = tmp_path / "warehouse.db"
+    for _ in range(2):  # re-exporting the same log never duplicates rows
+        assert memlog.main(["export", "--workspace", ws, "--format", "sqlite", "--out", str(db)]) == 0
+    with contextlib.closing(sqlite3.connect(str(db))) as conn:
+        rows = conn.execute("SELECT n, type, by, text FROM entries ORDER BY n").fetchall()
+    assert rows == [(1, "idea", "user", "old idea"), (2, None, None, "plain, with a comma"), (3, "decision", None, "newer")]
+
+
+def test_export_sqlite_closes_its_connection(ws, monkeypatch, capsys, tmp_path):
+    sqlite3 = pytest.importorskip("sqlite3")
+    exported_fixture(ws, capsys)
+    opened = []
+    connect = sqlite3.connect
+
+    def tracked(*a, **kw):
+        opened.append(connect(*a, **kw))
+        return opened[-1]
+
+    monkeypatch.setattr(sqlite3, "connect", tracked)
+    assert memlog.main(["export", "--workspace", ws, "--format", "sqlite", "--out", str(tmp_path / "w.db")]) == 0
+    assert len(opened) == 1
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute("SELECT 1")
+
+
+def test_export_sqlite_keys_on_the_resolved_path(ws, monkeypatch, capsys, tmp_path):
+    sqlite3 = pytest.importorskip("sqlite3")
+    exported_fixture(ws, capsys)
+    db = tmp_path / "warehouse.db"
+    monkeypatch.chdir(Path(ws).parent)
+    for spelling in (Path(ws).name, ws):  # relative, then absolute: one log
+        assert memlog.main(["export", "--workspace", spelling, "--format", "sqlite", "--out", str(db)]) == 0
+    with contextlib.closing(sqlite3.connect(str(db))) as conn:
+        logs = conn.execute("SELECT DISTINCT memlog FROM entries").fetchall()
+        count = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+    assert count == 3
+    assert logs == [(str(Path(ws).resolve() / ".memlog.md"),)]
+
+
+def test_export_sqlite_requires_out(ws):
+    init(ws)
+    assert memlog.main(["export", "--workspace", ws, "--format", "sqlite"]) == 2
+
+
+def test_export_never_holds_the_body(ws, monkeypatch, capsys):
+    init(ws)
+    append(ws, "a")
+    monkeypatch.setattr(memlog, "read_text", lambda *a: pytest.fail("whole body read"))
+    monkeypatch.setattr(memlog, "split", lambda *a: pytest.fail("whole body split"))
+    assert memlog.main(["export", "--workspace", ws, "--format", "jsonl"]) == 0
+
+
+# --- serve: many commands, one process ---------------------------------------
+
+def serve(ws, monkeypatch, capsys, *commands, raw=None):
+    payload = raw if raw is not None else "".join(json.dumps(c) + "\n" for c in commands)
+    monkeypatch.setattr(sys, "stdin", io.StringIO(payload))
+    capsys.readouterr()
+    assert memlog.main(["serve", "--workspace", ws]) == 0
+    return [json.loads(ln) for ln in capsys.readouterr().out.splitlines()]
+
+
+def test_serve_answers_each_command_with_an_ack(ws, monkeypatch, capsys):
+    init(ws)
+    replies = serve(
+        ws, monkeypatch, capsys,
+        {"cmd": "append", "text": "first", "type": "idea", "by": "user"},
+        {"cmd": "append-many", "entries": [{"text": "second"}, {"text": "third", "type": "note"}]},
+        {"cmd": "set", "key": "mode", "value": "partner"},
+        {"cmd": "append", "text": "fourth", "durability": "none"},
+    )
+    assert [r["entries"] for r in replies] == [1, 3, 3, 4]
+    assert all(r["ok"] for r in replies)
+    assert replies[-1]["durability"] == "none"
+    assert entries(ws) == ["- (idea by user) first", "- second", "- (note) third", "- fourth"]
+    assert memlog.split(read(ws))[0]["mode"] == "partner"
+
+
+def test_serve_reports_bad_commands_and_keeps_going(ws, monkeypatch, capsys):
+    init(ws)
+    raw = "\n".join([
+        "not json",
+        json.dumps({"cmd": "delete", "n": 1}),
+        json.dumps({"cmd": "append"}),
+        json.dumps({"cmd": "append", "text": "x", "durability": "sometimes"}),
+        json.dumps({"cmd": "append", "text": "kept"}),
+    ]) + "\n"
+    replies = serve(ws, monkeypatch, capsys, raw=raw)
+    assert [r["ok"] for r in replies] == [False, False, False, False, True]
+    assert "unknown cmd" in replies[1]["error"]  # there is no edit or delete, by design
+    assert entries(ws) == ["- kept"]
+
+
+def test_serve_needs_an_existing_memlog(ws, monkeypatch):
+    monkeypatch.setattr(sys, "stdin", io.StringIO(""))
+    assert memlog.main(["serve", "--workspace", ws]) == 2
@@ -0,0 +1,129 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import resolve_config as rc  # noqa: E402
+
+SCRIPT = Path(__file__).resolve().parents[1] / "resolve_config.py"
+
+
+class ResolveConfigCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.bmad = self.root / "_bmad"
+        (self.bmad / "custom").mkdir(parents=True)
+        (self.bmad / "config.toml").write_text(
+            '[core]\nuser_name = "Base"\n', encoding="utf-8"
+        )
+        self.cache = self.bmad / rc.CACHE_DIR / rc.CACHE_FILE
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_cold_call_misses_and_warm_call_hits(self):
+        merged, outcome = rc.resolve_merged(self.bmad)
+        self.assertEqual(outcome, "miss")
+        self.assertTrue(self.cache.is_file())
+        again, outcome = rc.resolve_merged(self.bmad)
+        self.assertEqual(outcome, "hit")
+        self.assertEqual(again, merged)
+
+    def test_cache_dir_is_gitignored(self):
+        rc.resolve_merged(self.bmad)
+        ignore = self.bmad / rc.CACHE_DIR / ".gitignore"
+        self.assertEqual(ignore.read_text(encoding="utf-8"), "*\n")
+
+    def test_layer_change_invalidates(self):
+        rc.resolve_merged(self.bmad)
+        (self.bmad / "custom" / "config.user.toml").write_text(
+            '[core]\nuser_name = "Override"\n', encoding="utf-8"
+        )
+        merged, outcome = rc.resolve_merged(self.bmad)
+        self.assertEqual(outcome, "miss")
+        self.assertEqual(merged["core"]["user_name"], "Override")
+
+    def test_rewritten_layer_with_new_stats_invalidates(self):
+        rc.resolve_merged(self.bmad)
+        base = self.bmad / "config.toml"
+        base.write_text('[core]\nuser_name = "Edited"\n', encoding="utf-8")
+        st = base.stat()
+        os.utime(base, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        merged, outcome = rc.resolve_merged(self.bmad)
+        self.assertEqual(outcome, "miss")
+        self.assertEqual(merged["core"]["user_name"], "Edited")
+
+    def test_no_cache_neither_reads_nor_writes(self):
+        _, outcome = rc.resolve_merged(self.bmad, use_cache=False)
+        self.assertEqual(outcome, "disabled")
+        self.assertFalse(self.cache.exists())
+
+    def test_unparseable_optional_layer_is_not_cached(self):
+        (self.bmad / "custom" / "config.toml").write_text("not = [valid", encoding="utf-8")
+        _, outcome = rc.resolve_merged(self.bmad)
+        self.assertEqual(outcome, "miss")
+        self.assertFalse(self.cache.exists())
+
+    def test_every_cached_call_is_counted(self):
+        def run(*extra):
+            return subprocess.run(
+                [sys.executable, str(SCRIPT), "--project-root", str(self.root), *extra],
+                capture_output=True, text=True, check=False,
+            )
+
+        run()  # miss
+        rc.resolve(self.root)  # in-process hit
+        run("--no-cache")  # bypasses the cache, so not counted
+        result = run("--cache-stats", "--key", "core")
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertEqual(json.loads(result.stdout)["core"]["user_name"], "Base")
+        stats = json.loads(result.stderr.strip().splitlines()[-1])
+        self.assertEqual(stats["cache"], "hit")
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+        self.assertEqual(stats["hit_rate"], 0.6667)
+        disabled = run("--cache-stats", "--no-cache")
+        self.assertEqual(json.loads(disabled.stderr.strip().splitlines()[-1]), {"cache": "disabled"})
+
+    def test_a_hit_appends_to_the_tally_without_rewriting_it(self):
+        rc.resolve_merged(self.bmad)
+        tally = self.bmad / rc.CACHE_DIR / rc.CACHE_STATS_FILE
+        inode = tally.stat().st_ino
+        rc.resolve_merged(self.bmad)
+        self.assertEqual(tally.read_bytes(), b"m\nh\n")
+        self.assertEqual(tally.stat().st_ino, inode)
+
+
+class ResolveApiTests(unittest.TestCase):
+    def test_resolve_returns_what_the_cli_prints(self):
+        with tempfile.TemporaryDirectory() as d:
+            bmad = Path(d) / "_bmad"
+            bmad.mkdir()
+            (bmad / "config.toml").write_text(
+                '[core]\nuser_name = "Ada"\n[agents.pm]\nname = "John"\n', encoding="utf-8"
+            )
+            self.assertEqual(rc.resolve(d, ["core.user_name", "nope"]), {"core.user_name": "Ada"})
+            cli = subprocess.run(
+                [sys.executable, str(SCRIPT), "--project-root", d, "--no-cache"],
+                capture_output=True, text=True, check=True,
+            )
+            self.assertEqual(rc.resolve(d, use_cache=False), json.loads(cli.stdout))
+
+    def test_missing_base_config_raises_instead_of_exiting(self):
+        with tempfile.TemporaryDirectory() as d:
+            with self.assertRaises(rc.ResolveError):
+                rc.resolve(d)
+            cli = subprocess.run(
+                [sys.executable, str(SCRIPT), "--project-root", d],
+                capture_output=True, text=True, check=False,
+            )
+            self.assertEqual(cli.returncode, 1)
+            self.assertIn("error: required config file not found", cli.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
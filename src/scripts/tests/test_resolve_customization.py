@@ -4,8 +4,11 @@ import subprocess
 import sys
 import tempfile
 import unittest
+import unittest.mock
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import resolve_customization as rcu  # noqa: E402
 
 SCRIPT = Path(__file__).resolve().parents[1] / "resolve_customization.py"
 
@@ -46,5 +49,171 @@ class ResolveCustomizationStdoutTests(unittest.TestCase):
             self.assertEqual(resolved["agent"]["icon"], "🧭")
 
 
+class ResolveSkillApiTests(unittest.TestCase):
+    def test_resolve_skill_merges_team_and_user_layers(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            custom = root / "_bmad" / "custom"
+            custom.mkdir(parents=True)
+            skill_dir = root / "skills" / "demo"
+            skill_dir.mkdir(parents=True)
+            (skill_dir / "customize.toml").write_text(
+                '[workflow]\nmode = "base"\nfacts = ["a"]\n', encoding="utf-8"
+            )
+            (custom / "demo.toml").write_text('[workflow]\nfacts = ["b"]\n', encoding="utf-8")
+            (custom / "demo.user.toml").write_text('[workflow]\nmode = "mine"\n', encoding="utf-8")
+
+            resolved = rcu.resolve_skill(skill_dir, ["workflow"])
+            self.assertEqual(resolved, {"workflow": {"mode": "mine", "facts": ["a", "b"]}})
+
+    def test_missing_customize_toml_raises_instead_of_exiting(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with self.assertRaises(rcu.ResolveError):
+                rcu.resolve_skill(Path(temp_dir) / "absent-skill")
+
+
+class StructuralSharingTests(unittest.TestCase):
+    def test_untouched_subtrees_are_shared_by_reference(self):
+        base = {"agent": {"menu": [{"code": "a"}]}, "workflow": {"facts": ["x"]}}
+        merged = rcu.deep_merge(base, {"agent": {"name": "New"}})
+        self.assertIs(merged["workflow"], base["workflow"])
+        self.assertIs(merged["agent"]["menu"], base["agent"]["menu"])
+        self.assertIsNot(merged["agent"], base["agent"])
+        self.assertNotIn("name", base["agent"])  # inputs are never mutated
+
+    def test_keyed_merge_shares_untouched_items(self):
+        base = [{"code": "a", "v": 1}, {"code": "b", "v": 2}]
+        override = [{"code": "b", "v": 3}, {"code": "c", "v": 4}]
+        merged = rcu.deep_merge({"m": base}, {"m": override})["m"]
+        self.assertEqual([i["v"] for i in merged], [1, 3, 4])
+        self.assertIs(merged[0], base[0])
+        self.assertEqual(base[1]["v"], 2)
+
+    def test_stats_count_copied_and_shared(self):
+        stats = {"copied": 0, "shared": 0}
+        base = {"a": {"x": 1}, "b": {"y": 2}, "menu": [{"code": "m1"}, {"code": "m2"}]}
+        rcu.deep_merge(base, {"a": {"x": 9}, "menu": [{"code": "m2", "v": 1}]}, stats)
+        # Copied: the root table, table "a", the menu list. Shared: "b" and item m1.
+        self.assertEqual(stats, {"copied": 3, "shared": 2})
+
+    def test_empty_override_reuses_base(self):
+        base = {"a": [1, 2]}
+        self.assertIs(rcu.deep_merge(base, {}), base)
+
+
+class ResolveSkillsBatchTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        custom = self.root / "_bmad" / "custom"
+        custom.mkdir(parents=True)
+        self.skills = []
+        for name in ("alpha", "beta"):
+            skill_dir = self.root / "skills" / name
+            skill_dir.mkdir(parents=True)
+            (skill_dir / "customize.toml").write_text(
+                f'[workflow]\nname = "{name}"\n', encoding="utf-8"
+            )
+            self.skills.append(skill_dir)
+        (custom / "beta.toml").write_text('[workflow]\nname = "team-beta"\n', encoding="utf-8")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_output_is_keyed_by_skill_name(self):
+        results, errors = rcu.resolve_skills(self.skills, ["workflow.name"])
+        self.assertEqual(errors, [])
+        self.assertEqual(results, {
+            "alpha": {"workflow.name": "alpha"},
+            "beta": {"workflow.name": "team-beta"},
+        })
+
+    def test_siblings_share_one_project_root_walk(self):
+        checked = []
+        real = rcu._has_project_marker
+
+        def counting(directory):
+            checked.append(directory)
+            return real(directory)
+
+        rcu._ROOT_MEMO.clear()
+        with unittest.mock.patch.dict(os.environ), \
+                unittest.mock.patch.object(rcu, "_has_project_marker", counting):
+            os.environ.pop(rcu.PROJECT_ROOT_ENV, None)
+            rcu.resolve_skills(self.skills)
+        rcu._ROOT_MEMO.clear()
+        self.assertEqual(checked.count(self.skills[0].parent.resolve()), 1)
+
+    def test_env_hint_wins_over_a_skill_that_is_its_own_project(self):
+        (self.skills[0] / ".git").mkdir()
+        other = self.root / "other"
+        (other / "_bmad" / "custom").mkdir(parents=True)
+        (other / "_bmad" / "custom" / "alpha.toml").write_text(
+            '[workflow]\nname = "hinted-alpha"\n', encoding="utf-8"
+        )
+        with unittest.mock.patch.dict(os.environ, {rcu.PROJECT_ROOT_ENV: str(other)}):
+            results, _ = rcu.resolve_skills(self.skills[:1], ["workflow.name"])
+            single = rcu.resolve_skill(self.skills[0], ["workflow.name"])
+        self.assertEqual(results["alpha"], {"workflow.name": "hinted-alpha"})
+        self.assertEqual(results["alpha"], single)
+
+    def test_failing_skill_is_reported_and_others_still_resolve(self):
+        results, errors = rcu.resolve_skills([self.root / "skills" / "ghost", *self.skills])
+        self.assertEqual(sorted(results), ["alpha", "beta"])
+        self.assertEqual(len(errors), 1)
+        self.assertIn("ghost", errors[0])
+
+    def test_skills_from_stdin_matches_single_skill_runs(self):
+        result = subprocess.run(
+            [sys.executable, str(SCRIPT), "--skills-from-stdin", "--key", "workflow"],
+            input="\n".join(str(p) for p in self.skills) + "\n",
+            capture_output=True, text=True, encoding="utf-8", check=False,
+        )
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        batch = json.loads(result.stdout)
+        for skill_dir in self.skills:
+            single = rcu.resolve_skill(skill_dir, ["workflow"])
+            self.assertEqual(batch[skill_dir.name], single)
+
+
+class FindProjectRootTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name).resolve()
+        (self.root / "_bmad").mkdir()
+        self.nested = self.root / "a" / "b" / "c"
+        self.nested.mkdir(parents=True)
+        rcu._ROOT_MEMO.clear()
+        self._env = unittest.mock.patch.dict(os.environ)
+        self._env.start()
+        os.environ.pop(rcu.PROJECT_ROOT_ENV, None)
+
+    def tearDown(self):
+        self._env.stop()
+        rcu._ROOT_MEMO.clear()
+        self._tmp.cleanup()
+
+    def test_walk_records_every_visited_directory(self):
+        self.assertEqual(rcu.find_project_root(self.nested), self.root)
+        for directory in (self.nested, self.nested.parent, self.root / "a", self.root):
+            self.assertEqual(rcu._ROOT_MEMO[directory], self.root)
+
+    def test_memoized_lookup_does_not_stat(self):
+        rcu.find_project_root(self.nested)
+        with unittest.mock.patch.object(rcu, "_has_project_marker", side_effect=AssertionError):
+            self.assertEqual(rcu.find_project_root(self.root / "a"), self.root)
+
+    def test_env_hint_skips_the_walk(self):
+        other = self.root / "other"
+        (other / ".git").mkdir(parents=True)
+        os.environ[rcu.PROJECT_ROOT_ENV] = str(other)
+        self.assertEqual(rcu.find_project_root(self.nested), other)
+        self.assertEqual(rcu._ROOT_MEMO, {})
+
+    def test_invalid_env_hint_is_ignored(self):
+        os.environ[rcu.PROJECT_ROOT_ENV] = str(self.root / "a")
+        self.assertEqual(rcu.find_project_root(self.nested), self.root)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+import unittest.mock
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import resolver_client as rcl  # noqa: E402
+import resolver_server as rs  # noqa: E402
+
+
+class ResolverClientTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.bmad = self.root / "_bmad"
+        (self.bmad / "custom").mkdir(parents=True)
+        (self.bmad / "config.toml").write_text(
+            '[agents.bmad-agent-pm]\nname = "John"\n', encoding="utf-8"
+        )
+        self.skill = self.root / "skills" / "demo-skill"
+        self.skill.mkdir(parents=True)
+        (self.skill / "customize.toml").write_text(
+            '[workflow]\nmode = "base"\n', encoding="utf-8"
+        )
+        env = unittest.mock.patch.dict(os.environ, {rs.SOCKET_ENV: str(self.root / "r.sock")})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_answers_in_process_without_a_subprocess(self):
+        with unittest.mock.patch("subprocess.run", side_effect=AssertionError("spawned")):
+            self.assertEqual(
+                rcl.config(self.root, ["agents"]), {"agents": {"bmad-agent-pm": {"name": "John"}}}
+            )
+            self.assertEqual(
+                rcl.customization(self.root, self.skill, ["workflow"]), {"workflow": {"mode": "base"}}
+            )
+
+    @unittest.skipUnless(hasattr(rs.socket, "AF_UNIX"), "needs Unix domain sockets")
+    def test_asks_a_running_server_when_in_process_fails(self):
+        server = rs.ResolverServer(self.root / "r.sock", rs.Resolver(self.root))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with unittest.mock.patch.object(rcl.resolve_config, "resolve", side_effect=RuntimeError), \
+                    unittest.mock.patch("subprocess.run", side_effect=AssertionError("spawned")):
+                self.assertEqual(
+                    rcl.config(self.root, ["agents"]), {"agents": {"bmad-agent-pm": {"name": "John"}}}
+                )
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+    def test_spawns_the_script_when_nothing_else_answers(self):
+        with unittest.mock.patch.object(rcl.resolve_customization, "resolve_skill", side_effect=RuntimeError):
+            self.assertEqual(
+                rcl.customization(self.root, self.skill, ["workflow"]), {"workflow": {"mode": "base"}}
+            )
+
+    def test_every_route_failing_returns_none(self):
+        (self.bmad / "config.toml").unlink()
+        self.assertIsNone(rcl.config(self.root, ["agents"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
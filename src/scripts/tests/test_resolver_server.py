@@ -0,0 +1,107 @@
+import sys
+import tempfile
+import threading
+import unittest
+import unittest.mock
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import resolver_server as rs  # noqa: E402
+
+
+@unittest.skipUnless(hasattr(rs.socket, "AF_UNIX"), "needs Unix domain sockets")
+class ResolverServerTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.bmad = self.root / "_bmad"
+        (self.bmad / "custom").mkdir(parents=True)
+        (self.bmad / "config.toml").write_text(
+            '[agents.bmad-agent-pm]\nname = "John"\n', encoding="utf-8"
+        )
+        self.skill = self.root / "skills" / "demo-skill"
+        self.skill.mkdir(parents=True)
+        (self.skill / "customize.toml").write_text(
+            '[workflow]\nmode = "base"\n', encoding="utf-8"
+        )
+        (self.root / ".git").mkdir()
+
+        self.sock = self.root / "r.sock"
+        self.server = rs.ResolverServer(self.sock, rs.Resolver(self.root))
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self._tmp.cleanup()
+
+    def ask(self, request):
+        return rs.query(self.sock, request)
+
+    def test_ping(self):
+        self.assertEqual(self.ask({"op": "ping"}), {"ok": True, "result": {}})
+
+    def test_config_matches_script_shape(self):
+        reply = self.ask({"op": "config", "keys": ["agents", "missing.key"]})
+        self.assertEqual(reply, {"ok": True, "result": {"agents": {"bmad-agent-pm": {"name": "John"}}}})
+
+    def test_customization_merges_override_layers(self):
+        (self.bmad / "custom" / "demo-skill.toml").write_text(
+            '[workflow]\nmode = "team"\n', encoding="utf-8"
+        )
+        reply = self.ask({"op": "customization", "skill": str(self.skill), "keys": ["workflow"]})
+        self.assertEqual(reply["result"], {"workflow": {"mode": "team"}})
+
+    def test_layer_edit_is_picked_up_without_restart(self):
+        self.ask({"op": "config", "keys": ["agents"]})
+        user = self.bmad / "custom" / "config.user.toml"
+        user.write_text('[agents.bmad-agent-pm]\nname = "Jane"\n', encoding="utf-8")
+        reply = self.ask({"op": "config", "keys": ["agents.bmad-agent-pm.name"]})
+        self.assertEqual(reply["result"], {"agents.bmad-agent-pm.name": "Jane"})
+
+    def test_project_marker_created_after_a_query_is_seen(self):
+        self.ask({"op": "customization", "skill": str(self.skill), "keys": ["workflow"]})
+        nested = self.skill.parent / "_bmad" / "custom"
+        nested.mkdir(parents=True)
+        (nested / "demo-skill.toml").write_text('[workflow]\nmode = "nested"\n', encoding="utf-8")
+        reply = self.ask({"op": "customization", "skill": str(self.skill), "keys": ["workflow"]})
+        self.assertEqual(reply["result"], {"workflow": {"mode": "nested"}})
+
+    def test_missing_required_layer_fails_query_not_server(self):
+        reply = self.ask({"op": "customization", "skill": str(self.root / "nope")})
+        self.assertFalse(reply["ok"])
+        self.assertTrue(self.ask({"op": "ping"})["ok"])
+
+    def test_unknown_op_and_bad_keys_are_rejected(self):
+        self.assertFalse(self.ask({"op": "explode"})["ok"])
+        self.assertFalse(self.ask({"op": "config", "keys": "agents"})["ok"])
+
+    def test_silent_client_is_dropped_instead_of_stalling_the_server(self):
+        self.assertIsNotNone(rs._Handler.timeout)
+        with unittest.mock.patch.object(rs._Handler, "timeout", 0.2):
+            with rs.socket.socket(rs.socket.AF_UNIX, rs.socket.SOCK_STREAM) as idle:
+                idle.connect(str(self.sock))  # connects, never sends its request
+                self.assertEqual(self.ask({"op": "ping"}), {"ok": True, "result": {}})
+
+    def test_query_returns_none_when_nothing_listens(self):
+        self.assertIsNone(rs.query(self.root / "absent.sock", {"op": "ping"}))
+
+    def test_claim_socket_refuses_a_live_server_and_clears_a_stale_one(self):
+        self.assertFalse(rs.claim_socket(self.sock))
+        stale = self.root / "stale.sock"
+        with rs.socket.socket(rs.socket.AF_UNIX, rs.socket.SOCK_STREAM) as dead:
+            dead.bind(str(stale))  # bound, never listening: what a crashed server leaves
+        self.assertTrue(rs.claim_socket(stale))
+        self.assertFalse(stale.exists())
+
+    def test_claim_socket_never_deletes_a_regular_file(self):
+        notes = self.root / "notes.txt"
+        notes.write_text("keep me", encoding="utf-8")
+        self.assertFalse(rs.claim_socket(notes))
+        self.assertEqual(notes.read_text(encoding="utf-8"), "keep me")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import structural_merge as sm  # noqa: E402
+
+
+class DetectKeyedMergeFieldTests(unittest.TestCase):
+    def test_code_preferred_when_every_item_has_both(self):
+        items = [{"code": "a", "id": 1}]
+        self.assertEqual(sm.detect_keyed_merge_field(items, [{"code": "b", "id": 2}]), "code")
+
+    def test_id_when_only_id_is_universal(self):
+        self.assertEqual(sm.detect_keyed_merge_field([{"id": 1, "code": "a"}], [{"id": 2}]), "id")
+
+    def test_mixed_identifier_keys_fall_back_to_append(self):
+        self.assertIsNone(sm.detect_keyed_merge_field([{"code": "a"}], [{"id": 1}]))
+
+    def test_non_table_item_or_empty_arrays(self):
+        self.assertIsNone(sm.detect_keyed_merge_field([{"code": "a"}], ["x"]))
+        self.assertIsNone(sm.detect_keyed_merge_field([], []))
+
+
+class DeepMergeRulesTests(unittest.TestCase):
+    def test_scalars_override_tables_merge(self):
+        merged = sm.deep_merge({"a": 1, "t": {"x": 1, "y": 2}}, {"a": 2, "t": {"y": 3}})
+        self.assertEqual(merged, {"a": 2, "t": {"x": 1, "y": 3}})
+
+    def test_keyed_arrays_replace_then_append(self):
+        merged = sm.deep_merge(
+            [{"code": "a", "v": 1}, {"code": "b", "v": 1}],
+            [{"code": "b", "v": 2}, {"code": "c", "v": 2}],
+        )
+        self.assertEqual([(i["code"], i["v"]) for i in merged], [("a", 1), ("b", 2), ("c", 2)])
+
+    def test_plain_arrays_append(self):
+        self.assertEqual(sm.deep_merge(["a"], ["b"]), ["a", "b"])
+
+    def test_type_mismatch_override_wins(self):
+        self.assertEqual(sm.deep_merge({"a": [1]}, {"a": "scalar"}), {"a": "scalar"})
+
+
+if __name__ == "__main__":
+    unittest.main()
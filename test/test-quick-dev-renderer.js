@@ -16,6 +16,8 @@
  *      and disabling every layer renders the HALT instruction.
  *   5. No {workflow.*} placeholder or resolve_customization.py call survives
  *      in any rendered file.
+ *   6. compile_template/render_compiled: one-pass segments, missing keys render
+ *      empty, and substituted values are never re-scanned for placeholders.
  *
  * Usage: node test/test-quick-dev-renderer.js
  * Exit codes: 0 = all tests pass, 1 = test failures
@@ -61,6 +63,7 @@ function assert(condition, message) {
 // ---------------------------------------------------------------------------
 
 const SKILL_SRC = path.join(__dirname, '..', 'src', 'bmm-skills', '4-implementation', 'bmad-quick-dev');
+const SCRIPTS_SRC = path.join(__dirname, '..', 'src', 'scripts');
 
 /**
  * Recursively copy a directory (stdlib only, no fs.cp to stay >=20 compat).
@@ -91,6 +94,7 @@ function makeProject(configText) {
   extraTmpDirs.push(dir);
   fs.mkdirSync(path.join(dir, '_bmad'), { recursive: true });
   fs.writeFileSync(path.join(dir, '_bmad', 'config.toml'), configText, 'utf-8');
+  copyDirSync(SCRIPTS_SRC, path.join(dir, '_bmad', 'scripts'));
   const skillDst = path.join(dir, 'bmad-quick-dev');
   copyDirSync(SKILL_SRC, skillDst);
   return { dir, skillDst };
@@ -105,6 +109,9 @@ const tmpDir = fs.mkdtempSync(path.join(os.tmpdir(), 'bmad-renderer-test-'));
 try {
   // _bmad/config.toml — base layer
   fs.mkdirSync(path.join(tmpDir, '_bmad'), { recursive: true });
+  // _bmad/scripts/ — the installer's shared scripts; render.py imports
+  // structural_merge.py from here.
+  copyDirSync(SCRIPTS_SRC, path.join(tmpDir, '_bmad', 'scripts'));
   fs.writeFileSync(
     path.join(tmpDir, '_bmad', 'config.toml'),
     [
@@ -373,6 +380,26 @@ try {
     assert(!res.stderr.includes('Traceback'), `renderer crashed with a traceback instead of HALTing:\n${res.stderr}`);
   });
 
+  test('missing shared merge library HALTs cleanly (no traceback)', () => {
+    const { dir, skillDst: dst } = makeProject(
+      [
+        '[core]',
+        'communication_language = "French"',
+        'document_output_language = "Klingon"',
+        'planning_artifacts = "{project-root}/plan"',
+        'implementation_artifacts = "{project-root}/impl"',
+      ].join('\n'),
+    );
+    fs.rmSync(path.join(dir, '_bmad', 'scripts'), { recursive: true, force: true });
+    const res = spawnSync('python3', [path.join(dst, 'render.py')], { cwd: dst, encoding: 'utf-8' });
+    assert(res.status === 1, `expected exit 1, got ${res.status}\nstdout: ${res.stdout}\nstderr: ${res.stderr}`);
+    assert(
+      res.stdout.includes('HALT and report to the user: shared merge library not found'),
+      `stdout missing the merge-library HALT directive.\nstdout: ${res.stdout}`,
+    );
+    assert(!res.stderr.includes('Traceback'), `renderer crashed with a traceback instead of HALTing:\n${res.stderr}`);
+  });
+
   test('non-table [modules] does not crash the renderer', () => {
     const { dir, skillDst: dst } = makeProject(
       [
@@ -393,6 +420,184 @@ try {
       'workflow.md not rendered when [modules] was a non-table scalar',
     );
   });
+
+  // ---------------------------------------------------------------------------
+  // Incremental re-render (.render-manifest.json)
+  // ---------------------------------------------------------------------------
+
+  const incrementalConfig = [
+    '[core]',
+    'communication_language = "French"',
+    'document_output_language = "Klingon"',
+    '',
+    '[modules.bmm]',
+    'planning_artifacts = "{project-root}/plan"',
+    'implementation_artifacts = "{project-root}/impl"',
+  ].join('\n');
+
+  function renderIn(dst) {
+    const res = spawnSync('python3', [path.join(dst, 'render.py')], { cwd: dst, encoding: 'utf-8' });
+    assert(res.status === 0, `render exit code ${res.status}\nstdout: ${res.stdout}\nstderr: ${res.stderr}`);
+  }
+
+  function mtimes(outDir) {
+    const out = {};
+    for (const f of fs.readdirSync(outDir)) out[f] = fs.statSync(path.join(outDir, f)).mtimeMs;
+    return out;
+  }
+
+  test('unchanged re-render rewrites nothing', () => {
+    const { dir, skillDst: dst } = makeProject(incrementalConfig);
+    const outDir = path.join(dir, '_bmad', 'render', 'bmad-quick-dev');
+    renderIn(dst);
+    assert(fs.existsSync(path.join(outDir, '.render-manifest.json')), 'render manifest not written');
+    const before = mtimes(outDir);
+    renderIn(dst);
+    const after = mtimes(outDir);
+    const touched = Object.keys(before).filter((f) => before[f] !== after[f]);
+    assert(touched.length === 0, `unchanged re-render touched: ${touched.join(', ')}`);
+  });
+
+  test('re-render restores an edited output and drops outputs for removed sources', () => {
+    const { dir, skillDst: dst } = makeProject(incrementalConfig);
+    const outDir = path.join(dir, '_bmad', 'render', 'bmad-quick-dev');
+    renderIn(dst);
+    const pristine = fs.readFileSync(path.join(outDir, 'workflow.md'), 'utf-8');
+    fs.writeFileSync(path.join(outDir, 'workflow.md'), 'hand edit', 'utf-8');
+    fs.writeFileSync(path.join(outDir, 'orphan.md'), 'stale', 'utf-8');
+    renderIn(dst);
+    assert(fs.readFileSync(path.join(outDir, 'workflow.md'), 'utf-8') === pristine, 'edited output not re-rendered');
+    assert(!fs.existsSync(path.join(outDir, 'orphan.md')), 'output with no source was not removed');
+  });
+
+  test('config change re-renders affected outputs', () => {
+    const { dir, skillDst: dst } = makeProject(incrementalConfig);
+    const outDir = path.join(dir, '_bmad', 'render', 'bmad-quick-dev');
+    renderIn(dst);
+    fs.writeFileSync(
+      path.join(dir, '_bmad', 'config.toml'),
+      incrementalConfig.replace('"Klingon"', '"Elvish"'),
+      'utf-8',
+    );
+    renderIn(dst);
+    const text = fs
+      .readdirSync(outDir)
+      .filter((f) => f.endsWith('.md'))
+      .map((f) => fs.readFileSync(path.join(outDir, f), 'utf-8')).join('\n');
+    assert(text.includes('Elvish'), 'changed document_output_language did not reach the re-rendered files');
+    assert(!text.includes('Klingon'), 'stale document_output_language survived the re-render');
+  });
+
+  // ---------------------------------------------------------------------------
+  // Multi-skill precompile (render.py --all)
+  // ---------------------------------------------------------------------------
+
+  function makeDemoSkill(parent, name, template) {
+    const skillDir = path.join(parent, name);
+    fs.mkdirSync(skillDir, { recursive: true });
+    fs.copyFileSync(path.join(SKILL_SRC, 'render.py'), path.join(skillDir, 'render.py'));
+    fs.writeFileSync(path.join(skillDir, 'customize.toml'), '[workflow]\ngreeting = "world"\n', 'utf-8');
+    fs.writeFileSync(path.join(skillDir, 'workflow.md'), template, 'utf-8');
+    return skillDir;
+  }
+
+  test('--all precompiles every opted-in sibling skill in one run', () => {
+    const { dir, skillDst: dst } = makeProject(incrementalConfig);
+    makeDemoSkill(dir, 'demo-skill', 'Lang: {{.communication_language}}\nHello {workflow.greeting}\n');
+    const res = spawnSync('python3', [path.join(dst, 'render.py'), '--all', '--jobs', '2'], {
+      cwd: dst,
+      encoding: 'utf-8',
+    });
+    assert(res.status === 0, `expected exit 0, got ${res.status}\nstdout: ${res.stdout}\nstderr: ${res.stderr}`);
+    const demo = fs.readFileSync(path.join(dir, '_bmad', 'render', 'demo-skill', 'workflow.md'), 'utf-8');
+    assert(demo === 'Lang: French\nHello world\n', `demo-skill rendered unexpectedly:\n${demo}`);
+    assert(
+      fs.existsSync(path.join(dir, '_bmad', 'render', 'bmad-quick-dev', 'workflow.md')),
+      'bmad-quick-dev not rendered by --all',
+    );
+    assert(res.stdout.includes('demo-skill: rendered to'), `missing per-skill report:\n${res.stdout}`);
+  });
+
+  test('--all reports a HALTing skill and still renders the others', () => {
+    const { dir, skillDst: dst } = makeProject(incrementalConfig);
+    const broken = makeDemoSkill(path.join(dir, 'elsewhere'), 'broken-skill', 'Needs {{.no_such_key}}\n');
+    const res = spawnSync('python3', [path.join(dst, 'render.py'), '--all', broken], { cwd: dst, encoding: 'utf-8' });
+    assert(res.status === 1, `expected exit 1, got ${res.status}\nstdout: ${res.stdout}\nstderr: ${res.stderr}`);
+    assert(res.stdout.includes('broken-skill: HALT — config is missing `no_such_key`'), `missing HALT report:\n${res.stdout}`);
+    assert(!res.stderr.includes('Traceback'), `render --all crashed:\n${res.stderr}`);
+    assert(
+      fs.existsSync(path.join(dir, '_bmad', 'render', 'bmad-quick-dev', 'workflow.md')),
+      'a HALT in one skill stopped the others from rendering',
+    );
+  });
+
+  test('--all reports an unreadable skill directory instead of crashing', () => {
+    const { dir, skillDst: dst } = makeProject(incrementalConfig);
+    const missing = path.join(dir, 'no-such-skill');
+    const res = spawnSync('python3', [path.join(dst, 'render.py'), '--all', missing], { cwd: dst, encoding: 'utf-8' });
+    assert(res.status === 1, `expected exit 1, got ${res.status}\nstdout: ${res.stdout}\nstderr: ${res.stderr}`);
+    assert(res.stdout.includes('no-such-skill: HALT — cannot read'), `missing HALT report:\n${res.stdout}`);
+    assert(!res.stderr.includes('Traceback'), `render --all crashed:\n${res.stderr}`);
+    assert(res.stdout.includes('bmad-quick-dev: rendered to'), `rendered skills went unreported:\n${res.stdout}`);
+  });
+
+  test('--all runs a sibling skill\'s own, different render.py', () => {
+    const { dir, skillDst: dst } = makeProject(incrementalConfig);
+    const own = path.join(dir, 'own-renderer');
+    fs.mkdirSync(own, { recursive: true });
+    fs.writeFileSync(
+      path.join(own, 'render.py'),
+      ['import os', 'open("ran-in-" + os.path.basename(os.getcwd()), "w").close()', 'print("read and follow own output")', ''].join('\n'),
+      'utf-8',
+    );
+    const halting = path.join(dir, 'own-halting');
+    fs.mkdirSync(halting, { recursive: true });
+    fs.writeFileSync(path.join(halting, 'render.py'), 'print("HALT and report to the user: own reason")\nraise SystemExit(1)\n', 'utf-8');
+    const res = spawnSync('python3', [path.join(dst, 'render.py'), '--all'], { cwd: dst, encoding: 'utf-8' });
+    assert(res.status === 1, `expected exit 1, got ${res.status}\nstdout: ${res.stdout}\nstderr: ${res.stderr}`);
+    assert(fs.existsSync(path.join(own, 'ran-in-own-renderer')), 'the sibling\'s own render.py was not run');
+    assert(res.stdout.includes('own-renderer: rendered by its own render.py'), `missing report:\n${res.stdout}`);
+    assert(res.stdout.includes('own-halting: HALT — own reason'), `missing relayed HALT:\n${res.stdout}`);
+    assert(!fs.existsSync(path.join(dir, '_bmad', 'render', 'own-renderer')), 'quick-dev\'s renderer rendered a foreign skill');
+  });
+  // ---------------------------------------------------------------------------
+  // Template compilation (compile_template / render_compiled)
+  // ---------------------------------------------------------------------------
+
+  // Run a snippet against render.py imported in-process; it prints JSON.
+  function pyRender(snippet) {
+    const code = ['import json, sys', `sys.path.insert(0, ${JSON.stringify(SKILL_SRC)})`, 'import render', snippet].join('\n');
+    const res = spawnSync('python3', ['-c', code], { encoding: 'utf-8' });
+    assert(res.status === 0, `python exit code ${res.status}\nstderr: ${res.stderr}`);
+    return JSON.parse(res.stdout);
+  }
+
+  test('compile_template splits literals, {{.var}} and {workflow.*} in one pass', () => {
+    const segments = pyRender("print(json.dumps(render.compile_template('a {{.x}} b {workflow.k} c {project-root}')))");
+    const expected = [[0, 'a '], [1, 'x'], [0, ' b '], [2, 'k'], [0, ' c {project-root}']];
+    assert(JSON.stringify(segments) === JSON.stringify(expected), `unexpected segments: ${JSON.stringify(segments)}`);
+  });
+
+  test('render_compiled fills vars and formats [workflow] values, missing ones empty', () => {
+    const out = pyRender(
+      [
+        "segments = render.compile_template('{{.x}}|{{.gone}}|{workflow.k}|{workflow.flag}|{workflow.none}')",
+        "print(json.dumps(render.render_compiled(segments, {'x': 'X'}, {'k': ['p', True], 'flag': False})))",
+      ].join('\n'),
+    );
+    assert(out === 'X||- p\n- true|false|', `unexpected render: ${JSON.stringify(out)}`);
+  });
+
+  test('substituted values are never re-scanned for placeholders', () => {
+    const out = pyRender(
+      [
+        "segments = render.compile_template('{{.x}} / {workflow.k}')",
+        "vars_ = {'x': '{workflow.k} {{.x}}'}",
+        "print(json.dumps(render.render_compiled(segments, vars_, {'k': '{workflow.k} {{.x}}'})))",
+      ].join('\n'),
+    );
+    assert(out === '{workflow.k} {{.x}} / {workflow.k} {{.x}}', `substituted value was re-expanded: ${JSON.stringify(out)}`);
+  });
 } finally {
   fs.rmSync(tmpDir, { recursive: true, force: true });
   for (const dir of extraTmpDirs) {